@@ -0,0 +1,105 @@
+"""Benchmark the local embedding backends: PyTorch vs ONNX Runtime (fp32 and int8)"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from loguru import logger
+from src.config import get_settings
+from src.data.enhanced_processor import EnhancedYouTubeDataProcessor
+from src.data.snapshot import ParquetSnapshot
+from src.embeddings import LocalEmbedding, OnnxEmbedding
+
+BACKENDS = ['torch', 'onnx', 'onnx-int8']
+
+
+def load_texts(count: int) -> list:
+    """Searchable texts of processed videos, or synthetic ones if nothing was ingested yet"""
+    settings = get_settings()
+    snapshot = ParquetSnapshot(settings.processed_data_dir)
+    if snapshot.final_path.exists():
+        processor = EnhancedYouTubeDataProcessor(language_workers=1)
+        df = snapshot.load_final(columns=processor.VIDEOS_TABLE_COLUMNS).head(count)
+        texts = processor.prepare_for_vector_db(df)['searchable_text'].tolist()
+        if texts:
+            return texts
+
+    logger.warning("No processed data found, using synthetic texts")
+    words = "funny cat video music live concert gaming tutorial recipe pasta review unboxing news".split()
+    rng = np.random.default_rng(0)
+    return [' '.join(rng.choice(words, size=rng.integers(5, 60))) for _ in range(count)]
+
+
+def create_model(backend: str, model_name: str, num_threads: int):
+    if backend == 'torch':
+        return LocalEmbedding(model_name=model_name)
+    return OnnxEmbedding(model_name=model_name, quantize=backend == 'onnx-int8', num_threads=num_threads)
+
+
+def main():
+    """Run the benchmark"""
+    import argparse
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='Benchmark local embedding backends')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS,
+                        help='Backends to compare (the first is the parity reference)')
+    parser.add_argument('--model', type=str, default=settings.local_embedding_model,
+                        help='sentence-transformers model name')
+    parser.add_argument('--texts', type=int, default=2000, help='Number of texts for bulk encoding')
+    parser.add_argument('--queries', type=int, default=200, help='Number of single-query encodes')
+    parser.add_argument('--batch-size', type=int, default=32, help='Batch size for bulk encoding')
+    parser.add_argument('--threads', type=int, default=None, help='ONNX Runtime intra-op threads')
+
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts)
+    queries = [text[:80] for text in texts[:args.queries]]
+    logger.info(f"Benchmarking {args.backends} on {len(texts)} texts and {len(queries)} queries")
+
+    results = []
+    reference = None
+    for backend in args.backends:
+        started = time.perf_counter()
+        model = create_model(backend, args.model, args.threads)
+        load_seconds = time.perf_counter() - started
+
+        model.encode_single("warm up")
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            model.encode_single(query)
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        embeddings = np.asarray(model.encode(texts, batch_size=args.batch_size, show_progress=False))
+        bulk_seconds = time.perf_counter() - started
+
+        if reference is None:
+            reference = embeddings
+        cosine = (embeddings * reference).sum(axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+
+        results.append((
+            backend, load_seconds,
+            1000 * np.percentile(latencies, 50), 1000 * np.percentile(latencies, 95),
+            len(texts) / bulk_seconds, cosine.mean(), cosine.min()
+        ))
+
+    print(f"\nParity reference: {args.backends[0]}")
+    print(f"{'backend':<10} {'load s':>8} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9} {'cos mean':>9} {'cos min':>8}")
+    for backend, load, p50, p95, throughput, cos_mean, cos_min in results:
+        print(
+            f"{backend:<10} {load:>8.2f} {p50:>8.2f} {p95:>8.2f} {throughput:>9.1f} "
+            f"{cos_mean:>9.5f} {cos_min:>8.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,10 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import pandas as pd
 from loguru import logger
 from src.config import get_settings
-from src.data import DataPreprocessor
+from src.data.enhanced_processor import EnhancedYouTubeDataProcessor
+from src.data.snapshot import ParquetSnapshot
 from src.embeddings import get_embedding_model
 
 
@@ -20,22 +20,23 @@ def main():
     
     settings = get_settings()
     
-    # Check for preprocessed data
-    processed_file = settings.processed_data_dir / "youtube_processed.parquet"
+    # Check for the Parquet snapshot written by the ingest pipeline
+    snapshot = ParquetSnapshot(settings.processed_data_dir)
+    processed_file = snapshot.final_path
     
     if not processed_file.exists():
         logger.error(f"Preprocessed data not found at {processed_file}")
         logger.info("Please run ingest_data.py first")
         return
     
-    # Load preprocessed data
+    # Load the final-table columns (not the trending_month partition key)
     logger.info(f"Loading preprocessed data from {processed_file}")
-    df = pd.read_parquet(processed_file)
+    processor = EnhancedYouTubeDataProcessor(language_workers=1)
+    df = snapshot.load_final(columns=processor.VIDEOS_TABLE_COLUMNS)
     logger.info(f"Loaded {len(df)} records")
     
     # Convert to documents
-    preprocessor = DataPreprocessor()
-    documents = preprocessor.to_documents(df)
+    documents = processor.create_vector_documents(processor.prepare_for_vector_db(df))
     
     # Generate embeddings
     logger.info("Generating embeddings...")
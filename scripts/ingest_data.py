@@ -8,13 +8,34 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
 from src.config import get_settings
-from src.data.enhanced_processor import EnhancedYouTubeDataProcessor
+from src.data.enhanced_processor import EnhancedYouTubeDataProcessor, country_from_filename
+from src.data.vector_sync import VectorSyncTracker
 from src.embeddings import get_embedding_model
-from src.vectordb import QdrantManager, VectorDBOperations
+from src.vectordb import QdrantManager, VectorDBOperations, PipelinedIndexer
 
 
 def main():
     """Main ingestion pipeline using enhanced processor"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Ingest YouTube trending data into SQL and vector databases')
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Process every CSV in raw_data_dir concurrently into one database (default: first file only)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for --all (default: one per file)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Upsert into the existing databases and re-embed only new or changed videos'
+    )
+    args = parser.parse_args()
     
     logger.info("="*80)
     logger.info("YouTube Trends Data Ingestion Pipeline (Enhanced)")
@@ -31,7 +52,10 @@ def main():
     logger.info("\n[Step 2/5] Initializing enhanced data processor...")
     processor = EnhancedYouTubeDataProcessor(
         db_path=settings.sql_db_path,
-        embedding_model=embedding_model
+        embedding_model=embedding_model,
+        language_workers=settings.language_detection_workers,
+        snapshot_dir=settings.processed_data_dir if settings.parquet_snapshot_enabled else None,
+        record_trend_days=settings.trend_days_enabled
     )
     logger.info("✓ Processor initialized")
     
@@ -48,43 +72,79 @@ def main():
     
     logger.info(f"✓ Found {len(csv_files)} CSV file(s)")
     
-    # Process first CSV file (or combine multiple if needed)
-    csv_path = csv_files[0]
-    logger.info(f"Processing: {csv_path.name}")
-    
-    # Extract country code from filename (e.g., CAvideos.csv -> CA)
-    country = csv_path.stem[:2].upper() if len(csv_path.stem) >= 2 else 'CA'
-    
     # Step 4: Process data with SQL and vector preparation
     logger.info("\n[Step 4/5] Processing data (SQL + Vector DB preparation)...")
-    sql_df, vector_documents, embeddings = processor.process_csv_file(
-        csv_path=str(csv_path),
-        country=country,
-        create_sql=True,
-        prepare_vector=True,
-        generate_embeddings=True
-    )
-    
-    logger.info(f"✓ SQL database created: {settings.sql_db_path}")
+    if args.all and len(csv_files) > 1:
+        # Process every country file concurrently into one database
+        logger.info(f"Processing: {', '.join(p.name for p in csv_files)}")
+        sql_df, vector_documents, _ = processor.process_csv_files(
+            csv_paths=[str(p) for p in csv_files],
+            create_sql=True,
+            prepare_vector=True,
+            generate_embeddings=False,  # Encoded during indexing, overlapped with uploads
+            max_workers=args.workers,
+            chunksize=settings.ingest_chunk_size,
+            incremental=args.incremental
+        )
+    else:
+        csv_path = csv_files[0]
+        logger.info(f"Processing: {csv_path.name}")
+        
+        # Extract country code from filename (e.g., CAvideos.csv -> CA)
+        country = country_from_filename(csv_path)
+        
+        sql_df, vector_documents, _ = processor.process_csv_file(
+            csv_path=str(csv_path),
+            country=country,
+            create_sql=True,
+            prepare_vector=True,
+            generate_embeddings=False,  # Encoded during indexing, overlapped with uploads
+            chunksize=settings.ingest_chunk_size,
+            incremental=args.incremental
+        )
+    
+    logger.info(f"✓ SQL database {'updated' if args.incremental else 'created'}: {settings.sql_db_path}")
     logger.info(f"✓ Vector documents prepared: {len(vector_documents)}")
-    logger.info(f"✓ Embeddings generated: {embeddings.shape}")
     
     # Step 5: Index in Qdrant
     logger.info("\n[Step 5/5] Indexing in Qdrant...")
     
     # Initialize Qdrant
     qdrant_manager = QdrantManager()
-    
-    # Create collection (recreate if exists)
-    qdrant_manager.create_collection(
-        vector_size=embedding_model.get_dimension(),
-        recreate=True
-    )
-    
-    # Index documents with enhanced metadata
     db_ops = VectorDBOperations(qdrant_manager)
-    indexed_count = db_ops.index_documents(vector_documents, embeddings)
-    logger.info(f"✓ Indexed {indexed_count} documents with full metadata")
+    sync_tracker = VectorSyncTracker(settings.sql_db_path)
+    indexer = PipelinedIndexer(db_ops, embedding_model)
+    
+    if args.incremental:
+        # Keep the existing collection; embed only new or changed videos
+        qdrant_manager.create_collection(
+            vector_size=embedding_model.get_dimension(),
+            recreate=False
+        )
+        
+        plan = sync_tracker.plan(vector_documents)
+        if plan['embed']:
+            indexer.index(plan['embed'])
+        if plan['payload_only']:
+            db_ops.update_payloads(plan['payload_only'])
+        
+        sync_tracker.mark_synced(plan['embed'])
+        logger.info(
+            f"✓ Re-embedded {len(plan['embed'])} documents, "
+            f"refreshed metadata of {len(plan['payload_only'])}"
+        )
+    else:
+        # Create collection (recreate if exists)
+        qdrant_manager.create_collection(
+            vector_size=embedding_model.get_dimension(),
+            recreate=True
+        )
+        
+        # Encode and index documents with enhanced metadata
+        indexed_count = indexer.index(vector_documents)
+        sync_tracker.reset()
+        sync_tracker.mark_synced(vector_documents)
+        logger.info(f"✓ Indexed {indexed_count} documents with full metadata")
     
     # Show collection info
     info = qdrant_manager.get_collection_info()
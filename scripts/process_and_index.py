@@ -8,7 +8,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
 from src.data.enhanced_processor import EnhancedYouTubeDataProcessor
-from src.vectordb.operations import VectorDBOperations
+from src.embeddings import get_embedding_model
+from src.vectordb import QdrantManager, VectorDBOperations, PipelinedIndexer
 from src.config.settings import get_settings
 
 
@@ -53,15 +54,29 @@ def main():
     # Step 1: Process CSV data
     logger.info("\n📊 Step 1: Processing CSV data...")
     
-    processor = EnhancedYouTubeDataProcessor(db_path=settings.sql_db_path)
+    processor = EnhancedYouTubeDataProcessor(
+        db_path=settings.sql_db_path,
+        language_workers=settings.language_detection_workers,
+        snapshot_dir=settings.processed_data_dir if settings.parquet_snapshot_enabled else None,
+        record_trend_days=settings.trend_days_enabled and not args.skip_sql
+    )
     
     try:
-        sql_df, vector_df = processor.process_csv_file(
+        if processor.snapshot:
+            processor.snapshot.clear_daily([args.country])
+        if processor.trend_days:
+            processor.trend_days.clear([args.country])
+        final_df = processor.build_final_table(
             csv_path=args.csv,
             country=args.country,
+            chunksize=settings.ingest_chunk_size
+        )
+        sql_df, _, _ = processor.export_final_table(
+            final_df,
             create_sql=not args.skip_sql,
-            prepare_vector=not args.skip_vector
+            prepare_vector=False
         )
+        vector_df = None if args.skip_vector else processor.prepare_for_vector_db(final_df)
         
         logger.info("✅ Data processing complete!")
         
@@ -74,33 +89,18 @@ def main():
         logger.info("\n🔍 Step 2: Indexing in vector database...")
         
         try:
-            vector_ops = VectorDBOperations()
-            
-            # Prepare documents
-            documents = []
-            for _, row in vector_df.iterrows():
-                doc = {
-                    'id': row['video_id'],
-                    'text': row['searchable_text'],
-                    'metadata': {
-                        'video_id': row['video_id'],
-                        'title': row['title'],
-                        'channel': row['channel_title'],
-                        'category': row['category_name'],
-                        'category_id': int(row['category_id']),
-                        'views': int(row['views']),
-                        'likes': int(row['likes']),
-                        'comment_count': int(row['comment_count']),
-                        'tags': row['tags'].split()[:10] if row['tags'] else [],
-                        'country': row['country'],
-                        'language': row['language']
-                    }
-                }
-                documents.append(doc)
+            embedding_model = get_embedding_model()
+            qdrant_manager = QdrantManager()
+            qdrant_manager.create_collection(
+                vector_size=embedding_model.get_dimension(),
+                recreate=False
+            )
+            indexer = PipelinedIndexer(VectorDBOperations(qdrant_manager), embedding_model)
             
-            # Index documents
-            logger.info(f"Indexing {len(documents)} documents...")
-            vector_ops.index_documents(documents)
+            # Stream documents straight from the columns into the indexer
+            logger.info(f"Indexing {len(vector_df)} documents...")
+            documents = processor.iter_vector_documents(vector_df, batch_size=settings.batch_size)
+            indexer.index(documents, total=len(vector_df))
             
             logger.info("✅ Vector indexing complete!")
             
@@ -11,6 +11,7 @@ from loguru import logger
 
 from .base_agent import BaseAgent
 from ..config.settings import get_settings
+from ..data.aggregates import aggregate_metadata, describe_aggregates
 
 
 class SQLAgent(BaseAgent):
@@ -68,6 +69,9 @@ class SQLAgent(BaseAgent):
         
         self.db = SQLDatabase.from_uri(f"sqlite:///{self.db_path}")
         logger.info(f"Connected to database: {self.db_path}")
+        
+        # Materialized aggregate tables written at ingest (see src.data.aggregates)
+        self.aggregate_tables = aggregate_metadata(self.db_path, self.table_name)
     
     def _initialize_llm(self) -> None:
         """Initialize LLM for SQL generation"""
@@ -123,6 +127,8 @@ COMMON QUERY PATTERNS:
 3. Category analysis: SELECT category_name, COUNT(*) as count, AVG(views) as avg_views FROM videos GROUP BY category_name;
 4. Trending analysis: SELECT title, days_trending_unique, longest_consecutive_streak_days FROM videos ORDER BY days_trending_unique DESC;
 
+{describe_aggregates(self.aggregate_tables)}
+
 Your goal is to:
 1. Understand the user's question
 2. Generate SQL queries using the EXACT column names above
@@ -253,7 +259,8 @@ If you encounter a "no such column" error, check the column names table above an
                 'Statistical summaries'
             ],
             'database': self.db_path,
-            'table': self.table_name
+            'table': self.table_name,
+            'aggregate_tables': [entry['table'] for entry in self.aggregate_tables]
         }
     
     def get_schema_info(self) -> str:
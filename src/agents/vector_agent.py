@@ -24,7 +24,7 @@ from .base_agent import BaseAgent
 from ..config.settings import get_settings
 from ..vectordb.client import QdrantManager
 from ..vectordb.operations import VectorDBOperations
-from ..embeddings.factory import get_embedding_model
+from ..embeddings.factory import get_embedding_model, get_query_encoder
 from ..embeddings.base import BaseEmbedding
 
 
@@ -144,6 +144,9 @@ class VectorAgent(BaseAgent):
             self.embedding_model: BaseEmbedding = get_embedding_model()
             self.embedding_dim = self.embedding_model.get_dimension()
             
+            # Repeated queries are cached and concurrent ones share forward passes
+            self.query_encoder: BaseEmbedding = get_query_encoder(self.embedding_model)
+            
             logger.info(
                 f"Embedding model initialized: {self.embedding_model.__class__.__name__} "
                 f"(dimension={self.embedding_dim})"
@@ -344,8 +347,8 @@ class VectorAgent(BaseAgent):
         try:
             logger.debug(f"Searching videos: query='{query}', limit={limit}")
             
-            # Generate query embedding
-            query_vector = self.embedding_model.encode_single(query)
+            # Generate query embedding (cached, batched with concurrent searches)
+            query_vector = self.query_encoder.encode_single(query)
             
             # Perform vector search
             results = self.db_ops.search(
@@ -809,7 +812,7 @@ Response:"""
             info = self.vector_db.get_collection_info()
             total_docs = self.db_ops.count_documents()
             
-            return {
+            stats = {
                 'collection_name': info.get('name'),
                 'total_videos': total_docs,
                 'status': info.get('status'),
@@ -817,6 +820,9 @@ Response:"""
                 'default_limit': self.default_limit,
                 'min_score_threshold': self.min_score_threshold
             }
+            if hasattr(self.query_encoder, 'metrics'):
+                stats['query_encoder'] = self.query_encoder.metrics()
+            return stats
             
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
@@ -847,7 +853,7 @@ Response:"""
         
         # Check embedding model
         try:
-            test_embedding = self.embedding_model.encode_single("test")
+            test_embedding = self.query_encoder.encode_single("test")
             health['components']['embedding_model'] = 'healthy'
         except Exception as e:
             health['components']['embedding_model'] = f'unhealthy: {str(e)}'
@@ -26,18 +26,56 @@ class Settings(BaseSettings):
     llm_temperature: float = 0.0
     openai_embedding_model: str = "text-embedding-3-small"
     
+    # OpenAI Embedding Requests Configuration
+    openai_embedding_base_url: Optional[str] = None  # None = api.openai.com
+    openai_max_concurrency: int = 8  # Embedding requests in flight
+    openai_requests_per_minute: Optional[float] = 3000  # Client-side quota (None = unlimited)
+    openai_tokens_per_minute: Optional[float] = 1000000  # Client-side quota (None = unlimited)
+    openai_max_retries: int = 6  # Retries on 429, 5xx, timeouts and connection errors
+    openai_backoff_seconds: float = 1.0  # First retry delay, doubled per retry
+    openai_max_backoff_seconds: float = 60.0
+    openai_request_timeout: float = 60.0
+    
     # Local Embeddings Configuration
     use_local_embeddings: bool = True
     local_embedding_model: str = "all-MiniLM-L6-v2"
+    local_embedding_backend: str = "torch"  # "torch" (sentence-transformers) or "onnx" (ONNX Runtime)
+    onnx_quantize: bool = True  # Use the int8 dynamically quantized ONNX model
+    onnx_model_dir: Path = Path("./data/onnx_models")
+    onnx_num_threads: Optional[int] = None  # None = all cores
+    embedding_workers: Optional[int] = None  # Bulk-encoding processes (None = CPU count, 1 = in-process)
+    embedding_chunk_size: int = 1000  # Texts per bulk-encoding task
+    embedding_multiprocess_threshold: int = 20000  # generate_embeddings uses the process pool from this many texts
+    
+    # Embedding Cache Configuration
+    embedding_cache_enabled: bool = True
+    embedding_cache_dir: Path = Path("./data/embedding_cache")
+    
+    # Query Embedding Batching Configuration
+    embedding_batching_enabled: bool = True  # Coalesce concurrent query encodes into batches
+    embedding_max_batch_size: int = 32
+    embedding_max_wait_ms: float = 5.0  # Longest a query waits for others to share its batch
+    
+    # Query Embedding Cache Configuration
+    query_cache_enabled: bool = True  # In-memory LRU cache of query embeddings
+    query_cache_size: int = 1024
+    query_cache_ttl_seconds: Optional[float] = None  # None = entries never expire
     
     # Data Configuration
     data_dir: Path = Path("./data")
     raw_data_dir: Path = Path("./data/raw")
     processed_data_dir: Path = Path("./data/processed")
+    language_detection_workers: Optional[int] = None  # None = CPU count, 1 = serial
+    ingest_chunk_size: Optional[int] = None  # Stream CSVs in chunks of N rows (None = load whole file)
+    parquet_snapshot_enabled: bool = True  # Write Parquet snapshots to processed_data_dir during ingest
+    trend_days_enabled: bool = True  # Keep every per-day row in the video_trend_days SQL table
     
     # Application Configuration
     log_level: str = "INFO"
     batch_size: int = 100
+    index_upload_workers: int = 2  # Threads uploading encoded batches to Qdrant
+    index_queue_depth: int = 4  # Encoded batches allowed to wait for upload
+    index_encode_batches: int = 8  # Upload batches per encode call when indexing on a process pool
     
     # Vector Configuration
     vector_size: int = 384  # for all-MiniLM-L6-v2
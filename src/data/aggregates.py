@@ -0,0 +1,308 @@
+"""Materialized aggregate tables over the videos table, for dashboard-style questions"""
+
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .trend_days import TREND_DAYS_TABLE
+
+
+# Aggregate name -> definition. 'source' is 'videos' (the final videos table) or
+# 'trend_days' (video_trend_days, when ingest recorded it). Rows are grouped by
+# 'keys'; an incremental refresh recomputes every group whose 'refresh_by'
+# values were touched by the upsert.
+AGGREGATES: Dict[str, Dict[str, Any]] = {
+    'category_stats': {
+        'source': 'videos',
+        'keys': ('country', 'category_name'),
+        'refresh_by': ('country', 'category_name'),
+        'measures': {
+            'videos': 'COUNT(*)',
+            'total_views': 'SUM(views)',
+            'avg_views': 'AVG(views)',
+            'total_likes': 'SUM(likes)',
+            'avg_likes': 'AVG(likes)',
+            'total_comments': 'SUM(comment_count)',
+            'avg_comments': 'AVG(comment_count)',
+            'avg_days_trending': 'AVG(days_trending_unique)',
+        },
+        'description': (
+            "Video count, total and average views/likes/comments and average trending days "
+            "per country and category. For all countries, SUM the totals and divide by SUM(videos)."
+        ),
+    },
+    'channel_stats': {
+        'source': 'videos',
+        'keys': ('channel_title',),
+        'refresh_by': ('channel_title',),
+        'measures': {
+            'videos': 'COUNT(*)',
+            'total_views': 'SUM(views)',
+            'avg_views': 'AVG(views)',
+            'max_views': 'MAX(views)',
+            'total_likes': 'SUM(likes)',
+            'total_comments': 'SUM(comment_count)',
+            'countries': 'COUNT(DISTINCT country)',
+        },
+        'description': "Video count and total/average/max views, likes and comments per channel.",
+    },
+    'daily_trending': {
+        'source': 'trend_days',
+        'keys': ('country', 'trending_date'),
+        'refresh_by': ('country',),
+        'measures': {
+            'videos': 'COUNT(*)',
+            'total_views': 'SUM(views)',
+            'total_likes': 'SUM(likes)',
+            'total_comments': 'SUM(comment_count)',
+        },
+        'description': (
+            "Number of videos on the trending list and their total views/likes/comments "
+            "per country and day."
+        ),
+    },
+}
+
+_STAGED_KEYS = 'temp.aggregate_refresh_keys'
+
+
+def aggregate_table_name(table_name: str, name: str) -> str:
+    """Name of an aggregate table of a videos table (e.g. videos_category_stats)"""
+    return f"{table_name}_{name}"
+
+
+def _source_table(table_name: str, name: str) -> str:
+    return table_name if AGGREGATES[name]['source'] == 'videos' else TREND_DAYS_TABLE
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def available_aggregates(conn: sqlite3.Connection, table_name: str = 'videos') -> List[str]:
+    """Aggregates whose source table exists (daily_trending needs video_trend_days)"""
+    return [
+        name for name in AGGREGATES
+        if AGGREGATES[name]['source'] == 'videos' or _table_exists(conn, TREND_DAYS_TABLE)
+    ]
+
+
+def _select_sql(table_name: str, name: str, touched: bool = False) -> str:
+    spec = AGGREGATES[name]
+    source = _source_table(table_name, name)
+    keys = ', '.join(spec['keys'])
+    measures = ', '.join(f"{expr} AS {col}" for col, expr in spec['measures'].items())
+    if touched:
+        # CROSS JOIN fixes the join order: one index lookup per staged group
+        source = f"{_STAGED_KEYS} AS keys CROSS JOIN {source} ON {_touched_match(source, spec['refresh_by'])}"
+    return f"SELECT {keys}, {measures} FROM {source} GROUP BY {keys}"
+
+
+def _create_sql(table_name: str, name: str) -> str:
+    spec = AGGREGATES[name]
+    columns = [f"{key} {'DATE' if key.endswith('_date') else 'TEXT'}" for key in spec['keys']]
+    columns += [
+        f"{col} {'REAL' if expr.startswith('AVG') else 'INTEGER'}"
+        for col, expr in spec['measures'].items()
+    ]
+    return (
+        f"CREATE TABLE IF NOT EXISTS {aggregate_table_name(table_name, name)} "
+        f"({', '.join(columns)}, PRIMARY KEY ({', '.join(spec['keys'])}))"
+    )
+
+
+def _touched_match(table: str, refresh_by: Tuple[str, ...]) -> str:
+    """
+    Condition matching rows of a table to the staged groups.
+
+    Keys are compared with IS (not = or IN) so groups with a NULL key match
+    too; the staged key columns are named key_0, key_1, ... so the key
+    columns of the table stay unambiguous in the aggregate query.
+    """
+    return ' AND '.join(f"{table}.{col} IS keys.key_{i}" for i, col in enumerate(refresh_by))
+
+
+def rebuild_statements(table_name: str = 'videos', names: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Statements that recreate aggregate tables from their full source tables.
+
+    Run after a bulk load of the videos table, in the same transaction.
+
+    Args:
+        table_name: Name of the videos table
+        names: Aggregates to rebuild (default: all of AGGREGATES)
+
+    Returns:
+        List of SQL statements
+    """
+    statements = []
+    for name in AGGREGATES if names is None else names:
+        aggregate = aggregate_table_name(table_name, name)
+        statements += [
+            f"DROP TABLE IF EXISTS {aggregate}",
+            _create_sql(table_name, name),
+            f"INSERT INTO {aggregate} {_select_sql(table_name, name)}",
+        ]
+    return statements
+
+
+def touched_groups(
+    conn: sqlite3.Connection,
+    df: pd.DataFrame,
+    table_name: str = 'videos'
+) -> Dict[str, Set[Tuple]]:
+    """
+    refresh_by values an upsert of df will touch, per aggregate.
+
+    Call before the upsert: a video that moves to another channel or category
+    changes both its old group (read from the stored row) and its new one.
+
+    Args:
+        conn: Open SQLite connection
+        df: Final rows about to be upserted
+        table_name: Name of the videos table
+
+    Returns:
+        Dictionary of aggregate name -> set of refresh_by value tuples
+    """
+    columns = sorted({col for spec in AGGREGATES.values() for col in spec['refresh_by']})
+    frames = [df[columns]]
+    if _table_exists(conn, table_name):
+        video_ids = df['video_id'].astype(object).tolist()
+        for start in range(0, len(video_ids), 500):
+            batch = video_ids[start:start + 500]
+            frames.append(pd.read_sql_query(
+                f"SELECT {', '.join(columns)} FROM {table_name} "
+                f"WHERE video_id IN ({', '.join('?' for _ in batch)})",
+                conn, params=batch
+            ))
+
+    groups = pd.concat(frames, ignore_index=True).astype(object)
+    groups = groups.where(groups.notna(), None)  # NaN keys are NULL groups
+    return {
+        name: set(groups[list(spec['refresh_by'])].drop_duplicates().itertuples(index=False, name=None))
+        for name, spec in AGGREGATES.items()
+    }
+
+
+def refresh_aggregates(
+    db_path: str,
+    groups: Dict[str, Set[Tuple]],
+    table_name: str = 'videos'
+) -> Dict[str, int]:
+    """
+    Recompute the touched groups of every available aggregate in one transaction.
+
+    Each aggregate's stale rows are deleted and recomputed from the source
+    rows of the touched groups only (an indexed lookup per group), so a daily
+    delta refreshes a handful of rows instead of re-aggregating every video.
+    Aggregates that do not exist yet are built in full.
+
+    Args:
+        db_path: Path to SQLite database file
+        groups: Output of touched_groups
+        table_name: Name of the videos table
+
+    Returns:
+        Dictionary of aggregate name -> number of groups refreshed (-1 = full rebuild)
+    """
+    refreshed = {}
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # The staged keys have no statistics, so the planner would rather build a
+    # temporary index over the whole source table than use its existing indexes
+    conn.execute("PRAGMA automatic_index = OFF")
+    try:
+        conn.execute("BEGIN")
+        try:
+            for name in available_aggregates(conn, table_name):
+                aggregate = aggregate_table_name(table_name, name)
+                if not _table_exists(conn, aggregate):
+                    for statement in rebuild_statements(table_name, [name]):
+                        conn.execute(statement)
+                    refreshed[name] = -1
+                    continue
+
+                refresh_by = AGGREGATES[name]['refresh_by']
+                key_columns = ', '.join(f"key_{i}" for i in range(len(refresh_by)))
+                conn.execute(f"DROP TABLE IF EXISTS {_STAGED_KEYS}")
+                conn.execute(f"CREATE TABLE {_STAGED_KEYS} ({key_columns})")
+                conn.executemany(
+                    f"INSERT INTO {_STAGED_KEYS} VALUES ({', '.join('?' for _ in refresh_by)})",
+                    groups.get(name, ())
+                )
+                conn.execute(
+                    f"DELETE FROM {aggregate} WHERE EXISTS "
+                    f"(SELECT 1 FROM {_STAGED_KEYS} AS keys WHERE {_touched_match(aggregate, refresh_by)})"
+                )
+                conn.execute(f"INSERT INTO {aggregate} {_select_sql(table_name, name, touched=True)}")
+                refreshed[name] = len(groups.get(name, ()))
+            conn.execute(f"DROP TABLE IF EXISTS {_STAGED_KEYS}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    logger.info(f"Refreshed aggregates: {refreshed}")
+    return refreshed
+
+
+def aggregate_metadata(db_path: str, table_name: str = 'videos') -> List[Dict[str, Any]]:
+    """
+    Describe the aggregate tables present in a database.
+
+    Args:
+        db_path: Path to SQLite database file
+        table_name: Name of the videos table
+
+    Returns:
+        List of dictionaries with table, description, keys, columns and rows
+    """
+    metadata = []
+    conn = sqlite3.connect(db_path)
+    try:
+        for name in AGGREGATES:
+            aggregate = aggregate_table_name(table_name, name)
+            if not _table_exists(conn, aggregate):
+                continue
+            spec = AGGREGATES[name]
+            metadata.append({
+                'table': aggregate,
+                'description': spec['description'],
+                'keys': list(spec['keys']),
+                'columns': list(spec['keys']) + list(spec['measures']),
+                'rows': conn.execute(f"SELECT COUNT(*) FROM {aggregate}").fetchone()[0],
+            })
+    finally:
+        conn.close()
+    return metadata
+
+
+def describe_aggregates(metadata: List[Dict[str, Any]]) -> str:
+    """
+    Format aggregate metadata as a prompt section for the SQL agent.
+
+    Args:
+        metadata: Output of aggregate_metadata
+
+    Returns:
+        Text listing each table with its grain, columns and size ('' if there are none)
+    """
+    if not metadata:
+        return ""
+    lines = [
+        "PRECOMPUTED SUMMARY TABLES (kept up to date at ingest; prefer them over "
+        "aggregating the videos table when they answer the question):"
+    ]
+    for entry in metadata:
+        lines.append(
+            f"- {entry['table']} (one row per {', '.join(entry['keys'])}; {entry['rows']} rows): "
+            f"{entry['description']}"
+        )
+        lines.append(f"  Columns: {', '.join(entry['columns'])}")
+    return "\n".join(lines)
@@ -0,0 +1,272 @@
+"""Columnar builders for vector database documents.
+
+Column-wise equivalents of the iterrows loops that used to live in
+EnhancedYouTubeDataProcessor.create_vector_documents and
+DataPreprocessor.to_documents, and of the row-wise apply() calls that built
+their searchable_text. Every column is converted once (integers through
+numpy, dates and other values through str() of their distinct values) and
+documents are then assembled by zipping plain Python lists.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .text_cleaning import map_unique
+
+
+def _int_values(series: pd.Series) -> list:
+    """Python ints for an integer-like column (same as int() per cell)"""
+    return series.to_numpy(dtype=np.int64).tolist()
+
+
+def _str_values(series: pd.Series) -> list:
+    """str() of every cell, computed once per distinct value"""
+    return map_unique(series, lambda values: values.map(str)).tolist()
+
+
+def _object_values(series: pd.Series) -> list:
+    """Cell values as Python objects"""
+    return series.to_numpy(dtype=object).tolist()
+
+
+def _assemble(ids: list, texts: list, metadata: Dict[str, list]) -> Iterator[Dict[str, Any]]:
+    """Zip converted columns into document dictionaries"""
+    keys = list(metadata)
+    for doc_id, text, values in zip(ids, texts, zip(*metadata.values())):
+        yield {
+            'id': doc_id,
+            'text': text,
+            'metadata': dict(zip(keys, values))
+        }
+
+
+def _batches(df: pd.DataFrame, batch_size: Optional[int]) -> Iterator[pd.DataFrame]:
+    if not batch_size or len(df) <= batch_size:
+        yield df
+        return
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def _labelled(label: str, values: list) -> np.ndarray:
+    """'label: value' for every cell (values already converted to str)"""
+    return label + np.asarray(values, dtype=object)
+
+
+def _join_parts(parts: List[Tuple[Optional[np.ndarray], np.ndarray]], index: pd.Index) -> pd.Series:
+    """
+    Join per-row text parts with ' | ', skipping a part where its mask is False.
+
+    Args:
+        parts: (mask or None for always, text) pairs, in output order; text
+            cells must be strings where the mask is True
+        index: Index of the result
+
+    Returns:
+        Series of joined strings ('' for rows without any part)
+    """
+    joined = np.full(len(index), '', dtype=object)
+    for mask, text in parts:
+        extended = np.where(joined == '', text, joined + ' | ' + text)
+        joined = extended if mask is None else np.where(mask, extended, joined)
+    return pd.Series(joined, index=index, dtype=object)
+
+
+def vector_searchable_text(df: pd.DataFrame) -> pd.Series:
+    """
+    searchable_text of EnhancedYouTubeDataProcessor.prepare_for_vector_db.
+
+    'Title: … | Channel: … | Category: …', followed by ' | Tags: …' for
+    non-empty tags and ' | Description: …' (first 300 characters) unless the
+    description is '[no description]' or missing.
+
+    Args:
+        df: Final processed DataFrame
+
+    Returns:
+        Series of strings aligned with df
+    """
+    has_tags = map_unique(df['tags'], lambda values: values.map(lambda t: bool(t) and t != '')).to_numpy(dtype=bool)
+
+    description = df['description']
+    has_description = map_unique(
+        description, lambda values: values.map(lambda d: isinstance(d, str) and d != '' and d != '[no description]')
+    ).to_numpy(dtype=bool)
+    description = description.where(has_description, '').astype(object).str.slice(0, 300)
+
+    tags = np.where(has_tags, np.asarray(_str_values(df['tags']), dtype=object), '')
+    return _join_parts([
+        (None, _labelled("Title: ", _str_values(df['title']))),
+        (None, _labelled("Channel: ", _str_values(df['channel_title']))),
+        (None, _labelled("Category: ", _str_values(df['category_name']))),
+        (has_tags, _labelled("Tags: ", tags)),
+        (has_description, _labelled("Description: ", _object_values(description))),
+    ], df.index)
+
+
+def preprocessed_searchable_text(df: pd.DataFrame) -> pd.Series:
+    """
+    searchable_text of DataPreprocessor.preprocess.
+
+    Title, channel and category when present, the first 10 tags of
+    tags_list and the first 200 characters of the description, joined with ' | '.
+
+    Args:
+        df: DataFrame with cleaned title/channel_title, category_name and tags_list
+
+    Returns:
+        Series of strings aligned with df ('' for rows without any field)
+    """
+    parts = []
+    for column, label in (('title', "Title: "), ('channel_title', "Channel: "), ('category_name', "Category: ")):
+        if column in df.columns:
+            present = df[column].notna().to_numpy()
+            values = df[column].where(present, '')
+            parts.append((present, _labelled(label, _str_values(values))))
+
+    if 'tags_list' in df.columns:
+        tags = [', '.join(tag_list[:10]) if tag_list else None for tag_list in df['tags_list'].to_numpy(dtype=object)]
+        has_tags = np.array([t is not None for t in tags], dtype=bool)
+        parts.append((has_tags, _labelled("Tags: ", [t or '' for t in tags])))
+
+    if 'description' in df.columns:
+        present = df['description'].notna().to_numpy()
+        description = df['description'].where(present, '').astype(object).str.slice(0, 200)
+        parts.append((present, _labelled("Description: ", _object_values(description))))
+
+    return _join_parts(parts, df.index)
+
+
+def _vector_document_batch(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Documents for one slice of a prepared enhanced-processor DataFrame"""
+    video_ids = _object_values(df['video_id'])
+
+    tags = [
+        tag_string.split() if isinstance(tag_string, str) else []
+        for tag_string in df['tags'].to_numpy(dtype=object)
+    ]
+
+    description = df['description']
+    description = description.where(description != '[no description]', '').str.slice(0, 500)
+
+    metadata = {
+        # Core identifiers
+        'video_id': video_ids,
+        'title': _object_values(df['title']),
+        'channel': _object_values(df['channel_title']),
+
+        # Category information (for filtering)
+        'category': _object_values(df['category_name']),
+        'category_id': _int_values(df['category_id']),
+
+        # Country and language (for filtering)
+        'country': _object_values(df['country']),
+        'language': _object_values(df['language']),
+
+        # Tags (for filtering and search)
+        'tags': tags,
+
+        # Engagement metrics (for filtering and ranking)
+        'views': _int_values(df['views']),
+        'likes': _int_values(df['likes']),
+        'comment_count': _int_values(df['comment_count']),
+
+        # Temporal features (for filtering)
+        'publish_time': _str_values(df['publish_time']),
+        'first_trend_date': _str_values(df['first_trend_date']),
+        'last_trend_date': _str_values(df['last_trend_date']),
+        'days_trending_unique': _int_values(df['days_trending_unique']),
+        'longest_consecutive_streak_days': _int_values(df['longest_consecutive_streak_days']),
+
+        # Description (optional)
+        'description': _object_values(description),
+    }
+    return _assemble(video_ids, _object_values(df['searchable_text']), metadata)
+
+
+def iter_vector_documents(df: pd.DataFrame, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield vector documents for a DataFrame prepared by
+    EnhancedYouTubeDataProcessor.prepare_for_vector_db.
+
+    With batch_size, columns are converted one slice of rows at a time, so
+    only one batch of converted values is held in memory while a consumer
+    (such as PipelinedIndexer) pulls documents.
+
+    Args:
+        df: Processed DataFrame with searchable_text
+        batch_size: Rows converted per slice (default: all rows at once)
+
+    Returns:
+        Iterator over documents with 'id', 'text' and 'metadata'
+    """
+    return chain.from_iterable(_vector_document_batch(batch) for batch in _batches(df, batch_size))
+
+
+def build_vector_documents(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build all vector documents for a DataFrame prepared by
+    EnhancedYouTubeDataProcessor.prepare_for_vector_db.
+
+    Args:
+        df: Processed DataFrame with searchable_text
+
+    Returns:
+        List of documents ready for vector DB indexing
+    """
+    return list(iter_vector_documents(df))
+
+
+def _column_or_default(df: pd.DataFrame, column: str, default: Any) -> pd.Series:
+    if column in df.columns:
+        return df[column]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _preprocessed_document_batch(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Documents for one slice of a DataPreprocessor.preprocess DataFrame"""
+    if 'video_id' in df.columns:
+        ids = _object_values(df['video_id'])
+    else:
+        ids = [str(idx) for idx in df.index]
+
+    tags = (
+        _object_values(df['tags_list']) if 'tags_list' in df.columns
+        else [[] for _ in range(len(df))]
+    )
+
+    metadata = {
+        'title': _object_values(_column_or_default(df, 'title', '')),
+        'channel': _object_values(_column_or_default(df, 'channel_title', '')),
+        'category': _object_values(_column_or_default(df, 'category_name', 'Unknown')),
+        'category_id': _int_values(_column_or_default(df, 'category_id', 0)),
+        'tags': tags,
+        'views': _int_values(_column_or_default(df, 'views', 0)),
+        'likes': _int_values(_column_or_default(df, 'likes', 0)),
+        'dislikes': _int_values(_column_or_default(df, 'dislikes', 0)),
+        'comment_count': _int_values(_column_or_default(df, 'comment_count', 0)),
+    }
+
+    # Optional fields, only when the column exists
+    for column in ('trending_date', 'publish_time', 'country'):
+        if column in df.columns:
+            metadata[column] = _str_values(df[column])
+
+    return _assemble(ids, _object_values(df['searchable_text']), metadata)
+
+
+def iter_preprocessed_documents(df: pd.DataFrame, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield documents for a DataFrame produced by DataPreprocessor.preprocess.
+
+    Args:
+        df: Preprocessed DataFrame
+        batch_size: Rows converted per slice (default: all rows at once)
+
+    Returns:
+        Iterator over documents with 'id', 'text' and 'metadata'
+    """
+    return chain.from_iterable(_preprocessed_document_batch(batch) for batch in _batches(df, batch_size))
@@ -6,13 +6,27 @@ import numpy as np
 import sqlite3
 import re
 import string
-import langid
 import pycountry
-from typing import Optional, List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from pathlib import Path
 from loguru import logger
 from tqdm import tqdm
 
+from .loader import read_trending_csv, country_from_filename, PROCESSOR_COLUMNS
+from .language_detection import LanguageDetector, detect_language
+from .text_cleaning import clean_text_column, split_and_clean_tags_column
+from .streaming import TrendAggregator
+from .temporal import trend_features
+from .documents import build_vector_documents, iter_vector_documents, vector_searchable_text
+from .sql_loader import SQLiteBulkLoader
+from .sql_indexes import index_statements
+from .text_search import ensure_fts, rebuild_statements, search_text
+from .snapshot import ParquetSnapshot
+from .trend_days import TREND_DAYS_TABLE, TrendDaysStore
+from . import aggregates
+from src.config import get_settings
+
 
 class EnhancedYouTubeDataProcessor:
     """
@@ -41,16 +55,68 @@ class EnhancedYouTubeDataProcessor:
         43: "Shows"
     }
     
-    def __init__(self, db_path: str = "youtube_trends_canada.db", embedding_model=None):
+    # SQL schema of the final de-duplicated table
+    VIDEOS_TABLE_SCHEMA = """
+        CREATE TABLE {if_not_exists} {table_name} (
+            video_id TEXT PRIMARY KEY,
+            title TEXT,
+            description TEXT,
+            tags TEXT,
+            category_id INTEGER,
+            category_name TEXT,
+            channel_title TEXT,
+            country TEXT,
+            language TEXT,
+            publish_time TIMESTAMP,
+            first_trend_date DATE,
+            last_trend_date DATE,
+            days_trending_unique INTEGER,
+            longest_consecutive_streak_days INTEGER,
+            views INTEGER,
+            likes INTEGER,
+            comment_count INTEGER
+        );
+        """
+    
+    VIDEOS_TABLE_COLUMNS = [
+        'video_id', 'title', 'description', 'tags', 'category_id',
+        'category_name', 'channel_title', 'country', 'language', 'publish_time',
+        'first_trend_date', 'last_trend_date', 'days_trending_unique',
+        'longest_consecutive_streak_days', 'views', 'likes', 'comment_count'
+    ]
+    
+    # Per-row columns needed to build the final table (latest stats per video)
+    LATEST_STATS_COLUMNS = [
+        'video_id', 'trending_date', 'title', 'description_cleaned', 'tags_cleaned',
+        'category_id', 'category_name', 'channel_title', 'country', 'language',
+        'publish_time', 'views', 'likes', 'comment_count'
+    ]
+    
+    def __init__(
+        self,
+        db_path: str = "youtube_trends_canada.db",
+        embedding_model=None,
+        language_workers: Optional[int] = None,
+        snapshot_dir: Optional[str] = None,
+        record_trend_days: bool = False
+    ):
         """
         Initialize the processor.
         
         Args:
             db_path: Path to SQLite database file
             embedding_model: Optional embedding model instance for vectorization
+            language_workers: Worker processes for language detection (default: CPU count, 1 = serial)
+            snapshot_dir: If set, write Parquet snapshots of the per-day rows and
+                the final table to this directory (see ParquetSnapshot)
+            record_trend_days: Also keep every per-day row in the video_trend_days
+                table of the database (see TrendDaysStore)
         """
         self.db_path = db_path
         self.embedding_model = embedding_model
+        self.language_detector = LanguageDetector(n_workers=language_workers)
+        self.snapshot = ParquetSnapshot(Path(snapshot_dir)) if snapshot_dir else None
+        self.trend_days = TrendDaysStore(db_path) if record_trend_days else None
         
     def detect_language(self, text: str) -> str:
         """
@@ -62,14 +128,7 @@ class EnhancedYouTubeDataProcessor:
         Returns:
             Language code
         """
-        if pd.isna(text) or len(str(text).strip()) == 0:
-            return "unknown"
-        try:
-            lang, _ = langid.classify(str(text))
-            return lang
-        except Exception as e:
-            logger.warning(f"Language detection error: {e}")
-            return "error"
+        return detect_language(text)
     
     def code_to_name(self, code: str) -> str:
         """
@@ -146,21 +205,22 @@ class EnhancedYouTubeDataProcessor:
         # Language detection
         logger.info("Detecting languages...")
         df['text_for_lang'] = df['title'].fillna('') + ' ' + df['description'].fillna('')
-        df['lang_code'] = df['text_for_lang'].apply(self.detect_language)
-        df['language'] = df['lang_code'].apply(self.code_to_name)
+        df['lang_code'] = self.language_detector.detect(df['text_for_lang'])
+        language_names = {code: self.code_to_name(code) for code in df['lang_code'].unique()}
+        df['language'] = df['lang_code'].map(language_names)
         
         # Category mapping
         df['category_name'] = df['category_id'].map(self.CATEGORY_MAPPING).fillna('Other')
         
         # Text cleaning
         logger.info("Cleaning text fields...")
-        df['title_cleaned'] = df['title'].apply(self.clean_text)
-        df['description_cleaned'] = df['description'].apply(self.clean_text)
+        df['title_cleaned'] = clean_text_column(df['title'])
+        df['description_cleaned'] = clean_text_column(df['description'])
         
         # Tags processing
-        df['tags_list'] = df['tags'].apply(self.split_and_clean_tags)
-        df['tags_cleaned'] = df['tags_list'].apply(lambda x: ' '.join(x))
-        df['num_tags'] = df['tags_list'].apply(len)
+        df['tags_list'] = split_and_clean_tags_column(df['tags'])
+        df['tags_cleaned'] = df['tags_list'].str.join(' ')
+        df['num_tags'] = df['tags_list'].str.len()
         
         # Date conversions
         df['publish_time'] = pd.to_datetime(df['publish_time'])
@@ -175,6 +235,9 @@ class EnhancedYouTubeDataProcessor:
         """
         Calculate temporal (trending) features.
         
+        First/last trend date, unique trending days and longest consecutive
+        streak are computed together in one pass (see src.data.temporal).
+        
         Args:
             df: Processed DataFrame
             
@@ -183,29 +246,7 @@ class EnhancedYouTubeDataProcessor:
         """
         logger.info("Calculating temporal features...")
         
-        # Sort by video_id and trending_date
-        df_sorted = df.sort_values(by=['video_id', 'trending_date'])
-        
-        # Calculate longest consecutive streak
-        df_sorted['date_diff'] = df_sorted.groupby('video_id')['trending_date'].diff().dt.days
-        df_sorted['new_streak'] = (df_sorted['date_diff'] > 1).cumsum()
-        streak_lengths = df_sorted.groupby(['video_id', 'new_streak']).size()
-        longest_streaks = streak_lengths.groupby('video_id').max().rename('longest_consecutive_streak_days')
-        
-        # Aggregate temporal features
-        agg_df = df.groupby('video_id').agg(
-            first_trend_date=('trending_date', 'min'),
-            last_trend_date=('trending_date', 'max'),
-            days_trending_unique=('trending_date', 'nunique')
-        )
-        
-        # Join streak data
-        final_agg_df = agg_df.join(longest_streaks)
-        final_agg_df['longest_consecutive_streak_days'] = (
-            final_agg_df['longest_consecutive_streak_days'].fillna(1).astype(int)
-        )
-        
-        return final_agg_df
+        return trend_features(df['video_id'], df['trending_date'])
     
     def create_final_dataframe(self, df: pd.DataFrame, temporal_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -220,8 +261,9 @@ class EnhancedYouTubeDataProcessor:
         """
         logger.info("Creating final de-duplicated table...")
         
-        # Sort by trending_date to get the latest stats for each video
-        df_latest_stats = df.sort_values('trending_date').drop_duplicates('video_id', keep='last')
+        # Sort by trending_date to get the latest stats for each video; the stable
+        # sort keeps the later row when a video trends twice on the same date
+        df_latest_stats = df.sort_values('trending_date', kind='mergesort').drop_duplicates('video_id', keep='last')
         
         # Merge aggregated temporal features
         final_db_df = df_latest_stats.merge(temporal_df, on='video_id', how='left')
@@ -243,59 +285,315 @@ class EnhancedYouTubeDataProcessor:
         logger.info(f"Final dataset contains {len(final_db_df)} unique videos")
         return final_db_df
     
-    def create_sql_database(self, df: pd.DataFrame, table_name: str = 'videos') -> None:
+    def process_csv_streaming(
+        self,
+        csv_path: str,
+        country: str = 'CA',
+        chunksize: int = 50000
+    ) -> pd.DataFrame:
+        """
+        Build the final de-duplicated table by streaming the CSV in chunks.
+        
+        Each chunk is processed and folded into per-video aggregates, so peak
+        memory is bounded by the chunk size and the number of videos rather
+        than by the size of the file.
+        
+        Args:
+            csv_path: Path to CSV file
+            country: Country code
+            chunksize: Number of CSV rows per chunk
+            
+        Returns:
+            Final DataFrame ready for database
+        """
+        logger.info(f"Streaming {csv_path} in chunks of {chunksize} rows...")
+        
+        aggregator = TrendAggregator(self.LATEST_STATS_COLUMNS)
+        
+        try:
+            reader = read_trending_csv(csv_path, usecols=PROCESSOR_COLUMNS, chunksize=chunksize)
+        except FileNotFoundError:
+            logger.error(f"CSV file not found: {csv_path}")
+            raise
+        
+        for chunk in reader:
+            processed = self.process_dataframe(chunk, country)
+            if self.snapshot:
+                self.snapshot.append_daily(processed, self.LATEST_STATS_COLUMNS)
+            if self.trend_days:
+                self.trend_days.write(processed)
+            aggregator.update(processed)
+        
+        logger.info(f"Streamed {aggregator.rows_seen} records")
+        
+        temporal_features = aggregator.trend_features()
+        return self.create_final_dataframe(aggregator.latest_rows(), temporal_features)
+    
+    def create_sql_database(
+        self,
+        df: pd.DataFrame,
+        table_name: str = 'videos',
+        incremental: bool = False
+    ) -> Dict[str, Any]:
         """
         Create and populate SQLite database.
         
+        The rows are bulk loaded in a single transaction (see SQLiteBulkLoader);
+        the query-pattern indexes of src.data.sql_indexes and the full-text index
+        of src.data.text_search are built after the load, and the table is analyzed.
+        Incremental upserts keep the full-text index current through triggers.
+        The materialized aggregates of src.data.aggregates are rebuilt with the
+        table, or have the groups touched by an incremental upsert recomputed.
+        
         Args:
             df: Final processed DataFrame
             table_name: Name of the table to create
+            incremental: Upsert into the existing table instead of rebuilding it
+            
+        Returns:
+            Load report with rows, seconds and rows_per_second
         """
         logger.info(f"Creating SQLite database: {self.db_path}")
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        columns = self.VIDEOS_TABLE_COLUMNS
+        post_load_sql = index_statements(table_name)
+        if incremental:
+            # The FTS triggers must exist before the upsert so they see its changes
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(self.VIDEOS_TABLE_SCHEMA.format(
+                    if_not_exists="IF NOT EXISTS", table_name=table_name
+                ))
+                ensure_fts(conn, table_name)
+                touched = aggregates.touched_groups(conn, df, table_name)
+                has_trend_days = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TREND_DAYS_TABLE,)
+                ).fetchone() is not None
+            conn.close()
+            insert_sql = self._upsert_sql(table_name, TREND_DAYS_TABLE if has_trend_days else None)
+        else:
+            insert_sql = (
+                f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            post_load_sql += rebuild_statements(table_name)
+            with sqlite3.connect(self.db_path) as conn:
+                available = aggregates.available_aggregates(conn, table_name)
+            conn.close()
+            post_load_sql += aggregates.rebuild_statements(table_name, available)
         
-        # Drop table if it exists
-        c.execute(f"DROP TABLE IF EXISTS {table_name}")
+        logger.info(f"Populating '{table_name}' table with {len(df)} unique videos...")
         
-        # Create table with schema
-        c.execute(f"""
-        CREATE TABLE {table_name} (
-            video_id TEXT PRIMARY KEY,
-            title TEXT,
-            description TEXT,
-            tags TEXT,
-            category_id INTEGER,
-            category_name TEXT,
-            channel_title TEXT,
-            country TEXT,
-            language TEXT,
-            publish_time TIMESTAMP,
-            first_trend_date DATE,
-            last_trend_date DATE,
-            days_trending_unique INTEGER,
-            longest_consecutive_streak_days INTEGER,
-            views INTEGER,
-            likes INTEGER,
-            comment_count INTEGER
-        );
-        """)
+        report = SQLiteBulkLoader(self.db_path).load(
+            table_name=table_name,
+            create_sql=self.VIDEOS_TABLE_SCHEMA.format(
+                if_not_exists="IF NOT EXISTS" if incremental else "", table_name=table_name
+            ),
+            insert_sql=insert_sql,
+            rows=self._to_sql_rows(df[columns]),
+            post_load_sql=post_load_sql,
+            replace=not incremental
+        )
         
-        logger.info(f"Populating '{table_name}' table with {len(df)} unique videos...")
+        if incremental:
+            aggregates.refresh_aggregates(self.db_path, touched, table_name)
+            logger.info(f"✅ Upserted {len(df)} videos into '{table_name}'. File: {self.db_path}")
+        else:
+            logger.info(f"✅ Database creation complete! File: {self.db_path}")
+        return report
+    
+    def _upsert_sql(self, table_name: str, trend_days_table: Optional[str] = None) -> str:
+        """
+        Build the INSERT ... ON CONFLICT(video_id) DO UPDATE statement.
+        
+        Trend windows are widened (earliest first date, latest last date).
+        With trend_days_table, the unique day count and longest streak are
+        recomputed from the stored per-day rows of the video (for the country
+        the row ends up with), which already include the incoming days.
+        Otherwise they are combined from the stored and incoming windows: the
+        day counts of disjoint windows add up (overlapping windows are taken
+        to be a re-delivery and keep the larger count), and windows on
+        adjacent days join the streaks at their touching edges. The edge
+        streak of a window is its whole day count when the window has no
+        gaps and at least 1 otherwise, so the joined streak is exact for
+        gap-free windows and a lower bound for the rest. All other columns
+        take the incoming values only when the incoming row is at least as
+        recent as the stored one.
         
-        # Populate the table
-        df.to_sql(table_name, conn, if_exists='append', index=False)
+        Args:
+            table_name: Name of the table
+            trend_days_table: Per-day fact table to recompute the counts from (see TrendDaysStore)
+            
+        Returns:
+            Parameterized upsert statement over VIDEOS_TABLE_COLUMNS
+        """
+        columns = self.VIDEOS_TABLE_COLUMNS
+        is_newer = f"excluded.last_trend_date >= COALESCE({table_name}.last_trend_date, '')"
+        
+        old_days = f"COALESCE({table_name}.days_trending_unique, 0)"
+        old_streak = f"COALESCE({table_name}.longest_consecutive_streak_days, 0)"
+        old_first, old_last = f"{table_name}.first_trend_date", f"{table_name}.last_trend_date"
+        disjoint = (
+            f"({_sql_day('excluded.first_trend_date')} > {_sql_day(old_last)} "
+            f"OR {_sql_day('excluded.last_trend_date')} < {_sql_day(old_first)})"
+        )
+        adjacent = (
+            f"({_sql_day('excluded.first_trend_date')} - {_sql_day(old_last)} = 1 "
+            f"OR {_sql_day(old_first)} - {_sql_day('excluded.last_trend_date')} = 1)"
+        )
+        combined_days = (
+            f"CASE WHEN {disjoint} THEN {old_days} + excluded.days_trending_unique "
+            f"ELSE MAX({old_days}, excluded.days_trending_unique) END"
+        )
+        joined_streak = (
+            f"{_sql_edge_streak(old_first, old_last, old_days)} + "
+            f"{_sql_edge_streak('excluded.first_trend_date', 'excluded.last_trend_date', 'excluded.days_trending_unique')}"
+        )
+        combined_streak = (
+            f"MAX({old_streak}, excluded.longest_consecutive_streak_days, "
+            f"CASE WHEN {adjacent} THEN {joined_streak} ELSE 0 END)"
+        )
         
-        conn.commit()
-        conn.close()
+        if trend_days_table:
+            # Gaps and islands: consecutive days share julianday(day) - row number
+            stored_days = (
+                f"SELECT DISTINCT date(trending_date) AS day FROM {trend_days_table} "
+                f"WHERE video_id = excluded.video_id AND country = "
+                f"CASE WHEN {is_newer} THEN excluded.country ELSE {table_name}.country END"
+            )
+            recomputed_days = f"(SELECT COUNT(*) FROM ({stored_days}))"
+            recomputed_streak = (
+                f"(SELECT MAX(days) FROM (SELECT COUNT(*) AS days FROM "
+                f"(SELECT julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island FROM ({stored_days})) "
+                f"GROUP BY island))"
+            )
+            # Videos without stored rows (e.g. ingested before the table existed) fall back
+            combined_days = f"COALESCE(NULLIF({recomputed_days}, 0), {combined_days})"
+            combined_streak = f"COALESCE({recomputed_streak}, {combined_streak})"
+        
+        widened = {
+            'first_trend_date': f"MIN(COALESCE({old_first}, excluded.first_trend_date), excluded.first_trend_date)",
+            'last_trend_date': f"MAX(COALESCE({old_last}, excluded.last_trend_date), excluded.last_trend_date)",
+            'days_trending_unique': combined_days,
+            'longest_consecutive_streak_days': combined_streak,
+        }
+        assignments = [
+            f"{col} = {widened[col]}" if col in widened
+            else f"{col} = CASE WHEN {is_newer} THEN excluded.{col} ELSE {table_name}.{col} END"
+            for col in columns if col != 'video_id'
+        ]
         
-        logger.info(f"✅ Database creation complete! File: {self.db_path}")
+        return (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(video_id) DO UPDATE SET {', '.join(assignments)}"
+        )
+    
+    @staticmethod
+    def _to_sql_rows(df: pd.DataFrame) -> List[tuple]:
+        """
+        Convert a DataFrame to SQLite parameter tuples.
+        
+        Timestamps are written in the same text format as DataFrame.to_sql.
+        
+        Args:
+            df: DataFrame to convert
+            
+        Returns:
+            List of row tuples with native Python values
+        """
+        converted = {}
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                values = values.map(str).where(values.notna(), None)
+            converted[col] = values.astype(object).where(values.notna(), None)
+        return list(zip(*(converted[col].tolist() for col in df.columns)))
+    
+    def search_text(
+        self,
+        query: str,
+        limit: int = 10,
+        table_name: str = 'videos',
+        country: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyword search over the SQL database, ranked by BM25.
+        
+        Args:
+            query: Keywords (channel name, game title, ...)
+            limit: Maximum number of results
+            table_name: Name of the videos table
+            country: Optional country code filter
+            
+        Returns:
+            List of video dictionaries with a 'score', best first
+        """
+        return search_text(self.db_path, query, limit=limit, table_name=table_name, country=country)
     
+    def fetch_videos(self, video_ids: List[str], table_name: str = 'videos') -> pd.DataFrame:
+        """
+        Read stored rows for the given videos.
+        
+        Args:
+            video_ids: Video IDs to fetch
+            table_name: Name of the table
+            
+        Returns:
+            DataFrame with the stored rows
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            frames = []
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(video_ids), 900):
+                batch = list(video_ids[i:i + 900])
+                placeholders = ', '.join('?' for _ in batch)
+                frames.append(pd.read_sql_query(
+                    f"SELECT * FROM {table_name} WHERE video_id IN ({placeholders})",
+                    conn,
+                    params=batch
+                ))
+        finally:
+            conn.close()
+        
+        if not frames:
+            return pd.DataFrame(columns=self.VIDEOS_TABLE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_country_videos(self, countries: List[str], table_name: str = 'videos') -> pd.DataFrame:
+        """
+        Read all stored rows of the given countries, with dates parsed back to datetimes.
+
+        Args:
+            countries: Country codes
+            table_name: Name of the table
+
+        Returns:
+            DataFrame with the same columns and date types as the final table
+        """
+        placeholders = ', '.join('?' for _ in countries)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(self.VIDEOS_TABLE_COLUMNS)} FROM {table_name} "
+                f"WHERE country IN ({placeholders})",
+                conn,
+                params=list(countries)
+            )
+        finally:
+            conn.close()
+
+        for col in ['publish_time', 'first_trend_date', 'last_trend_date']:
+            df[col] = pd.to_datetime(df[col])
+        return df
+
     def prepare_for_vector_db(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare data for vector database indexing with optimized metadata.
         
+        searchable_text is built column-wise (see vector_searchable_text). The
+        returned frame shares the other columns' data with df.
+        
         Args:
             df: Final processed DataFrame
             
@@ -304,25 +602,9 @@ class EnhancedYouTubeDataProcessor:
         """
         logger.info("Preparing data for vector database...")
         
-        df_vector = df.copy()
-        
-        # Create searchable text combining multiple fields
-        def create_searchable_text(row):
-            parts = []
-            parts.append(f"Title: {row['title']}")
-            parts.append(f"Channel: {row['channel_title']}")
-            parts.append(f"Category: {row['category_name']}")
-            
-            if row['tags'] and row['tags'] != '':
-                parts.append(f"Tags: {row['tags']}")
-            
-            if row['description'] and row['description'] != '[no description]':
-                desc = row['description'][:300]  # Limit description
-                parts.append(f"Description: {desc}")
-            
-            return " | ".join(parts)
-        
-        df_vector['searchable_text'] = df_vector.apply(create_searchable_text, axis=1)
+        # Shallow copy: the new column is added without copying the existing ones
+        df_vector = df.copy(deep=False)
+        df_vector['searchable_text'] = vector_searchable_text(df)
         
         logger.info(f"Prepared {len(df_vector)} documents for vector database")
         return df_vector
@@ -331,6 +613,9 @@ class EnhancedYouTubeDataProcessor:
         """
         Convert DataFrame to vector database documents with optimized metadata and filters.
         
+        Columns are converted once for the whole frame (see src.data.documents);
+        use iter_vector_documents to stream documents batch by batch instead.
+        
         Args:
             df: Processed DataFrame with searchable_text
             
@@ -339,63 +624,45 @@ class EnhancedYouTubeDataProcessor:
         """
         logger.info("Creating vector database documents with metadata...")
         
-        documents = []
-        
-        for idx, row in df.iterrows():
-            # Parse tags list from string
-            tags_list = []
-            if row['tags'] and row['tags'] != '':
-                tags_list = [tag.strip() for tag in row['tags'].split() if tag.strip()]
-            
-            # Create document with comprehensive metadata for filtering
-            doc = {
-                'id': row['video_id'],
-                'text': row['searchable_text'],
-                'metadata': {
-                    # Core identifiers
-                    'video_id': row['video_id'],
-                    'title': row['title'],
-                    'channel': row['channel_title'],
-                    
-                    # Category information (for filtering)
-                    'category': row['category_name'],
-                    'category_id': int(row['category_id']),
-                    
-                    # Country and language (for filtering)
-                    'country': row['country'],
-                    'language': row['language'],
-                    
-                    # Tags (for filtering and search)
-                    'tags': tags_list,
-                    
-                    # Engagement metrics (for filtering and ranking)
-                    'views': int(row['views']),
-                    'likes': int(row['likes']),
-                    'comment_count': int(row['comment_count']),
-                    
-                    # Temporal features (for filtering)
-                    'publish_time': str(row['publish_time']),
-                    'first_trend_date': str(row['first_trend_date']),
-                    'last_trend_date': str(row['last_trend_date']),
-                    'days_trending_unique': int(row['days_trending_unique']),
-                    'longest_consecutive_streak_days': int(row['longest_consecutive_streak_days']),
-                    
-                    # Description (optional)
-                    'description': row['description'][:500] if row['description'] != '[no description]' else '',
-                }
-            }
-            documents.append(doc)
+        documents = build_vector_documents(df)
         
         logger.info(f"Created {len(documents)} vector documents with full metadata")
         return documents
-    
-    def generate_embeddings(self, documents: List[Dict[str, Any]], batch_size: int = 100) -> np.ndarray:
+
+    def iter_vector_documents(self, df: pd.DataFrame, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream vector database documents, converting batch_size rows at a time.
+
+        Produces the same documents as create_vector_documents without holding
+        all of them in memory; pass the iterator to PipelinedIndexer.index.
+
+        Args:
+            df: Processed DataFrame with searchable_text
+            batch_size: Rows converted per batch
+
+        Returns:
+            Iterator over documents ready for vector DB indexing
+        """
+        return iter_vector_documents(df, batch_size=batch_size)
+
+    def generate_embeddings(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: int = 100,
+        multiprocess_threshold: Optional[int] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for documents using the embedding model.
         
+        From multiprocess_threshold documents on, a model with
+        encode_multiprocess (LocalEmbedding) shards the texts across worker
+        processes instead of encoding them in this process.
+        
         Args:
             documents: List of document dictionaries with 'text' field
             batch_size: Batch size for embedding generation
+            multiprocess_threshold: Minimum number of documents for the process pool
+                (default: settings.embedding_multiprocess_threshold)
             
         Returns:
             Array of embeddings
@@ -408,67 +675,182 @@ class EnhancedYouTubeDataProcessor:
         # Extract texts
         texts = [doc['text'] for doc in documents]
         
-        # Generate embeddings in batches
-        embeddings = self.embedding_model.encode(
-            texts,
-            batch_size=batch_size,
-            show_progress=True
-        )
+        if multiprocess_threshold is None:
+            multiprocess_threshold = get_settings().embedding_multiprocess_threshold
+        
+        if len(texts) >= multiprocess_threshold and hasattr(self.embedding_model, 'encode_multiprocess'):
+            embeddings = self.embedding_model.encode_multiprocess(texts, batch_size=batch_size, show_progress=True)
+        else:
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress=True
+            )
         
         logger.info(f"Generated {len(embeddings)} embeddings (dimension: {embeddings.shape[1]})")
         return embeddings
     
-    def process_csv_file(
+    def build_final_table(
         self,
         csv_path: str,
         country: str = 'CA',
-        create_sql: bool = True,
-        prepare_vector: bool = True,
-        generate_embeddings: bool = False
-    ) -> Tuple[Optional[pd.DataFrame], Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        chunksize: Optional[int] = None
+    ) -> pd.DataFrame:
         """
-        Complete processing pipeline from CSV to databases with embeddings.
+        Build the final de-duplicated table for a single CSV file.
         
         Args:
             csv_path: Path to CSV file
             country: Country code
-            create_sql: Whether to create SQL database
-            prepare_vector: Whether to prepare vector database data
-            generate_embeddings: Whether to generate embeddings (requires embedding_model)
+            chunksize: If set, stream the CSV in chunks of this many rows (bounded memory)
             
         Returns:
-            Tuple of (sql_df, vector_documents, embeddings)
+            Final DataFrame ready for database
         """
+        if chunksize:
+            return self.process_csv_streaming(csv_path, country, chunksize)
+        
         logger.info(f"Loading data from {csv_path}...")
         
         try:
-            df = pd.read_csv(csv_path)
+            df = read_trending_csv(csv_path, usecols=PROCESSOR_COLUMNS)
         except FileNotFoundError:
             logger.error(f"CSV file not found: {csv_path}")
             raise
         
         # Process dataframe
         df_processed = self.process_dataframe(df, country)
+        if self.snapshot:
+            self.snapshot.append_daily(df_processed, self.LATEST_STATS_COLUMNS)
+        if self.trend_days:
+            self.trend_days.write(df_processed)
         
         # Calculate temporal features
         temporal_features = self.calculate_temporal_features(df_processed)
         
         # Create final dataframe
-        final_df = self.create_final_dataframe(df_processed, temporal_features)
+        return self.create_final_dataframe(df_processed, temporal_features)
+    
+    def build_final_tables(
+        self,
+        csv_paths: List[str],
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Build and merge the final tables of several country files concurrently.
+        
+        Each file is processed in its own worker process with the country code
+        taken from the filename (e.g. CAvideos.csv -> CA), so total wall time is
+        close to that of the slowest file.
         
+        Args:
+            csv_paths: Paths to CSV files
+            max_workers: Number of worker processes (default: one per file, capped at CPU count)
+            chunksize: If set, each worker streams its CSV in chunks of this many rows
+            
+        Returns:
+            Merged final DataFrame with one row per video
+        """
+        max_workers = max_workers or min(len(csv_paths), os.cpu_count() or 1)
+        # Split the cores between the files for language detection
+        language_workers = max(1, (os.cpu_count() or 1) // max_workers)
+        
+        logger.info(f"Processing {len(csv_paths)} CSV files on {max_workers} workers...")
+        
+        tables = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _build_final_table_worker,
+                    self.db_path,
+                    str(csv_path),
+                    country_from_filename(csv_path),
+                    chunksize,
+                    language_workers,
+                    self.snapshot.root if self.snapshot else None,
+                    self.trend_days is not None
+                ): csv_path
+                for csv_path in csv_paths
+            }
+            for future in as_completed(futures):
+                csv_path = futures[future]
+                table = future.result()
+                logger.info(f"✓ {Path(csv_path).name}: {len(table)} unique videos")
+                tables.append(table)
+        
+        return self.merge_final_tables(tables)
+    
+    def merge_final_tables(self, tables: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Merge per-country final tables into one table keyed by video_id.
+        
+        A video that trended in several countries keeps the row of the country
+        where it trended most recently (highest views on ties).
+        
+        Args:
+            tables: Final DataFrames from build_final_table
+            
+        Returns:
+            Merged final DataFrame
+        """
+        merged = pd.concat(tables, ignore_index=True)
+        merged = (
+            merged.sort_values(['last_trend_date', 'views'], kind='mergesort')
+            .drop_duplicates('video_id', keep='last')
+            .sort_index()
+            .reset_index(drop=True)
+        )
+        logger.info(f"Merged dataset contains {len(merged)} unique videos")
+        return merged
+    
+    def export_final_table(
+        self,
+        final_df: pd.DataFrame,
+        create_sql: bool = True,
+        prepare_vector: bool = True,
+        generate_embeddings: bool = False,
+        incremental: bool = False
+    ) -> Tuple[Optional[pd.DataFrame], Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Write the final table to SQL and prepare vector documents and embeddings.
+        
+        Args:
+            final_df: Final de-duplicated DataFrame
+            create_sql: Whether to create SQL database
+            prepare_vector: Whether to prepare vector database data
+            generate_embeddings: Whether to generate embeddings (requires embedding_model)
+            incremental: Upsert into the existing database; vector documents are
+                built from the merged stored rows of the videos in final_df
+            
+        Returns:
+            Tuple of (sql_df, vector_documents, embeddings)
+        """
         sql_df = None
         vector_documents = None
         embeddings = None
         
         # Create SQL database
         if create_sql:
-            self.create_sql_database(final_df)
+            self.create_sql_database(final_df, incremental=incremental)
             sql_df = final_df
         
+        # Write the columnar snapshot of the final table
+        if self.snapshot:
+            snapshot_df = final_df
+            if incremental and create_sql:
+                # Rewrite the affected countries from the merged stored rows
+                snapshot_df = self.fetch_country_videos(final_df['country'].unique().tolist())
+            self.snapshot.write_final(snapshot_df)
+        
         # Prepare for vector database
         if prepare_vector:
+            source_df = final_df
+            if incremental and create_sql:
+                source_df = self.fetch_videos(final_df['video_id'].tolist())
+            
             # Prepare dataframe with searchable text
-            vector_df = self.prepare_for_vector_db(final_df)
+            vector_df = self.prepare_for_vector_db(source_df)
             
             # Create vector documents with metadata
             vector_documents = self.create_vector_documents(vector_df)
@@ -479,6 +861,104 @@ class EnhancedYouTubeDataProcessor:
         
         logger.info("✅ Data processing pipeline complete!")
         return sql_df, vector_documents, embeddings
+    
+    def process_csv_file(
+        self,
+        csv_path: str,
+        country: str = 'CA',
+        create_sql: bool = True,
+        prepare_vector: bool = True,
+        generate_embeddings: bool = False,
+        chunksize: Optional[int] = None,
+        incremental: bool = False
+    ) -> Tuple[Optional[pd.DataFrame], Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Complete processing pipeline from CSV to databases with embeddings.
+        
+        Args:
+            csv_path: Path to CSV file
+            country: Country code
+            create_sql: Whether to create SQL database
+            prepare_vector: Whether to prepare vector database data
+            generate_embeddings: Whether to generate embeddings (requires embedding_model)
+            chunksize: If set, stream the CSV in chunks of this many rows (bounded memory)
+            incremental: Upsert into the existing database instead of rebuilding it
+            
+        Returns:
+            Tuple of (sql_df, vector_documents, embeddings)
+        """
+        if self.snapshot and not incremental:
+            self.snapshot.clear_daily([country])
+        if self.trend_days and not incremental:
+            self.trend_days.clear([country])
+        final_df = self.build_final_table(csv_path, country, chunksize)
+        return self.export_final_table(
+            final_df, create_sql, prepare_vector, generate_embeddings, incremental
+        )
+    
+    def process_csv_files(
+        self,
+        csv_paths: List[str],
+        create_sql: bool = True,
+        prepare_vector: bool = True,
+        generate_embeddings: bool = False,
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        incremental: bool = False
+    ) -> Tuple[Optional[pd.DataFrame], Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Complete processing pipeline for several country CSV files into one database.
+        
+        Args:
+            csv_paths: Paths to CSV files (country code taken from each filename)
+            create_sql: Whether to create SQL database
+            prepare_vector: Whether to prepare vector database data
+            generate_embeddings: Whether to generate embeddings (requires embedding_model)
+            max_workers: Number of worker processes (default: one per file)
+            chunksize: If set, stream each CSV in chunks of this many rows
+            incremental: Upsert into the existing database instead of rebuilding it
+            
+        Returns:
+            Tuple of (sql_df, vector_documents, embeddings)
+        """
+        countries = [country_from_filename(p) for p in csv_paths]
+        if self.snapshot and not incremental:
+            self.snapshot.clear_daily(countries)
+        if self.trend_days and not incremental:
+            self.trend_days.clear(countries)
+        final_df = self.build_final_tables(csv_paths, max_workers, chunksize)
+        return self.export_final_table(
+            final_df, create_sql, prepare_vector, generate_embeddings, incremental
+        )
+
+
+def _sql_day(expr: str) -> str:
+    """SQL day number of a stored timestamp, ignoring the time of day"""
+    return f"julianday(date({expr}))"
+
+
+def _sql_edge_streak(first: str, last: str, days: str) -> str:
+    """SQL streak touching either end of a trend window: all its days if it has no gaps, else at least 1"""
+    return f"(CASE WHEN {_sql_day(last)} - {_sql_day(first)} + 1 = {days} THEN {days} ELSE 1 END)"
+
+
+def _build_final_table_worker(
+    db_path: str,
+    csv_path: str,
+    country: str,
+    chunksize: Optional[int],
+    language_workers: int,
+    snapshot_dir: Optional[Path] = None,
+    record_trend_days: bool = False
+) -> pd.DataFrame:
+    """Build one file's final table inside a worker process"""
+    processor = EnhancedYouTubeDataProcessor(
+        db_path=db_path,
+        language_workers=language_workers,
+        snapshot_dir=snapshot_dir,
+        record_trend_days=record_trend_days
+    )
+    return processor.build_final_table(csv_path, country, chunksize)
 
 
 def main():
@@ -490,11 +970,19 @@ def main():
     parser.add_argument('--country', type=str, default='CA', help='Country code')
     parser.add_argument('--db-path', type=str, default='youtube_trends_canada.db', 
                        help='SQLite database path')
+    parser.add_argument('--lang-workers', type=int, default=None,
+                       help='Worker processes for language detection (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                       help='Stream the CSV in chunks of this many rows (bounded memory)')
     
     args = parser.parse_args()
     
-    processor = EnhancedYouTubeDataProcessor(db_path=args.db_path)
-    processor.process_csv_file(args.csv, country=args.country)
+    processor = EnhancedYouTubeDataProcessor(
+        db_path=args.db_path,
+        language_workers=args.lang_workers,
+        record_trend_days=True
+    )
+    processor.process_csv_file(args.csv, country=args.country, chunksize=args.chunksize)
 
 
 if __name__ == "__main__":
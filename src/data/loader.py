@@ -1,44 +1,400 @@
 """Data loading utilities for YouTube dataset"""
 
+import os
+import time
+import importlib.util
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pandas.api.types import union_categoricals
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 from loguru import logger
 
 from src.config import get_settings
 
 
+# Explicit dtypes of the non-text columns of the Kaggle trending CSVs.
+# Text columns are left to the parser so missing values stay NaN.
+TRENDING_CSV_DTYPES: Dict[str, str] = {
+    'channel_title': 'category',  # A few thousand channels across tens of thousands of rows
+    'category_id': 'int16',
+    'views': 'int64',
+    'likes': 'int64',
+    'dislikes': 'int64',
+    'comment_count': 'int64',
+    'comments_disabled': 'bool',
+    'ratings_disabled': 'bool',
+    'video_error_or_removed': 'bool',
+}
+
+TRENDING_DATE_FORMATS: Dict[str, str] = {
+    'trending_date': '%y.%d.%m',
+    'publish_time': 'ISO8601',
+}
+
+# Counters are downcast to the smallest integer type that holds their values
+DOWNCAST_COLUMNS = ['views', 'likes', 'dislikes', 'comment_count']
+
+# Columns read by EnhancedYouTubeDataProcessor
+PROCESSOR_COLUMNS = [
+    'video_id', 'trending_date', 'title', 'channel_title', 'category_id',
+    'publish_time', 'tags', 'views', 'likes', 'comment_count', 'description'
+]
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    # Arrow equivalents of TRENDING_CSV_DTYPES
+    _ARROW_TYPES = {
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'int16': pa.int16(),
+        'int64': pa.int64(),
+        'bool': pa.bool_(),
+    }
+
+
+def read_trending_csv(
+    file_path: Union[str, Path],
+    usecols: Optional[List[str]] = None,
+    engine: Optional[str] = None,
+    chunksize: Optional[int] = None,
+    on_bad_lines: str = 'error'
+):
+    """
+    Read a trending CSV with the explicit schema.
+
+    Args:
+        file_path: Path to CSV file
+        usecols: Only read these columns (default: all)
+        engine: CSV parser, 'pyarrow' or 'c' (default: pyarrow when installed;
+            chunked reads always use 'c')
+        chunksize: If set, return an iterator of typed chunks of this many rows
+        on_bad_lines: What to do with malformed lines ('error', 'warn' or 'skip')
+
+    Returns:
+        Typed DataFrame, or an iterator of typed DataFrames with chunksize
+    """
+    if chunksize or engine is None:
+        engine = 'pyarrow' if PYARROW_AVAILABLE and not chunksize else 'c'
+
+    dtypes = TRENDING_CSV_DTYPES
+    if usecols is not None:
+        dtypes = {col: dtype for col, dtype in dtypes.items() if col in usecols}
+
+    reader = pd.read_csv(
+        file_path,
+        usecols=usecols,
+        dtype=dtypes,
+        engine=engine,
+        chunksize=chunksize,
+        encoding='utf-8',
+        on_bad_lines=on_bad_lines
+    )
+    if chunksize:
+        return (apply_trending_types(chunk) for chunk in reader)
+    return apply_trending_types(reader)
+
+
+def read_trending_table(
+    file_path: Union[str, Path],
+    usecols: Optional[List[str]] = None,
+    skipped: Optional[List[Any]] = None
+) -> "pa.Table":
+    """
+    Read a trending CSV into an Arrow table with the explicit schema (requires pyarrow).
+
+    Arrow's multithreaded parser releases the GIL, so several files can be
+    read concurrently from a thread pool. Dates are left as text; convert the
+    table with apply_trending_types(table.to_pandas()).
+
+    Args:
+        file_path: Path to CSV file
+        usecols: Only read these columns (default: all)
+        skipped: If given, malformed rows are skipped and collected here
+            (default: malformed rows raise)
+
+    Returns:
+        Arrow table
+    """
+    def skip_row(row) -> str:
+        skipped.append(row)
+        return 'skip'
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: _ARROW_TYPES[dtype] for col, dtype in TRENDING_CSV_DTYPES.items()},
+        include_columns=usecols,
+        strings_can_be_null=True
+    )
+    parse_options = pa_csv.ParseOptions(
+        newlines_in_values=True,  # Descriptions contain quoted line breaks
+        invalid_row_handler=skip_row if skipped is not None else None
+    )
+    return pa_csv.read_csv(file_path, parse_options=parse_options, convert_options=convert_options)
+
+
+def apply_trending_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse the date columns and downcast the counters of a freshly read frame.
+
+    Args:
+        df: Raw trending rows
+
+    Returns:
+        The same DataFrame, converted in place
+    """
+    for col, date_format in TRENDING_DATE_FORMATS.items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=date_format)
+    for col in DOWNCAST_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate frames without losing categorical columns.
+
+    pd.concat turns categoricals with different categories into object
+    columns; the categories are unified first so the result stays categorical.
+    Unified categories are sorted, as read_csv sorts them, so the result does
+    not depend on how the rows were split into frames.
+
+    Args:
+        frames: DataFrames with the same columns
+
+    Returns:
+        Combined DataFrame
+    """
+    frames = list(frames)
+    for col in frames[0].columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = union_categoricals([frame[col] for frame in frames], sort_categories=True).categories
+            frames = [
+                frame.assign(**{col: frame[col].cat.set_categories(categories)})
+                for frame in frames
+            ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Report the memory used by each column.
+
+    Args:
+        df: DataFrame to measure
+
+    Returns:
+        DataFrame indexed by column with dtype, bytes and share of the total
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': usage,
+        'share': usage / max(int(usage.sum()), 1),
+    })
+    return report.sort_values('bytes', ascending=False)
+
+
+_SAMPLE_KEY = '_sample_key'
+
+
+class ReservoirSampler:
+    """
+    Uniform sample without replacement over a stream of DataFrame chunks.
+
+    Every row gets an independent uniform random key and the sampler keeps
+    the n rows with the smallest keys seen so far (random-key reservoir
+    sampling), so at most n + len(chunk) rows are in memory at any time and
+    every row of the stream is equally likely to end up in the sample. Keys
+    come from a seeded generator: the same chunks and seed give the same sample.
+
+    With stratify_by, up to n rows are kept per stratum together with the
+    stratum's row count, and the final sample allocates n proportionally to
+    those counts (largest remainder), taking the smallest-key rows of each
+    stratum. Rows with a missing stratum value are never sampled.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        stratify_by: Optional[Union[str, List[str]]] = None,
+        seed: int = 42
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            n: Sample size
+            stratify_by: Column(s) to stratify on (e.g. 'country' or 'category_id')
+            seed: Seed of the random keys
+        """
+        self.n = n
+        self.stratify_by = [stratify_by] if isinstance(stratify_by, str) else stratify_by
+        self.rng = np.random.default_rng(seed)
+        self.rows_seen = 0
+        self.stratum_counts: Dict = {}
+        self._reservoir: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Offer the rows of a chunk to the sample.
+
+        Args:
+            chunk: Next rows of the stream
+        """
+        if chunk.empty:
+            return
+        self.rows_seen += len(chunk)
+        chunk = chunk.assign(**{_SAMPLE_KEY: self.rng.random(len(chunk))})
+
+        if self.stratify_by:
+            for stratum, count in chunk.groupby(self.stratify_by, observed=True, sort=False).size().items():
+                self.stratum_counts[stratum] = self.stratum_counts.get(stratum, 0) + count
+
+        candidates = chunk if self._reservoir is None else concat_typed([self._reservoir, chunk])
+        candidates = candidates.sort_values(_SAMPLE_KEY, kind='stable')
+        if self.stratify_by:
+            candidates = candidates.groupby(self.stratify_by, observed=True, sort=False).head(self.n)
+        else:
+            candidates = candidates.head(self.n)
+        self._reservoir = candidates.reset_index(drop=True)
+
+    def _allocation(self) -> Dict:
+        """Rows to draw from each stratum, proportional to its size"""
+        counts = pd.Series(self.stratum_counts, dtype='int64')
+        total = min(self.n, int(counts.sum()))
+        exact = counts / counts.sum() * total
+        allocation = np.floor(exact).astype('int64')
+        remainder = total - int(allocation.sum())
+        if remainder:
+            top_up = (exact - allocation).sort_values(ascending=False, kind='stable').index[:remainder]
+            allocation[top_up] += 1
+        return allocation.to_dict()
+
+    def sample(self) -> pd.DataFrame:
+        """
+        Return the current sample.
+
+        Returns:
+            DataFrame of min(n, rows seen) rows in random order, with a fresh index
+        """
+        if self._reservoir is None:
+            return pd.DataFrame()
+
+        reservoir = self._reservoir
+        if self.stratify_by:
+            allocation = self._allocation()
+            if len(self.stratify_by) == 1:
+                keys = reservoir[self.stratify_by[0]].astype(object)
+            else:
+                keys = reservoir[self.stratify_by].apply(tuple, axis=1)
+            rank = reservoir.groupby(self.stratify_by, observed=True, sort=False).cumcount()
+            # Reservoir rows are ordered by key, so rank < quota keeps each stratum's smallest keys
+            quota = keys.map(allocation).fillna(0)
+            reservoir = reservoir[rank.to_numpy() < quota.to_numpy()]
+
+        return reservoir.drop(columns=_SAMPLE_KEY).reset_index(drop=True)
+
+
+def reservoir_sample(
+    chunks: Iterable[pd.DataFrame],
+    n: int,
+    stratify_by: Optional[Union[str, List[str]]] = None,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Sample n rows from a stream of chunks in constant memory (see ReservoirSampler).
+
+    Args:
+        chunks: DataFrame chunks, e.g. from read_trending_csv(..., chunksize=...)
+        n: Sample size
+        stratify_by: Column(s) to stratify on
+        seed: Random seed
+
+    Returns:
+        Sample DataFrame
+    """
+    sampler = ReservoirSampler(n, stratify_by=stratify_by, seed=seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampler.sample()
+
+
+def country_from_filename(csv_path) -> str:
+    """
+    Extract the country code from a trending CSV filename (e.g. CAvideos.csv -> CA).
+    
+    Args:
+        csv_path: Path to CSV file
+        
+    Returns:
+        Two-letter country code
+    """
+    stem = Path(csv_path).stem
+    return stem[:2].upper() if len(stem) >= 2 else 'CA'
+
+
 class DataLoader:
     """Load and manage YouTube trending data from CSV files"""
     
     def __init__(self):
         self.settings = get_settings()
+        self.load_report: List[Dict[str, Any]] = []
         
-    def load_csv(self, file_path: Path) -> pd.DataFrame:
+    def load_csv(
+        self,
+        file_path: Path,
+        usecols: Optional[List[str]] = None,
+        engine: Optional[str] = None,
+        report_memory: bool = False
+    ) -> pd.DataFrame:
         """
         Load a single CSV file
         
+        Columns are read with the explicit trending schema (categorical
+        channel names, small integer types, parsed dates); see read_trending_csv.
+        
         Args:
             file_path: Path to CSV file
+            usecols: Only read these columns (default: all)
+            engine: CSV parser, 'pyarrow' or 'c' (default: pyarrow when installed)
+            report_memory: Log the memory used by each column
             
         Returns:
             DataFrame with loaded data
         """
         try:
             logger.info(f"Loading data from {file_path}")
-            df = pd.read_csv(file_path, encoding='utf-8', on_bad_lines='skip')
+            df = read_trending_csv(file_path, usecols=usecols, engine=engine, on_bad_lines='skip')
             logger.info(f"Loaded {len(df)} records from {file_path.name}")
+            if report_memory:
+                self.log_memory_report(df)
             return df
         except Exception as e:
             logger.error(f"Error loading {file_path}: {e}")
             raise
     
-    def load_all_csv_files(self, directory: Optional[Path] = None) -> pd.DataFrame:
+    def load_all_csv_files(
+        self,
+        directory: Optional[Path] = None,
+        max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
         """
         Load all CSV files from a directory and combine them
         
+        Files are read concurrently on a thread pool (with the pyarrow CSV
+        reader when installed), so total time is close to that of the largest
+        file. Per-file rows, timing and errors are kept in self.load_report;
+        files that fail to load are skipped.
+        
         Args:
             directory: Directory containing CSV files (default: raw_data_dir)
+            max_workers: Number of reader threads (default: one per file, capped at CPU count)
             
         Returns:
             Combined DataFrame
@@ -53,36 +409,137 @@ class DataLoader:
         
         logger.info(f"Found {len(csv_files)} CSV files")
         
-        dataframes = []
-        for csv_file in csv_files:
+        max_workers = max_workers or min(len(csv_files), os.cpu_count() or 1)
+        self.load_report = []
+        
+        if PYARROW_AVAILABLE:
+            combined_df = self._load_files_arrow(csv_files, max_workers)
+        else:
+            combined_df = self._load_files_pandas(csv_files, max_workers)
+        logger.info(f"Combined dataset: {len(combined_df)} total records")
+        
+        return combined_df
+    
+    def _read_concurrently(self, read, csv_files: List[Path], max_workers: int) -> List[Any]:
+        """
+        Run read(csv_file) for every file on a thread pool.
+        
+        Each file's rows, read time and error (if any) are appended to
+        self.load_report; failed files are logged and left out.
+        
+        Returns:
+            Results of the successful reads, in the order of csv_files
+        """
+        def timed_read(csv_file: Path):
+            started = time.perf_counter()
             try:
-                df = self.load_csv(csv_file)
-                # Add source file as metadata
-                df['source_file'] = csv_file.name
-                dataframes.append(df)
+                return read(csv_file), time.perf_counter() - started, None
             except Exception as e:
-                logger.warning(f"Skipping {csv_file.name}: {e}")
-                continue
+                return None, time.perf_counter() - started, e
         
-        if not dataframes:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(executor.map(timed_read, csv_files))
+        
+        results = []
+        for csv_file, (result, seconds, error) in zip(csv_files, outcomes):
+            rows = 0 if result is None else len(result)
+            self.load_report.append({
+                'file': csv_file.name,
+                'rows': rows,
+                'seconds': seconds,
+                'error': None if error is None else str(error),
+            })
+            if error is None:
+                logger.info(f"✓ {csv_file.name}: {rows} records in {seconds:.2f}s")
+                results.append(result)
+            else:
+                logger.warning(f"Skipping {csv_file.name}: {error}")
+        
+        if not results:
             raise ValueError("No data could be loaded from CSV files")
+        return results
+    
+    def _load_files_arrow(self, csv_files: List[Path], max_workers: int) -> pd.DataFrame:
+        """Read files concurrently into Arrow tables and concatenate them without copying"""
+        def read(csv_file: Path) -> "pa.Table":
+            table = read_trending_table(csv_file, skipped=[])
+            # Source file as a dictionary column: one string per file, not per row
+            source = pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(table.num_rows, dtype=np.int32)), pa.array([csv_file.name])
+            )
+            return table.append_column('source_file', source)
         
-        combined_df = pd.concat(dataframes, ignore_index=True)
-        logger.info(f"Combined dataset: {len(combined_df)} total records")
+        tables = self._read_concurrently(read, csv_files, max_workers)
         
-        return combined_df
+        # The combined table references the per-file chunks instead of copying them
+        combined = pa.concat_tables(tables, promote_options='default')
+        return apply_trending_types(combined.to_pandas())
+    
+    def _load_files_pandas(self, csv_files: List[Path], max_workers: int) -> pd.DataFrame:
+        """Read files concurrently with the pandas parser"""
+        def read(csv_file: Path) -> pd.DataFrame:
+            df = read_trending_csv(csv_file, on_bad_lines='skip')
+            df['source_file'] = pd.Categorical([csv_file.name] * len(df))
+            return df
+        
+        return concat_typed(self._read_concurrently(read, csv_files, max_workers))
+    
+    def log_memory_report(self, df: pd.DataFrame) -> None:
+        """
+        Log the memory used by each column of a DataFrame.
+        
+        Args:
+            df: DataFrame to measure
+        """
+        report = memory_report(df)
+        logger.info(f"Memory usage: {report['bytes'].sum() / 1e6:.1f} MB")
+        for column, row in report.iterrows():
+            logger.info(f"  {column:<24} {row['dtype']:<28} {row['bytes'] / 1e6:8.2f} MB ({row['share']:.0%})")
     
-    def get_sample_data(self, n: int = 1000) -> pd.DataFrame:
+    def get_sample_data(
+        self,
+        n: int = 1000,
+        stratify_by: Optional[Union[str, List[str]]] = None,
+        seed: int = 42,
+        directory: Optional[Path] = None,
+        chunksize: Optional[int] = None
+    ) -> pd.DataFrame:
         """
         Load a sample of data for testing
         
+        The CSV files are streamed in chunks through a ReservoirSampler, so
+        only about n + chunksize rows are held in memory regardless of the
+        dataset size. Each row carries its source_file and country.
+        
         Args:
             n: Number of samples to load
+            stratify_by: Column(s) to stratify on, e.g. 'country' or 'category_id'
+            seed: Random seed (same files and seed give the same sample)
+            directory: Directory containing CSV files (default: raw_data_dir)
+            chunksize: Rows per chunk (default: ingest_chunk_size, or 50,000)
             
         Returns:
             Sample DataFrame
         """
-        df = self.load_all_csv_files()
-        sample = df.sample(n=min(n, len(df)), random_state=42)
-        logger.info(f"Created sample dataset with {len(sample)} records")
+        if directory is None:
+            directory = self.settings.raw_data_dir
+        chunksize = chunksize or self.settings.ingest_chunk_size or 50_000
+        
+        csv_files = sorted(directory.glob("*.csv"))
+        if not csv_files:
+            raise FileNotFoundError(f"No CSV files found in {directory}")
+        
+        sampler = ReservoirSampler(n, stratify_by=stratify_by, seed=seed)
+        for csv_file in csv_files:
+            try:
+                for chunk in read_trending_csv(csv_file, chunksize=chunksize, on_bad_lines='skip'):
+                    sampler.update(chunk.assign(
+                        source_file=pd.Categorical([csv_file.name] * len(chunk)),
+                        country=country_from_filename(csv_file)
+                    ))
+            except Exception as e:
+                logger.warning(f"Skipping {csv_file.name}: {e}")
+        
+        sample = sampler.sample()
+        logger.info(f"Created sample dataset with {len(sample)} records from {sampler.rows_seen} rows")
         return sample
@@ -5,6 +5,9 @@ import re
 from typing import Dict, Any, List
 from loguru import logger
 
+from .text_cleaning import normalize_text_column, parse_tags_column
+from .documents import iter_preprocessed_documents, preprocessed_searchable_text
+
 
 class DataPreprocessor:
     """Preprocess YouTube video data for embedding and indexing"""
@@ -161,14 +164,14 @@ class DataPreprocessor:
         
         # Clean text fields
         if 'title' in df_processed.columns:
-            df_processed['title'] = df_processed['title'].apply(self.clean_text)
+            df_processed['title'] = normalize_text_column(df_processed['title'])
         
         if 'channel_title' in df_processed.columns:
-            df_processed['channel_title'] = df_processed['channel_title'].apply(self.clean_text)
+            df_processed['channel_title'] = normalize_text_column(df_processed['channel_title'])
         
         # Parse tags
         if 'tags' in df_processed.columns:
-            df_processed['tags_list'] = df_processed['tags'].apply(self.parse_tags)
+            df_processed['tags_list'] = parse_tags_column(df_processed['tags'])
         else:
             df_processed['tags_list'] = [[] for _ in range(len(df_processed))]
         
@@ -185,7 +188,7 @@ class DataPreprocessor:
                 df_processed[field] = pd.to_numeric(df_processed[field], errors='coerce').fillna(0).astype(int)
         
         # Create searchable text
-        df_processed['searchable_text'] = df_processed.apply(self.create_searchable_text, axis=1)
+        df_processed['searchable_text'] = preprocessed_searchable_text(df_processed)
         
         # Remove rows with empty searchable text
         df_processed = df_processed[df_processed['searchable_text'].str.len() > 0]
@@ -204,36 +207,7 @@ class DataPreprocessor:
         Returns:
             List of document dictionaries
         """
-        documents = []
-        
-        for idx, row in df.iterrows():
-            doc = {
-                'id': row.get('video_id', str(idx)),
-                'text': row['searchable_text'],
-                'metadata': {
-                    'title': row.get('title', ''),
-                    'channel': row.get('channel_title', ''),
-                    'category': row.get('category_name', 'Unknown'),
-                    'category_id': int(row.get('category_id', 0)),
-                    'tags': row.get('tags_list', []),
-                    'views': int(row.get('views', 0)),
-                    'likes': int(row.get('likes', 0)),
-                    'dislikes': int(row.get('dislikes', 0)),
-                    'comment_count': int(row.get('comment_count', 0)),
-                }
-            }
-            
-            # Add optional fields if available
-            if 'trending_date' in row:
-                doc['metadata']['trending_date'] = str(row['trending_date'])
-            
-            if 'publish_time' in row:
-                doc['metadata']['publish_time'] = str(row['publish_time'])
-            
-            if 'country' in row:
-                doc['metadata']['country'] = str(row['country'])
-            
-            documents.append(doc)
+        documents = list(iter_preprocessed_documents(df))
         
         logger.info(f"Created {len(documents)} documents")
         return documents
@@ -0,0 +1,178 @@
+"""Partitioned Parquet snapshots of processed trending data"""
+
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from loguru import logger
+
+
+PARTITION_COLUMNS = ['country', 'trending_month']
+
+# Partition values are read back as plain strings, not dictionary (categorical) columns
+_PARTITIONING = ds.partitioning(
+    pa.schema([('country', pa.string()), ('trending_month', pa.string())]),
+    flavor='hive'
+)
+
+
+def load_columns(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    country: Optional[str] = None,
+    month: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Read selected columns of a partitioned snapshot through memory mapping.
+
+    Only the requested columns of the matching partitions are read, and the
+    Parquet files are memory-mapped instead of copied into read buffers.
+
+    Args:
+        path: Snapshot directory
+        columns: Columns to read (default: all, including country and trending_month)
+        country: Only read this country's partitions
+        month: Only read this trending month ('YYYY-MM')
+
+    Returns:
+        DataFrame with the requested columns
+    """
+    filters = []
+    if country:
+        filters.append(('country', '=', country))
+    if month:
+        filters.append(('trending_month', '=', month))
+
+    table = pq.read_table(
+        path,
+        columns=columns,
+        filters=filters or None,
+        partitioning=_PARTITIONING,
+        memory_map=True
+    )
+    return table.to_pandas()
+
+
+class ParquetSnapshot:
+    """
+    Columnar snapshot of the ingest pipeline's output.
+
+    Two hive-partitioned Parquet datasets (country=XX/trending_month=YYYY-MM)
+    live under one directory:
+        - youtube_trending_days.parquet: processed per-day rows, with the columns
+          needed to rebuild the final table (EnhancedYouTubeDataProcessor.LATEST_STATS_COLUMNS)
+        - youtube_processed.parquet: the de-duplicated final table, partitioned
+          by the month of last_trend_date
+
+    Downstream steps (embeddings, analytics, reindexing) read only the
+    columns and partitions they need instead of re-parsing the raw CSVs.
+    """
+
+    DAILY_NAME = "youtube_trending_days.parquet"
+    FINAL_NAME = "youtube_processed.parquet"
+
+    def __init__(self, root: Path):
+        """
+        Initialize the snapshot.
+
+        Args:
+            root: Directory holding both datasets (e.g. settings.processed_data_dir)
+        """
+        self.root = Path(root)
+        self.daily_path = self.root / self.DAILY_NAME
+        self.final_path = self.root / self.FINAL_NAME
+
+    @staticmethod
+    def _drop_partitions(path: Path, countries: Iterable[str]) -> None:
+        for country in countries:
+            shutil.rmtree(path / f"country={country}", ignore_errors=True)
+
+    @staticmethod
+    def _write(path: Path, df: pd.DataFrame, date_column: str) -> None:
+        """Append df to a dataset, partitioned by country and month of date_column"""
+        if df.empty:
+            return
+        table = pa.Table.from_pandas(
+            df.assign(trending_month=df[date_column].dt.strftime('%Y-%m')),
+            preserve_index=False
+        )
+        pq.write_to_dataset(
+            table,
+            root_path=str(path),
+            partition_cols=PARTITION_COLUMNS,
+            # Unique file names, so appends never overwrite earlier files
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+    def clear_daily(self, countries: Iterable[str]) -> None:
+        """
+        Remove the per-day rows of countries before they are rewritten.
+
+        Args:
+            countries: Country codes
+        """
+        self._drop_partitions(self.daily_path, countries)
+
+    def append_daily(self, df: pd.DataFrame, columns: List[str]) -> None:
+        """
+        Append processed per-day rows.
+
+        Args:
+            df: Rows from EnhancedYouTubeDataProcessor.process_dataframe
+            columns: Columns to keep (must include country and trending_date)
+        """
+        self._write(self.daily_path, df[columns], 'trending_date')
+
+    def write_final(self, final_df: pd.DataFrame) -> None:
+        """
+        Replace the final-table partitions of every country in final_df.
+
+        Args:
+            final_df: Final de-duplicated DataFrame
+        """
+        countries = final_df['country'].unique().tolist()
+        self._drop_partitions(self.final_path, countries)
+        self._write(self.final_path, final_df, 'last_trend_date')
+        logger.info(f"Wrote Parquet snapshot of {len(final_df)} videos to {self.final_path}")
+
+    def load_daily(
+        self,
+        columns: Optional[List[str]] = None,
+        country: Optional[str] = None,
+        month: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load per-day rows (see load_columns).
+
+        Args:
+            columns: Columns to read (default: all)
+            country: Only read this country
+            month: Only read this trending month ('YYYY-MM')
+
+        Returns:
+            DataFrame of per-day rows
+        """
+        return load_columns(self.daily_path, columns, country, month)
+
+    def load_final(
+        self,
+        columns: Optional[List[str]] = None,
+        country: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load the final table (see load_columns).
+
+        Args:
+            columns: Columns to read (default: all)
+            country: Only read this country
+
+        Returns:
+            DataFrame with one row per video
+        """
+        return load_columns(self.final_path, columns, country)
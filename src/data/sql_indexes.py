@@ -0,0 +1,189 @@
+"""Secondary indexes for the SQLite videos table, matched to the SQL agent's queries"""
+
+import time
+import sqlite3
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+
+# Index name suffix -> indexed columns. The covering indexes hold every column
+# the matching query pattern reads, so SQLite answers it from the index alone
+# (no table lookups, and GROUP BY / ORDER BY follow the index order).
+VIDEOS_INDEXES: Dict[str, Tuple[str, ...]] = {
+    # GROUP BY channel_title ... SUM(views)
+    'channel_views': ('channel_title', 'views'),
+    # ORDER BY likes DESC LIMIT N, selecting title, likes, views
+    'likes_cover': ('likes', 'views', 'title'),
+    # ORDER BY views DESC LIMIT N, selecting title, views, likes
+    'views_cover': ('views', 'likes', 'title'),
+    # GROUP BY category_name ... COUNT(*), AVG(views); WHERE category_name = ?
+    'category_views': ('category_name', 'views'),
+    # ORDER BY days_trending_unique DESC, selecting the streak and title
+    'trending_cover': ('days_trending_unique', 'longest_consecutive_streak_days', 'title'),
+    # Filters
+    'country_category': ('country', 'category_name'),
+    'language': ('language',),
+    'last_trend_date': ('last_trend_date',),
+}
+
+# The COMMON QUERY PATTERNS of SQLAgent._initialize_agent, plus typical filters
+QUERY_PATTERNS: Dict[str, str] = {
+    'top_channels_by_views': (
+        "SELECT channel_title, SUM(views) AS total_views FROM {table} "
+        "GROUP BY channel_title ORDER BY total_views DESC LIMIT 10"
+    ),
+    'top_videos_by_likes': "SELECT title, likes, views FROM {table} ORDER BY likes DESC LIMIT 10",
+    'top_videos_by_views': "SELECT title, views, likes FROM {table} ORDER BY views DESC LIMIT 10",
+    'category_analysis': (
+        "SELECT category_name, COUNT(*) AS count, AVG(views) AS avg_views FROM {table} "
+        "GROUP BY category_name"
+    ),
+    'category_filter': "SELECT COUNT(*), SUM(views) FROM {table} WHERE category_name = 'Music'",
+    'trending_analysis': (
+        "SELECT title, days_trending_unique, longest_consecutive_streak_days FROM {table} "
+        "ORDER BY days_trending_unique DESC LIMIT 10"
+    ),
+}
+
+
+def index_name(table_name: str, suffix: str) -> str:
+    """Name of a secondary index of a table"""
+    return f"idx_{table_name}_{suffix}"
+
+
+def index_statements(table_name: str = 'videos') -> List[str]:
+    """
+    CREATE INDEX statements for the videos table.
+
+    Args:
+        table_name: Name of the table
+
+    Returns:
+        List of idempotent CREATE INDEX statements
+    """
+    return [
+        f"CREATE INDEX IF NOT EXISTS {index_name(table_name, suffix)} "
+        f"ON {table_name} ({', '.join(columns)})"
+        for suffix, columns in VIDEOS_INDEXES.items()
+    ]
+
+
+def create_indexes(db_path: str, table_name: str = 'videos') -> None:
+    """
+    Create the secondary indexes on an existing table and refresh planner statistics.
+
+    Args:
+        db_path: Path to SQLite database file
+        table_name: Name of the table
+    """
+    with sqlite3.connect(db_path) as conn:
+        for statement in index_statements(table_name):
+            conn.execute(statement)
+        conn.execute(f"ANALYZE {table_name}")
+    logger.info(f"Created {len(VIDEOS_INDEXES)} indexes on '{table_name}'")
+
+
+def drop_indexes(db_path: str, table_name: str = 'videos') -> None:
+    """
+    Drop the secondary indexes of a table.
+
+    Args:
+        db_path: Path to SQLite database file
+        table_name: Name of the table
+    """
+    with sqlite3.connect(db_path) as conn:
+        for suffix in VIDEOS_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index_name(table_name, suffix)}")
+    logger.info(f"Dropped indexes on '{table_name}'")
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """
+    Get the EXPLAIN QUERY PLAN steps of a query.
+
+    Args:
+        conn: Open SQLite connection
+        sql: Query to explain
+
+    Returns:
+        Plan step descriptions, e.g. 'SCAN videos USING COVERING INDEX idx_videos_likes_cover'
+    """
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_query_plans(db_path: str, table_name: str = 'videos') -> Dict[str, Dict[str, object]]:
+    """
+    Explain and time every query pattern.
+
+    A pattern is considered indexed when no plan step scans the table itself
+    and no temporary B-tree is needed for its GROUP BY. (Ordering by an
+    aggregate, as in top channels by total views, always sorts the groups.)
+
+    Args:
+        db_path: Path to SQLite database file
+        table_name: Name of the table
+
+    Returns:
+        Mapping from pattern name to plan steps, indexed flag and runtime in ms
+    """
+    results = {}
+    with sqlite3.connect(db_path) as conn:
+        for name, pattern in QUERY_PATTERNS.items():
+            sql = pattern.format(table=table_name)
+            plan = explain(conn, sql)
+
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            results[name] = {
+                'sql': sql,
+                'plan': plan,
+                'indexed': not any(
+                    step == f"SCAN {table_name}" or 'TEMP B-TREE FOR GROUP BY' in step for step in plan
+                ),
+                'ms': elapsed_ms,
+            }
+    return results
+
+
+def main():
+    """Manage and check the videos table indexes from the command line"""
+    import argparse
+    from src.config import get_settings
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='Manage secondary indexes of the videos table')
+    parser.add_argument('command', choices=['create', 'drop', 'check', 'explain'])
+    parser.add_argument('--db', type=str, default=settings.sql_db_path, help='SQLite database path')
+    parser.add_argument('--table', type=str, default=settings.sql_table_name, help='Table name')
+    parser.add_argument('--sql', type=str, default=None, help='With explain: query to explain')
+
+    args = parser.parse_args()
+
+    if args.command == 'create':
+        create_indexes(args.db, args.table)
+    elif args.command == 'drop':
+        drop_indexes(args.db, args.table)
+    elif args.command == 'explain':
+        if not args.sql:
+            parser.error("explain requires --sql")
+        with sqlite3.connect(args.db) as conn:
+            for step in explain(conn, args.sql):
+                print(step)
+        return
+
+    unindexed = 0
+    for name, result in check_query_plans(args.db, args.table).items():
+        status = "ok  " if result['indexed'] else "SCAN"
+        unindexed += not result['indexed']
+        print(f"[{status}] {name:<24} {result['ms']:8.2f} ms  {' / '.join(result['plan'])}")
+
+    if args.command == 'check' and unindexed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Bulk loading of final tables into SQLite"""
+
+import time
+import sqlite3
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from loguru import logger
+
+
+# Connection-scoped settings for every load. A full rebuild only recreates the
+# loaded table; the same file also holds data no load rebuilds (vector_sync, the
+# video_trend_days rows of other countries), so loads stay crash-safe: write-ahead
+# log with fsyncs at checkpoints only. The speed of a bulk load comes from the
+# single transaction, the large page cache and building indexes after the rows.
+BULK_LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -262144,  # Negative = KiB, i.e. 256 MiB of page cache
+    'temp_store': 'MEMORY',
+    'journal_size_limit': 67108864,  # Truncate the WAL of a large load back to 64 MiB
+}
+
+
+class SQLiteBulkLoader:
+    """
+    Load rows into a SQLite table in a single transaction.
+
+    Every load runs with BULK_LOAD_PRAGMAS. The load inserts all rows with executemany,
+    creates secondary indexes and other derived structures only after the rows
+    are in (one sorted build per index instead of per-row B-tree updates) and
+    finishes with ANALYZE so the query planner has statistics for the new indexes.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            db_path: Path to SQLite database file
+            pragmas: PRAGMA settings for every load (default: BULK_LOAD_PRAGMAS)
+        """
+        self.db_path = db_path
+        self.pragmas = BULK_LOAD_PRAGMAS if pragmas is None else pragmas
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with the load pragmas applied"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def load(
+        self,
+        table_name: str,
+        create_sql: str,
+        insert_sql: str,
+        rows: Sequence[Sequence[Any]],
+        post_load_sql: Iterable[str] = (),
+        replace: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load rows into a table.
+
+        Args:
+            table_name: Name of the table
+            create_sql: CREATE TABLE statement for the table
+            insert_sql: Parameterized INSERT (or upsert) statement
+            rows: Parameter tuples for insert_sql
+            post_load_sql: Statements to run after the rows are loaded (indexes, derived tables)
+            replace: Drop the table first (False keeps existing rows)
+
+        Returns:
+            Dictionary with rows, seconds and rows_per_second
+        """
+        conn = self._connect()
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN")
+            try:
+                if replace:
+                    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+                conn.execute(create_sql)
+
+                conn.executemany(insert_sql, rows)
+                loaded = len(rows)
+                inserted = time.perf_counter()
+
+                for statement in post_load_sql:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            conn.execute(f"ANALYZE {table_name}")
+        finally:
+            conn.close()
+
+        elapsed = time.perf_counter() - start
+        report = {
+            'rows': loaded,
+            'seconds': elapsed,
+            'insert_seconds': inserted - start,
+            'rows_per_second': loaded / elapsed if elapsed > 0 else float('inf'),
+        }
+        logger.info(
+            f"Loaded {loaded} rows into '{table_name}' in {elapsed:.2f}s "
+            f"({report['rows_per_second']:,.0f} rows/s, indexes + ANALYZE "
+            f"{elapsed - report['insert_seconds']:.2f}s)"
+        )
+        return report
@@ -0,0 +1,129 @@
+"""Incremental per-video aggregation for chunked (streaming) CSV ingestion"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .loader import concat_typed
+from .temporal import TEMPORAL_COLUMNS, trend_features
+
+
+def _merge_runs(runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Union overlapping or adjacent day ranges per video.
+
+    Args:
+        runs: DataFrame with video_id, start and end (inclusive day numbers)
+
+    Returns:
+        Disjoint, non-adjacent runs sorted by video_id and start
+    """
+    runs = runs.sort_values(['video_id', 'start'], kind='mergesort', ignore_index=True)
+    video = runs['video_id'].to_numpy()
+    start = runs['start'].to_numpy()
+    end = runs['end'].to_numpy()
+    # Last day covered so far by the earlier runs of the same video
+    reach = runs.groupby('video_id', sort=False)['end'].cummax().to_numpy()
+
+    new_run = np.ones(len(runs), dtype=bool)
+    new_run[1:] = (video[1:] != video[:-1]) | (start[1:] > reach[:-1] + 1)
+    run_starts = np.flatnonzero(new_run)
+
+    return pd.DataFrame({
+        'video_id': video[run_starts],
+        'start': start[run_starts],
+        'end': np.maximum.reduceat(end, run_starts) if len(runs) else end,
+    })
+
+
+class TrendAggregator:
+    """
+    Maintain per-video aggregates over processed chunks of trending rows.
+
+    Only two things are kept between chunks:
+        - the latest row per video (the columns needed for the final table)
+        - the trending days of each video as runs of consecutive days
+          (first and last day of each run), from which first/last trend
+          date, unique days and the longest streak are derived
+
+    Each chunk is merged into the runs and dropped. Memory therefore grows
+    with the number of videos and their runs (usually one or two per video),
+    not with the number of rows or trending days, the size of the CSV file
+    or the width of its text columns. Chunks may arrive in any date order.
+    Trending dates are whole days.
+    """
+
+    def __init__(self, latest_columns: List[str]):
+        """
+        Initialize the aggregator.
+
+        Args:
+            latest_columns: Columns to keep for the latest row of each video
+                (must include video_id and trending_date)
+        """
+        self.latest_columns = latest_columns
+        self._latest: Optional[pd.DataFrame] = None
+        self._runs: Optional[pd.DataFrame] = None
+        self.rows_seen = 0
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a processed chunk into the aggregates.
+
+        Args:
+            chunk: Chunk processed by EnhancedYouTubeDataProcessor.process_dataframe
+        """
+        self.rows_seen += len(chunk)
+
+        pairs = chunk[['video_id', 'trending_date']].dropna()
+        days = pairs['trending_date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+        runs = pd.DataFrame({'video_id': pairs['video_id'].astype(object).to_numpy(), 'start': days, 'end': days})
+        if self._runs is not None:
+            runs = pd.concat([self._runs, runs], ignore_index=True)
+        self._runs = _merge_runs(runs)
+
+        candidates = chunk[self.latest_columns]
+        if self._latest is not None:
+            candidates = concat_typed([self._latest, candidates])
+
+        # Stable sort keeps the later row when a video trends twice on the same date
+        self._latest = (
+            candidates.sort_values('trending_date', kind='mergesort')
+            .drop_duplicates('video_id', keep='last')
+            .reset_index(drop=True)
+        )
+
+    def latest_rows(self) -> pd.DataFrame:
+        """
+        Get the latest row per video seen so far.
+
+        Returns:
+            DataFrame with one row per video
+        """
+        if self._latest is None:
+            return pd.DataFrame(columns=self.latest_columns)
+        return self._latest
+
+    def trend_features(self) -> pd.DataFrame:
+        """
+        Get the trending features of every video seen so far.
+
+        Returns:
+            DataFrame indexed by video_id (sorted) with TEMPORAL_COLUMNS,
+            as returned by src.data.temporal.trend_features
+        """
+        if self._runs is None or self._runs.empty:
+            return trend_features(pd.Series([], dtype=object), pd.Series([], dtype='datetime64[ns]'))
+
+        runs = self._runs.assign(days=self._runs['end'] - self._runs['start'] + 1)
+        features = runs.groupby('video_id', sort=True).agg(
+            first_trend_date=('start', 'min'),
+            last_trend_date=('end', 'max'),
+            days_trending_unique=('days', 'sum'),
+            longest_consecutive_streak_days=('days', 'max'),
+        )
+        for col in ('first_trend_date', 'last_trend_date'):
+            features[col] = features[col].to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+        features.index.name = 'video_id'
+        return features[TEMPORAL_COLUMNS]
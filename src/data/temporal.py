@@ -0,0 +1,80 @@
+"""Single-pass computation of per-video trending features"""
+
+import numpy as np
+import pandas as pd
+
+
+TEMPORAL_COLUMNS = [
+    'first_trend_date', 'last_trend_date', 'days_trending_unique', 'longest_consecutive_streak_days'
+]
+
+
+def trend_features(video_ids: pd.Series, trending_dates: pd.Series) -> pd.DataFrame:
+    """
+    Compute first/last trend date, unique trending days and longest streak per video.
+
+    One integer sort over (video_id, trending_date) codes followed by a
+    handful of vectorized passes over the sorted arrays; no pandas groupby. A streak is
+    a run of consecutive distinct trending days, so a video listed twice on the
+    same day counts that day once (as the streaming and upsert paths do).
+
+    Args:
+        video_ids: Video ID of every row
+        trending_dates: Trending date of every row (datetime64)
+
+    Returns:
+        DataFrame indexed by video_id (sorted) with TEMPORAL_COLUMNS
+    """
+    codes, videos = pd.factorize(video_ids, sort=True)
+    date_codes, dates = pd.factorize(trending_dates, sort=True)
+    dates = np.asarray(dates)
+
+    valid = (codes >= 0) & (date_codes >= 0)  # groupby and nunique skip missing values
+    if not valid.all():
+        codes, date_codes = codes[valid], date_codes[valid]
+
+    if len(codes) == 0:
+        no_counts = np.empty(0, dtype=np.int64)
+        return pd.DataFrame(
+            dict(zip(TEMPORAL_COLUMNS, [dates[:0], dates[:0], no_counts, no_counts])),
+            index=pd.Index(videos[:0], name='video_id'),
+        )
+
+    # Both factorizations are sorted, so sorting one combined integer key
+    # orders the rows by (video_id, trending_date)
+    key = codes.astype(np.int64) * len(dates) + date_codes
+    key.sort()
+
+    # One row per distinct (video, day): duplicate listings neither add days nor extend streaks
+    distinct = np.empty(len(key), dtype=bool)
+    distinct[0] = True
+    np.not_equal(key[1:], key[:-1], out=distinct[1:])
+    key = key[distinct]
+    codes, dates = key // len(dates), dates[key % len(dates)]
+
+    # Row i starts a new video / a new streak
+    new_video = np.empty(len(codes), dtype=bool)
+    new_video[0] = True
+    np.not_equal(codes[1:], codes[:-1], out=new_video[1:])
+
+    new_streak = new_video.copy()
+    new_streak[1:] |= (dates[1:] - dates[:-1]) // np.timedelta64(1, 'D') > 1
+
+    video_starts = np.flatnonzero(new_video)
+    video_ends = np.r_[video_starts[1:], len(codes)] - 1
+
+    # Streak lengths, then the longest streak of each video (streaks are ordered by video)
+    streak_starts = np.flatnonzero(new_streak)
+    streak_lengths = np.diff(np.r_[streak_starts, len(codes)])
+    first_streak_of_video = np.flatnonzero(new_video[streak_starts])
+    longest = np.maximum.reduceat(streak_lengths, first_streak_of_video)
+
+    return pd.DataFrame(
+        {
+            'first_trend_date': dates[video_starts],
+            'last_trend_date': dates[video_ends],
+            'days_trending_unique': (video_ends - video_starts + 1).astype(np.int64),
+            'longest_consecutive_streak_days': longest.astype(np.int64),
+        },
+        index=pd.Index(videos[codes[video_starts]], name='video_id'),
+    )
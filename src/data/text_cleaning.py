@@ -0,0 +1,164 @@
+"""Vectorized text cleaning for YouTube titles, descriptions and tags.
+
+Column-wise equivalents of the per-cell cleaning methods on
+EnhancedYouTubeDataProcessor and DataPreprocessor. Each function works on
+a whole Series with pandas ``.str`` operations and precompiled patterns, and
+cleans every distinct value only once (trending data repeats the same
+title, description and tags on every day a video trends).
+"""
+
+import re
+import string
+from typing import Callable
+
+import pandas as pd
+
+
+# EnhancedYouTubeDataProcessor.clean_text
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_HTML_PATTERN = re.compile(r'<.*?>')
+_PUNCTUATION_TABLE = str.maketrans({**{c: None for c in string.punctuation}, '\n': ' '})
+
+# EnhancedYouTubeDataProcessor.split_and_clean_tags
+_TAG_DELIMITER_PATTERN = re.compile(r'\s*\|\s*')
+
+# DataPreprocessor.clean_text
+_LOOSE_URL_PATTERN = re.compile(r'http\S+|www.\S+')
+_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\-.,!?]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_QUOTED_TAG_PATTERN = re.compile(r'"([^"]*)"')
+
+
+def map_unique(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Apply a column-wise function to the distinct values of a Series only
+
+    Args:
+        series: Input Series
+        func: Function mapping a Series of distinct values to a Series of results
+
+    Returns:
+        Results aligned with the input index
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    results = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(results[codes], index=series.index, dtype=object)
+
+
+def _collect_lists(exploded: pd.Series, index: pd.Index) -> pd.Series:
+    """Regroup an exploded Series into per-row lists, with [] for rows without items"""
+    grouped = exploded.groupby(level=0, sort=False).agg(list).to_dict()
+    return pd.Series([grouped.get(i, []) for i in index], index=index, dtype=object)
+
+
+def _clean_text_values(values: pd.Series) -> pd.Series:
+    text = values.map(str).astype(object)
+    text = text.str.lower()
+    text = text.str.encode('ascii', 'ignore').str.decode('ascii')  # Remove unicode
+    text = text.str.replace(_URL_PATTERN, '', regex=True)  # Remove URLs
+    text = text.str.replace(_HTML_PATTERN, '', regex=True)  # Remove HTML
+    text = text.str.translate(_PUNCTUATION_TABLE)  # Remove punctuation and newlines
+    return text.str.strip()
+
+
+def clean_text_column(series: pd.Series) -> pd.Series:
+    """
+    Clean a column of titles or descriptions.
+
+    Same output as EnhancedYouTubeDataProcessor.clean_text applied per cell.
+
+    Args:
+        series: Raw text column
+
+    Returns:
+        Cleaned text column
+    """
+    missing = series.isna()
+    if missing.any():
+        # str() of the original missing value ('nan', 'None') is cleaned like any text
+        series = series.astype(object).where(~missing, series[missing].map(str))
+    return map_unique(series, _clean_text_values)
+
+
+def _split_tags_values(values: pd.Series) -> pd.Series:
+    result = pd.Series([[] for _ in range(len(values))], index=values.index, dtype=object)
+    is_tagged = values.map(lambda v: isinstance(v, str)) & (values != '[none]')
+    if not is_tagged.any():
+        return result
+
+    # Stripping around every delimiter before removing quotes is the same as
+    # stripping each tag and then removing its quotes, without exploding the lists
+    tags = values[is_tagged].astype(object).str.lower()
+    tags = tags.str.replace(_TAG_DELIMITER_PATTERN, '|', regex=True).str.strip()
+    tags = tags.str.replace('"', '', regex=False)
+    result[is_tagged] = tags.str.split('|')
+    return result
+
+
+def split_and_clean_tags_column(series: pd.Series) -> pd.Series:
+    """
+    Split and clean a column of pipe-delimited tags.
+
+    Same output as EnhancedYouTubeDataProcessor.split_and_clean_tags applied per cell.
+
+    Args:
+        series: Raw tags column
+
+    Returns:
+        Column of cleaned tag lists
+    """
+    return map_unique(series, _split_tags_values)
+
+
+def _normalize_text_values(values: pd.Series) -> pd.Series:
+    text = values.where(values.notna(), '').map(str).astype(object)
+    text = text.str.replace(_LOOSE_URL_PATTERN, '', regex=True)  # Remove URLs
+    text = text.str.replace(_SPECIAL_CHARS_PATTERN, ' ', regex=True)  # Remove special characters
+    text = text.str.replace(_WHITESPACE_PATTERN, ' ', regex=True)  # Collapse whitespace
+    return text.str.strip()
+
+
+def normalize_text_column(series: pd.Series) -> pd.Series:
+    """
+    Normalize a text column, keeping basic punctuation.
+
+    Same output as DataPreprocessor.clean_text applied per cell.
+
+    Args:
+        series: Raw text column
+
+    Returns:
+        Normalized text column
+    """
+    return map_unique(series, _normalize_text_values)
+
+
+def _parse_tags_values(values: pd.Series) -> pd.Series:
+    has_tags = values.notna() & (values != '') & (values != '[none]')
+    tags = values[has_tags].astype(object)
+
+    # Pipe-separated, then quoted, otherwise the whole string is one tag
+    is_piped = tags.str.contains('|', regex=False)
+    is_quoted = tags.str.contains('"', regex=False)
+    tag_lists = tags.str.split('|').where(
+        is_piped,
+        tags.str.findall(_QUOTED_TAG_PATTERN).where(is_quoted, tags.map(lambda t: [t]))
+    )
+
+    cleaned = _normalize_text_values(tag_lists.explode().dropna())
+    return _collect_lists(cleaned[cleaned != ''], values.index)
+
+
+def parse_tags_column(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of pipe-separated or quoted tags into cleaned tag lists.
+
+    Same output as DataPreprocessor.parse_tags applied per cell.
+
+    Args:
+        series: Raw tags column
+
+    Returns:
+        Column of tag lists
+    """
+    return map_unique(series, _parse_tags_values)
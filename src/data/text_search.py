@@ -0,0 +1,159 @@
+"""SQLite FTS5 full-text index over the videos table, for lexical search"""
+
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+FTS_COLUMNS = ('title', 'description', 'tags', 'channel_title')
+
+# bm25() weight per FTS column, in FTS_COLUMNS order
+BM25_WEIGHTS = (10.0, 1.0, 4.0, 8.0)
+
+RESULT_COLUMNS = (
+    'video_id', 'title', 'channel_title', 'category_name', 'country',
+    'language', 'views', 'likes', 'last_trend_date'
+)
+
+
+def fts_table_name(table_name: str = 'videos') -> str:
+    """Name of the FTS5 table indexing a videos table"""
+    return f"{table_name}_fts"
+
+
+def _trigger_statements(table_name: str) -> List[str]:
+    """Triggers keeping the external-content FTS table in step with the videos table"""
+    fts = fts_table_name(table_name)
+    columns = ', '.join(FTS_COLUMNS)
+    old_values = ', '.join(f"old.{col}" for col in FTS_COLUMNS)
+    new_values = ', '.join(f"new.{col}" for col in FTS_COLUMNS)
+    text_changed = ' OR '.join(f"old.{col} IS NOT new.{col}" for col in FTS_COLUMNS)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.rowid, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+        END""",
+        # Upserts rewrite every column; only re-tokenize when the text actually changed
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name}
+        WHEN {text_changed} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.rowid, {new_values});
+        END""",
+    ]
+
+
+def rebuild_statements(table_name: str = 'videos') -> List[str]:
+    """
+    Statements that (re)create the FTS table and its triggers from scratch.
+
+    Run after a bulk load: indexing the loaded table once with 'rebuild' is
+    much cheaper than firing the insert trigger per row.
+
+    Args:
+        table_name: Name of the videos table
+
+    Returns:
+        List of SQL statements
+    """
+    fts = fts_table_name(table_name)
+    return [
+        f"DROP TABLE IF EXISTS {fts}",
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{', '.join(FTS_COLUMNS)}, content='{table_name}', content_rowid='rowid', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        *_trigger_statements(table_name),
+        f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')",
+    ]
+
+
+def ensure_fts(conn: sqlite3.Connection, table_name: str = 'videos') -> None:
+    """
+    Make sure the FTS table and triggers exist before incremental writes.
+
+    The FTS table is rebuilt only when it is missing (e.g. a database built
+    before full-text search existed); otherwise the triggers keep it current.
+
+    Args:
+        conn: Open SQLite connection
+        table_name: Name of the videos table (must exist)
+    """
+    fts = fts_table_name(table_name)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if exists:
+        for statement in _trigger_statements(table_name):
+            conn.execute(statement)
+        return
+
+    logger.info(f"Building full-text index '{fts}'")
+    for statement in rebuild_statements(table_name):
+        conn.execute(statement)
+
+
+def to_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted, so punctuation and FTS
+    operators in user input are matched literally; all terms must match.
+
+    Args:
+        query: Free-text query
+
+    Returns:
+        FTS5 query string
+    """
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+def search_text(
+    db_path: str,
+    query: str,
+    limit: int = 10,
+    table_name: str = 'videos',
+    country: Optional[str] = None,
+    raw: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Keyword search over titles, descriptions, tags and channel names, ranked by BM25.
+
+    Args:
+        db_path: Path to SQLite database file
+        query: Keywords (or an FTS5 expression when raw=True)
+        limit: Maximum number of results
+        table_name: Name of the videos table
+        country: Optional country code filter
+        raw: Pass query to MATCH unchanged (phrase, prefix*, OR, NEAR, column: filters)
+
+    Returns:
+        List of video dictionaries with a 'score' (higher is better), best first
+    """
+    match = query if raw else to_match_query(query)
+    if not match:
+        return []
+
+    fts = fts_table_name(table_name)
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    sql = (
+        f"SELECT {', '.join(f'v.{col}' for col in RESULT_COLUMNS)}, -bm25({fts}, {weights}) AS score "
+        f"FROM {fts} JOIN {table_name} AS v ON v.rowid = {fts}.rowid "
+        f"WHERE {fts} MATCH ?"
+    )
+    params: List[Any] = [match]
+    if country:
+        sql += " AND v.country = ?"
+        params.append(country)
+    sql += f" ORDER BY bm25({fts}, {weights}) LIMIT ?"
+    params.append(limit)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
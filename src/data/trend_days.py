@@ -0,0 +1,295 @@
+"""Per-day trending fact table for time-series analytics"""
+
+import sqlite3
+from typing import Any, Iterable, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+
+TREND_DAYS_TABLE = 'video_trend_days'
+
+TREND_DAYS_COLUMNS = ['video_id', 'country', 'trending_date', 'views', 'likes', 'comment_count']
+
+# One row per video, country and day. The table is clustered on its primary
+# key (WITHOUT ROWID), so one video's series is a contiguous range of the table.
+TREND_DAYS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        video_id TEXT NOT NULL,
+        country TEXT NOT NULL,
+        trending_date DATE NOT NULL,
+        views INTEGER,
+        likes INTEGER,
+        comment_count INTEGER,
+        PRIMARY KEY (video_id, country, trending_date)
+    ) WITHOUT ROWID
+    """
+
+# Secondary indexes (suffix -> columns). Both carry the counters, so date-window
+# queries are answered from the index alone (the primary key columns are implicit).
+TREND_DAYS_INDEXES = {
+    'date': ('trending_date', 'country', 'views', 'likes', 'comment_count'),
+    'country_date': ('country', 'trending_date', 'views', 'likes', 'comment_count'),
+}
+
+
+def trend_days_statements(table_name: str = TREND_DAYS_TABLE) -> List[str]:
+    """
+    CREATE statements for the fact table and its indexes.
+
+    Args:
+        table_name: Name of the fact table
+
+    Returns:
+        List of SQL statements
+    """
+    return [TREND_DAYS_SCHEMA.format(table_name=table_name)] + [
+        f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{suffix} ON {table_name} ({', '.join(columns)})"
+        for suffix, columns in TREND_DAYS_INDEXES.items()
+    ]
+
+
+def _date_param(value: Any) -> str:
+    """Dates are stored in the text format of str(pd.Timestamp), like the videos table"""
+    return str(pd.Timestamp(value))
+
+
+class TrendDaysStore:
+    """
+    Persist and query the daily trending rows of every video.
+
+    The final videos table keeps only the latest stats per video; this table
+    keeps every (video_id, country, trending_date) observation with its
+    views, likes and comment count. Rows are upserted, so re-ingesting an
+    overlapping daily drop is idempotent. The query helpers filter on a
+    leading index column and a date range, so they run as index range scans.
+    """
+
+    def __init__(self, db_path: str, table_name: str = TREND_DAYS_TABLE):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to SQLite database file
+            table_name: Name of the fact table
+        """
+        self.db_path = db_path
+        self.table_name = table_name
+
+    def _connect(self) -> sqlite3.Connection:
+        # Worker processes of build_final_tables write concurrently; wait for the lock
+        return sqlite3.connect(self.db_path, timeout=60)
+
+    def ensure_table(self) -> None:
+        """Create the fact table and its indexes if they do not exist"""
+        conn = self._connect()
+        try:
+            for statement in trend_days_statements(self.table_name):
+                conn.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def write(self, df: pd.DataFrame) -> int:
+        """
+        Upsert processed per-day rows.
+
+        A video listed twice on the same day keeps the later row.
+
+        Args:
+            df: Rows from EnhancedYouTubeDataProcessor.process_dataframe
+                (must contain TREND_DAYS_COLUMNS)
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty:
+            return 0
+
+        dates = df['trending_date']
+        rows = list(zip(
+            df['video_id'].astype(object).tolist(),
+            df['country'].astype(object).tolist(),
+            dates.dt.strftime('%Y-%m-%d %H:%M:%S').where(dates.notna(), None).tolist(),
+            *(df[col].astype('int64').tolist() for col in ('views', 'likes', 'comment_count'))
+        ))
+
+        columns = ', '.join(TREND_DAYS_COLUMNS)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in trend_days_statements(self.table_name):
+                conn.execute(statement)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} ({columns}) "
+                f"VALUES ({', '.join('?' for _ in TREND_DAYS_COLUMNS)})",
+                rows
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.debug(f"Wrote {len(rows)} trend days to '{self.table_name}'")
+        return len(rows)
+
+    def clear(self, countries: Iterable[str]) -> None:
+        """
+        Remove the rows of countries before they are rebuilt.
+
+        Args:
+            countries: Country codes
+        """
+        countries = list(countries)
+        self.ensure_table()
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"DELETE FROM {self.table_name} WHERE country IN ({', '.join('?' for _ in countries)})",
+                countries
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _query(self, sql: str, params: List[Any], date_columns: List[str]) -> pd.DataFrame:
+        conn = self._connect()
+        try:
+            df = pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+        for col in date_columns:
+            df[col] = pd.to_datetime(df[col])
+        return df
+
+    def _window(self, start: Any, end: Any, country: Optional[str]) -> tuple:
+        """WHERE clause and parameters for an optional country and inclusive date range"""
+        clauses, params = [], []
+        if country:
+            clauses.append("country = ?")
+            params.append(country)
+        if start is not None:
+            clauses.append("trending_date >= ?")
+            params.append(_date_param(start))
+        if end is not None:
+            clauses.append("trending_date <= ?")
+            params.append(_date_param(end))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def video_series(
+        self,
+        video_id: str,
+        country: Optional[str] = None,
+        start: Any = None,
+        end: Any = None
+    ) -> pd.DataFrame:
+        """
+        Daily series of one video, with day-over-day view and like gains.
+
+        Args:
+            video_id: Video ID
+            country: Only this country (default: every country the video trended in)
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            DataFrame ordered by country and trending_date, with views_gained
+            and likes_gained (NaN on each country's first day)
+        """
+        where, params = self._window(start, end, country)
+        where = (where + " AND" if where else " WHERE") + " video_id = ?"
+        sql = (
+            f"SELECT {', '.join(TREND_DAYS_COLUMNS)}, "
+            f"views - LAG(views) OVER w AS views_gained, "
+            f"likes - LAG(likes) OVER w AS likes_gained "
+            f"FROM {self.table_name}{where} "
+            f"WINDOW w AS (PARTITION BY country ORDER BY trending_date) "
+            f"ORDER BY country, trending_date"
+        )
+        return self._query(sql, params + [video_id], ['trending_date'])
+
+    def trending_on(
+        self,
+        date: Any,
+        country: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Videos that trended on a date, most viewed first.
+
+        Args:
+            date: Trending date
+            country: Only this country
+            limit: Maximum number of rows
+
+        Returns:
+            DataFrame of TREND_DAYS_COLUMNS
+        """
+        where, params = self._window(date, date, country)
+        sql = f"SELECT {', '.join(TREND_DAYS_COLUMNS)} FROM {self.table_name}{where} ORDER BY views DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params, ['trending_date'])
+
+    def views_growth(
+        self,
+        start: Any,
+        end: Any,
+        country: Optional[str] = None,
+        limit: Optional[int] = 10
+    ) -> pd.DataFrame:
+        """
+        Videos ranked by views gained within a date window.
+
+        Views only grow while a video trends, so the lowest and highest views
+        in the window are its start and end values; a video needs at least two
+        days inside the window to gain views.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            country: Only this country
+            limit: Maximum number of rows (None = all)
+
+        Returns:
+            DataFrame with video_id, country, first_day, last_day, days,
+            start_views, end_views and views_gained, largest gain first
+        """
+        where, params = self._window(start, end, country)
+        sql = (
+            f"SELECT video_id, country, MIN(trending_date) AS first_day, MAX(trending_date) AS last_day, "
+            f"COUNT(*) AS days, MIN(views) AS start_views, MAX(views) AS end_views, "
+            f"MAX(views) - MIN(views) AS views_gained "
+            f"FROM {self.table_name}{where} "
+            f"GROUP BY video_id, country ORDER BY views_gained DESC"
+        )
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params, ['first_day', 'last_day'])
+
+    def daily_totals(
+        self,
+        start: Any = None,
+        end: Any = None,
+        country: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Per-day number of trending videos and their total views, likes and comments.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            country: Only this country
+
+        Returns:
+            DataFrame ordered by trending_date
+        """
+        where, params = self._window(start, end, country)
+        sql = (
+            f"SELECT trending_date, COUNT(*) AS videos, SUM(views) AS views, "
+            f"SUM(likes) AS likes, SUM(comment_count) AS comment_count "
+            f"FROM {self.table_name}{where} "
+            f"GROUP BY trending_date ORDER BY trending_date"
+        )
+        return self._query(sql, params, ['trending_date'])
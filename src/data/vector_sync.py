@@ -0,0 +1,117 @@
+"""Track which videos are indexed in the vector database, for delta ingestion"""
+
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator
+
+from loguru import logger
+
+
+class VectorSyncTracker:
+    """
+    Record the searchable-text hash of every indexed video.
+
+    The state lives in a small table next to the videos table in the SQLite
+    database. On an incremental ingest only videos that are new or whose
+    searchable text changed need to be re-embedded; the others only need their
+    payload (views, likes, trend dates, ...) refreshed. Point IDs are derived
+    from video IDs (see src.vectordb.operations.point_id_for), so they are not
+    stored here.
+    """
+
+    TABLE_NAME = "vector_sync"
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the tracker.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        with self._connect() as conn:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.TABLE_NAME})")]
+            if 'point_id' in columns:
+                # Written with positional point IDs; the collection must be rebuilt anyway
+                logger.warning(
+                    f"Discarding '{self.TABLE_NAME}' from the positional point-ID scheme. "
+                    f"Run a full (non-incremental) ingest to rebuild the collection."
+                )
+                conn.execute(f"DROP TABLE {self.TABLE_NAME}")
+
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                video_id TEXT PRIMARY KEY,
+                text_hash TEXT NOT NULL
+            );
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """
+        Hash a document's searchable text.
+
+        Args:
+            text: Searchable text
+
+        Returns:
+            Hex digest
+        """
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def plan(self, documents: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Split documents into those that need embedding and those that only need a payload update.
+
+        Args:
+            documents: Vector documents with 'id' and 'text'
+
+        Returns:
+            Dictionary with 'embed' (new or changed text) and 'payload_only' (unchanged text)
+        """
+        with self._connect() as conn:
+            known = dict(conn.execute(f"SELECT video_id, text_hash FROM {self.TABLE_NAME}"))
+
+        plan = {'embed': [], 'payload_only': []}
+        for doc in documents:
+            if known.get(doc['id']) == self.text_hash(doc['text']):
+                plan['payload_only'].append(doc)
+            else:
+                plan['embed'].append(doc)
+
+        logger.info(
+            f"Delta plan: {len(plan['embed'])} to embed, "
+            f"{len(plan['payload_only'])} payload-only updates"
+        )
+        return plan
+
+    def mark_synced(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Record documents as indexed with their current text.
+
+        Args:
+            documents: Indexed vector documents
+        """
+        rows = [(doc['id'], self.text_hash(doc['text'])) for doc in documents]
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO {self.TABLE_NAME} (video_id, text_hash) VALUES (?, ?) "
+                f"ON CONFLICT(video_id) DO UPDATE SET text_hash = excluded.text_hash",
+                rows
+            )
+
+    def reset(self) -> None:
+        """Forget all sync state (use when the collection is recreated)"""
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.TABLE_NAME}")
@@ -1,8 +1,15 @@
 """Embeddings module for generating vector representations"""
 
 from .base import BaseEmbedding
+from .cache import EmbeddingCache
+from .batching import BatchingEmbedding
+from .query_cache import QueryCacheEmbedding
 from .local_embeddings import LocalEmbedding
+from .onnx_embeddings import OnnxEmbedding
 from .openai_embeddings import OpenAIEmbedding
-from .factory import get_embedding_model
+from .factory import get_embedding_model, get_query_encoder
 
-__all__ = ["BaseEmbedding", "LocalEmbedding", "OpenAIEmbedding", "get_embedding_model"]
+__all__ = [
+    "BaseEmbedding", "BatchingEmbedding", "EmbeddingCache", "LocalEmbedding", "OnnxEmbedding",
+    "OpenAIEmbedding", "QueryCacheEmbedding", "get_embedding_model", "get_query_encoder",
+]
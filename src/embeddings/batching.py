@@ -0,0 +1,212 @@
+"""Micro-batching of concurrent single-text encode calls"""
+
+import time
+import queue
+import inspect
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .base import BaseEmbedding
+from src.config import get_settings
+
+
+class BatchingEmbedding(BaseEmbedding):
+    """
+    Coalesce concurrent encode_single calls into batched forward passes.
+
+    Callers submit texts to a queue and get a Future back; one dispatcher
+    thread takes the first waiting text, keeps collecting until the batch
+    holds max_batch_size texts or max_wait_ms has passed since that first
+    text arrived, and encodes the whole batch with one model.encode call.
+    A lone request therefore waits at most max_wait_ms, while concurrent
+    requests share a forward pass instead of queueing for the model one by one.
+
+    Batched queries bypass the wrapped model's persistent document cache:
+    search queries are user input and would grow it without bound, and the
+    LRU of QueryCacheEmbedding already answers repeated queries.
+
+    encode() and get_dimension() go straight to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        model: BaseEmbedding,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            model: Embedding model to batch calls for
+            max_batch_size: Most texts per forward pass (default: settings.embedding_max_batch_size)
+            max_wait_ms: Longest time the first text of a batch waits for company
+                (default: settings.embedding_max_wait_ms)
+        """
+        settings = get_settings()
+        self.model = model
+        self.model_name = getattr(model, 'model_name', model.__class__.__name__)
+        self.max_batch_size = max_batch_size or settings.embedding_max_batch_size
+        self.max_wait = (settings.embedding_max_wait_ms if max_wait_ms is None else max_wait_ms) / 1000
+
+        # Batches are internal; never draw a progress bar per batch or touch the document cache
+        encode_params = inspect.signature(model.encode).parameters
+        self._encode_kwargs = {
+            name: False for name in ('show_progress', 'use_cache') if name in encode_params
+        }
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Future, float]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._requests = 0
+        self._batches = 0
+        self._batch_sizes: Counter = Counter()
+        self._max_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._encode_seconds = 0.0
+
+    def _start(self) -> None:
+        """Start the dispatcher thread on first use"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingEmbedding is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, text: str) -> "Future[np.ndarray]":
+        """
+        Queue a text for the next batch.
+
+        Args:
+            text: Text string
+
+        Returns:
+            Future resolving to the text's embedding vector
+        """
+        self._start()
+        future: "Future[np.ndarray]" = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return future
+
+    def encode_single(self, text: str) -> np.ndarray:
+        """
+        Encode a single text, batched with concurrent calls.
+
+        Args:
+            text: Text string
+
+        Returns:
+            Embedding vector
+        """
+        return self.submit(text).result()
+
+    def encode(self, texts: List[str], *args, **kwargs) -> np.ndarray:
+        """Encode a list of texts directly with the wrapped model"""
+        return self.model.encode(texts, *args, **kwargs)
+
+    def get_dimension(self) -> int:
+        """
+        Get the dimension of the embedding vectors
+
+        Returns:
+            Embedding dimension
+        """
+        return self.model.get_dimension()
+
+    def _collect(self) -> Optional[List[Tuple[str, Future, float]]]:
+        """Block for the first request, then gather more until the batch is full or the wait is over"""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Finish this batch, then stop
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        """Dispatcher loop"""
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            # Cancelled futures are dropped; identical concurrent texts are encoded once
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+
+            started = time.perf_counter()
+            try:
+                embeddings = np.asarray(self.model.encode(texts, **self._encode_kwargs))
+            except Exception as e:
+                logger.error(f"Batched encode of {len(texts)} texts failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - started
+
+            rows = {text: row for row, text in enumerate(texts)}
+            for text, future, _ in batch:
+                future.set_result(embeddings[rows[text]])
+
+            with self._lock:
+                self._batches += 1
+                self._batch_sizes[len(batch)] += 1
+                self._wait_seconds += sum(started - submitted for _, _, submitted in batch)
+                self._encode_seconds += elapsed
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get dispatcher metrics.
+
+        Returns:
+            Dictionary with current and peak queue depth, request and batch
+            counts, mean batch size, batch size histogram, mean queueing delay
+            and total encode time
+        """
+        with self._lock:
+            served = sum(size * count for size, count in self._batch_sizes.items())
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'requests': self._requests,
+                'batches': self._batches,
+                'mean_batch_size': served / self._batches if self._batches else 0.0,
+                'batch_sizes': dict(sorted(self._batch_sizes.items())),
+                'mean_wait_ms': 1000 * self._wait_seconds / served if served else 0.0,
+                'encode_seconds': self._encode_seconds,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+    def close(self) -> None:
+        """Stop the dispatcher after the queued requests are served"""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
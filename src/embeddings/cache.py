@@ -0,0 +1,293 @@
+"""Persistent, content-addressed embedding cache"""
+
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by (model name, hash of text).
+
+    Each model gets its own directory holding:
+        - vectors.f32: float32 matrix, one row per entry, read through a memory map
+        - keys.txt: text hash of each row, in row order
+        - meta.json: model name and embedding dimension
+
+    New entries are appended to both files, so writes never rewrite the cache.
+    Use compact() to evict the oldest entries and reclaim disk space.
+    """
+
+    def __init__(self, cache_dir: Path, model_name: str):
+        """
+        Initialize the cache for one model.
+
+        Args:
+            cache_dir: Root directory for all embedding caches
+            model_name: Name of the embedding model
+        """
+        self.model_name = model_name
+        self.directory = Path(cache_dir) / re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._keys_path = self.directory / "keys.txt"
+        self._meta_path = self.directory / "meta.json"
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self.dimension: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """
+        Hash a text into a cache key.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            Hex digest
+        """
+        return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _load(self) -> None:
+        """Load the key index and map the vector file"""
+        if not self._meta_path.exists():
+            return
+
+        meta = json.loads(self._meta_path.read_text())
+        self.dimension = int(meta['dimension'])
+
+        keys = self._keys_path.read_text().split() if self._keys_path.exists() else []
+        row_bytes = self.dimension * 4
+        stored_rows = self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+
+        # An interrupted append can leave the two files out of step; trust the shorter one
+        rows = min(len(keys), stored_rows)
+        if rows != len(keys) or rows != stored_rows:
+            logger.warning(f"Embedding cache {self.directory} was truncated to {rows} consistent entries")
+            self._rewrite(keys[:rows], self._read_rows(rows))
+            return
+
+        self._index = {key: row for row, key in enumerate(keys)}
+        self._remap(rows)
+
+    def _read_rows(self, rows: int) -> np.ndarray:
+        """Read the first rows of the vector file into memory"""
+        data = np.fromfile(self._vectors_path, dtype=np.float32, count=rows * self.dimension)
+        return data.reshape(rows, self.dimension)
+
+    def _remap(self, rows: int) -> None:
+        """Re-open the memory map after the vector file grew"""
+        if rows == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dimension))
+
+    def _rewrite(self, keys: List[str], vectors: np.ndarray) -> None:
+        """Atomically replace the cache files with the given entries"""
+        self._vectors = None
+        tmp_vectors = self._vectors_path.with_suffix('.tmp')
+        tmp_keys = self._keys_path.with_suffix('.tmp')
+        np.ascontiguousarray(vectors, dtype=np.float32).tofile(tmp_vectors)
+        tmp_keys.write_text(''.join(f"{key}\n" for key in keys))
+        tmp_vectors.replace(self._vectors_path)
+        tmp_keys.replace(self._keys_path)
+
+        self._index = {key: row for row, key in enumerate(keys)}
+        self._remap(len(keys))
+
+    def get(self, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Mapping from position in texts to cached embedding (hits only)
+        """
+        with self._lock:
+            found = {}
+            for i, text in enumerate(texts):
+                row = self._index.get(self.text_key(text))
+                if row is not None:
+                    found[i] = self._vectors[row]
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+            return found
+
+    def put(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """
+        Store embeddings for texts.
+
+        Args:
+            texts: Texts that were encoded
+            embeddings: Embeddings with shape (len(texts), dimension)
+        """
+        if len(texts) == 0:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = int(embeddings.shape[1])
+                self._meta_path.write_text(json.dumps({
+                    'model_name': self.model_name,
+                    'dimension': self.dimension
+                }))
+
+            new_keys, new_rows = [], []
+            for text, embedding in zip(texts, embeddings):
+                key = self.text_key(text)
+                if key not in self._index:
+                    self._index[key] = len(self._index)
+                    new_keys.append(key)
+                    new_rows.append(embedding)
+            if not new_keys:
+                return
+
+            with open(self._vectors_path, 'ab') as f:
+                np.ascontiguousarray(new_rows, dtype=np.float32).tofile(f)
+            with open(self._keys_path, 'a') as f:
+                f.write(''.join(f"{key}\n" for key in new_keys))
+
+            self._remap(len(self._index))
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Encode texts, calling encode_fn only for texts that are not cached.
+
+        Args:
+            texts: Texts to encode
+            encode_fn: Function encoding a list of texts into an array
+
+        Returns:
+            Float32 array of embeddings in the order of texts
+        """
+        if not texts:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+
+        found = self.get(texts)
+        missing = [i for i in range(len(texts)) if i not in found]
+
+        logger.debug(f"Embedding cache: {len(found)} hits, {len(missing)} misses")
+
+        computed = None
+        if missing:
+            computed = np.asarray(encode_fn([texts[i] for i in missing]), dtype=np.float32)
+            self.put([texts[i] for i in missing], computed)
+
+        dimension = self.dimension if computed is None else computed.shape[1]
+        result = np.empty((len(texts), dimension), dtype=np.float32)
+        for i, embedding in found.items():
+            result[i] = embedding
+        if computed is not None:
+            result[missing] = computed
+        return result
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, size on disk and hit/miss counters
+        """
+        lookups = self.hits + self.misses
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        return {
+            'model_name': self.model_name,
+            'directory': str(self.directory),
+            'entries': len(self._index),
+            'dimension': self.dimension,
+            'size_bytes': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def compact(self, max_entries: Optional[int] = None) -> int:
+        """
+        Rewrite the cache without unreachable rows, evicting the oldest entries.
+
+        Args:
+            max_entries: Keep at most this many (most recently added) entries
+
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock:
+            if not self._index:
+                return 0
+
+            entries = sorted(self._index.items(), key=lambda item: item[1])
+            if max_entries is not None:
+                entries = entries[max(0, len(entries) - max_entries):]
+            evicted = len(self._index) - len(entries)
+
+            keys = [key for key, _ in entries]
+            vectors = np.asarray(self._vectors[[row for _, row in entries]])
+            self._rewrite(keys, vectors)
+
+        logger.info(f"Compacted embedding cache {self.directory}: {len(keys)} entries, {evicted} evicted")
+        return evicted
+
+    def clear(self) -> None:
+        """Delete all cached embeddings for this model"""
+        with self._lock:
+            self._vectors = None
+            self._index = {}
+            self.dimension = None
+            for path in (self._vectors_path, self._keys_path, self._meta_path):
+                path.unlink(missing_ok=True)
+
+
+def main():
+    """Inspect or maintain the embedding cache from the command line"""
+    import argparse
+    from src.config import get_settings
+
+    settings = get_settings()
+    default_model = (
+        settings.local_embedding_model if settings.use_local_embeddings
+        else settings.openai_embedding_model
+    )
+
+    parser = argparse.ArgumentParser(description='Manage the persistent embedding cache')
+    parser.add_argument('command', choices=['stats', 'compact', 'clear'])
+    parser.add_argument('--model', type=str, default=default_model, help='Embedding model name')
+    parser.add_argument('--cache-dir', type=str, default=str(settings.embedding_cache_dir),
+                        help='Embedding cache directory')
+    parser.add_argument('--max-entries', type=int, default=None,
+                        help='With compact: keep at most this many most recent entries')
+
+    args = parser.parse_args()
+
+    cache = EmbeddingCache(Path(args.cache_dir), args.model)
+    if args.command == 'compact':
+        cache.compact(max_entries=args.max_entries)
+    elif args.command == 'clear':
+        cache.clear()
+        logger.info(f"Cleared embedding cache {cache.directory}")
+
+    for key, value in cache.stats().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 """Factory for creating embedding models"""
 
+from typing import Optional
+
 from loguru import logger
 
 from .base import BaseEmbedding
+from .batching import BatchingEmbedding
+from .query_cache import QueryCacheEmbedding
+from .cache import EmbeddingCache
 from .local_embeddings import LocalEmbedding
+from .onnx_embeddings import OnnxEmbedding
 from .openai_embeddings import OpenAIEmbedding
 from src.config import get_settings
 
@@ -17,9 +23,66 @@ def get_embedding_model() -> BaseEmbedding:
     """
     settings = get_settings()
     
-    if settings.use_local_embeddings:
+    if settings.use_local_embeddings and settings.local_embedding_backend == "onnx":
+        variant = "int8" if settings.onnx_quantize else "fp32"
+        logger.info(f"Using local embedding model (ONNX Runtime, {variant})")
+        # Quantized vectors differ slightly; keep them out of the PyTorch model's cache
+        return OnnxEmbedding(
+            model_name=settings.local_embedding_model,
+            cache=_get_cache(f"{settings.local_embedding_model}-onnx-{variant}")
+        )
+    elif settings.use_local_embeddings:
         logger.info("Using local embedding model (sentence-transformers)")
-        return LocalEmbedding(model_name=settings.local_embedding_model)
+        return LocalEmbedding(
+            model_name=settings.local_embedding_model,
+            cache=_get_cache(settings.local_embedding_model)
+        )
     else:
         logger.info("Using OpenAI embedding model")
-        return OpenAIEmbedding(model_name=settings.openai_embedding_model)
+        return OpenAIEmbedding(
+            model_name=settings.openai_embedding_model,
+            cache=_get_cache(settings.openai_embedding_model)
+        )
+
+
+def get_query_encoder(model: BaseEmbedding) -> BaseEmbedding:
+    """
+    Wrap a model for encoding search queries as they arrive
+    
+    With query_cache_enabled, repeated queries are answered from an LRU
+    cache (see QueryCacheEmbedding); with embedding_batching_enabled, the
+    remaining concurrent encode_single calls are coalesced into batches (see
+    BatchingEmbedding). With both disabled the model is returned unchanged.
+    
+    Args:
+        model: Embedding model
+        
+    Returns:
+        Embedding model to call encode_single on
+    """
+    settings = get_settings()
+    encoder = model
+    
+    if settings.embedding_batching_enabled:
+        logger.info(
+            f"Batching query embeddings (max batch {settings.embedding_max_batch_size}, "
+            f"max wait {settings.embedding_max_wait_ms} ms)"
+        )
+        encoder = BatchingEmbedding(encoder)
+    
+    if settings.query_cache_enabled:
+        logger.info(f"Caching up to {settings.query_cache_size} query embeddings")
+        encoder = QueryCacheEmbedding(encoder)
+    
+    return encoder
+
+
+def _get_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """Create the persistent embedding cache for a model if enabled in settings"""
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    
+    cache = EmbeddingCache(settings.embedding_cache_dir, model_name)
+    logger.info(f"Using embedding cache at {cache.directory} ({len(cache)} entries)")
+    return cache
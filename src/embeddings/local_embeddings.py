@@ -1,32 +1,77 @@
 """Local embedding model using sentence-transformers"""
 
-from typing import List
+import os
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from loguru import logger
+from tqdm import tqdm
 
 from .base import BaseEmbedding
+from .cache import EmbeddingCache
 from src.config import get_settings
 
 
+# Model of a bulk-encoding worker process, loaded once by _init_worker
+_worker_model: Optional[SentenceTransformer] = None
+
+
+def _init_worker(model_name: str, num_threads: int) -> None:
+    """Pin the worker's thread counts and load the model once per worker process"""
+    global _worker_model
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Already set once the pool has run work in this process
+    _worker_model = SentenceTransformer(model_name, device='cpu')
+
+
+def _encode_chunk(start: int, texts: List[str], batch_size: int) -> tuple:
+    """Encode a chunk of texts inside a worker process"""
+    embeddings = _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True
+    )
+    return start, embeddings
+
+
 class LocalEmbedding(BaseEmbedding):
     """Local embedding model using sentence-transformers (no API required)"""
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, cache: Optional[EmbeddingCache] = None):
         """
         Initialize local embedding model
         
         Args:
             model_name: Name of the sentence-transformers model
+            cache: Optional persistent embedding cache consulted by encode()
         """
         settings = get_settings()
         self.model_name = model_name or settings.local_embedding_model
+        self.cache = cache
+        # Workers of an open process_pool() block
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
         
         logger.info(f"Loading local embedding model: {self.model_name}")
         self.model = SentenceTransformer(self.model_name)
         logger.info(f"Model loaded successfully. Dimension: {self.get_dimension()}")
     
-    def encode(self, texts: List[str], batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = True,
+        use_cache: bool = True
+    ) -> np.ndarray:
         """
         Encode multiple texts into embeddings
         
@@ -34,6 +79,7 @@ class LocalEmbedding(BaseEmbedding):
             texts: List of text strings
             batch_size: Batch size for encoding
             show_progress: Show progress bar
+            use_cache: Consult and fill the persistent cache (if any)
             
         Returns:
             Array of embeddings
@@ -41,6 +87,16 @@ class LocalEmbedding(BaseEmbedding):
         if not texts:
             return np.array([])
         
+        if self.cache is not None and use_cache:
+            return self.cache.encode(
+                texts,
+                lambda missing: self._encode_uncached(missing, batch_size, show_progress)
+            )
+        
+        return self._encode_uncached(texts, batch_size, show_progress)
+    
+    def _encode_uncached(self, texts: List[str], batch_size: int, show_progress: bool) -> np.ndarray:
+        """Encode texts with the model, bypassing the cache"""
         embeddings = self.model.encode(
             texts,
             batch_size=batch_size,
@@ -50,6 +106,134 @@ class LocalEmbedding(BaseEmbedding):
         
         return embeddings
     
+    def encode_multiprocess(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = True,
+        num_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Encode a large list of texts on a pool of worker processes
+        
+        The texts are split into chunks that are handed to the workers as they
+        become free; each worker loads the model once and runs with a pinned
+        share of the cores (cores // workers threads), so the workers do not
+        oversubscribe the CPU. Chunks are written back at their offsets into
+        one preallocated float32 array, so the output order matches texts.
+        The persistent cache is consulted first, as in encode(). Inside a
+        process_pool() block the block's workers are used instead of new ones.
+        
+        Args:
+            texts: List of text strings
+            batch_size: Batch size for encoding within a worker
+            show_progress: Show progress bar (one step per chunk)
+            num_workers: Number of worker processes (default: settings.embedding_workers;
+                ignored inside a process_pool() block)
+            chunk_size: Texts per task (default: settings.embedding_chunk_size)
+            
+        Returns:
+            Array of embeddings
+        """
+        if not texts:
+            return np.array([])
+        
+        if self.cache is not None:
+            return self.cache.encode(
+                texts,
+                lambda missing: self._encode_pool(missing, batch_size, show_progress, num_workers, chunk_size)
+            )
+        
+        return self._encode_pool(texts, batch_size, show_progress, num_workers, chunk_size)
+    
+    def _encode_pool(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool,
+        num_workers: Optional[int],
+        chunk_size: Optional[int]
+    ) -> np.ndarray:
+        """Encode texts on the process pool, bypassing the cache"""
+        chunk_size = chunk_size or get_settings().embedding_chunk_size
+        num_workers = min(self._pool_size(num_workers), -(-len(texts) // chunk_size))
+        
+        # The pool only helps on CPU; a GPU is better used by this process alone
+        if num_workers <= 1 or self.model.device.type != 'cpu':
+            return self._encode_uncached(texts, batch_size, show_progress)
+        
+        if self._pool is not None:
+            return self._encode_chunks(self._pool, texts, batch_size, show_progress, chunk_size)
+        
+        with self._start_pool(num_workers) as executor:
+            return self._encode_chunks(executor, texts, batch_size, show_progress, chunk_size)
+    
+    def _encode_chunks(
+        self,
+        executor: ProcessPoolExecutor,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool,
+        chunk_size: int
+    ) -> np.ndarray:
+        """Hand chunks of texts to the pool's workers and gather them in order"""
+        embeddings = np.empty((len(texts), self.get_dimension()), dtype=np.float32)
+        futures = [
+            executor.submit(_encode_chunk, start, texts[start:start + chunk_size], batch_size)
+            for start in range(0, len(texts), chunk_size)
+        ]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Chunks", disable=not show_progress):
+            start, chunk = future.result()
+            embeddings[start:start + len(chunk)] = chunk
+        
+        return embeddings
+    
+    def _pool_size(self, num_workers: Optional[int]) -> int:
+        if self._pool is not None:
+            return self._pool_workers
+        return num_workers or get_settings().embedding_workers or os.cpu_count() or 1
+    
+    def _start_pool(self, num_workers: int) -> ProcessPoolExecutor:
+        """Start worker processes, each with its own copy of the model"""
+        num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+        logger.info(f"Starting {num_workers} embedding worker processes ({num_threads} threads each)")
+        # spawn: forking a process that has already run torch can deadlock its thread pools
+        return ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_name, num_threads)
+        )
+    
+    @contextmanager
+    def process_pool(self, num_workers: Optional[int] = None) -> Iterator["LocalEmbedding"]:
+        """
+        Keep one worker pool alive for the encode_multiprocess calls in the block
+        
+        Outside the block every encode_multiprocess call starts (and loads the
+        model into) its own workers, which only pays off for large calls. Inside
+        it, the workers are started once and reused, so a stream of small calls
+        (e.g. a few upload batches at a time while indexing) still runs on all cores.
+        
+        Args:
+            num_workers: Number of worker processes (default: settings.embedding_workers)
+            
+        Yields:
+            This model
+        """
+        num_workers = self._pool_size(num_workers)
+        if self._pool is not None or num_workers <= 1 or self.model.device.type != 'cpu':
+            yield self  # Nested (reuse the outer pool), or no pool to keep
+            return
+        
+        self._pool, self._pool_workers = self._start_pool(num_workers), num_workers
+        try:
+            yield self
+        finally:
+            pool, self._pool = self._pool, None
+            pool.shutdown()
+    
     def encode_single(self, text: str) -> np.ndarray:
         """
         Encode a single text into embedding
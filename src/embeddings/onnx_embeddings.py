@@ -0,0 +1,272 @@
+"""Local embedding model running on ONNX Runtime (CPU)"""
+
+import re
+import json
+import importlib.util
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from transformers import AutoTokenizer
+from tqdm import tqdm
+from loguru import logger
+
+from .base import BaseEmbedding
+from .cache import EmbeddingCache
+from src.config import get_settings
+
+
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+if ONNXRUNTIME_AVAILABLE:
+    import onnxruntime as ort
+
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+META_FILE = "meta.json"
+
+
+def model_directory(root: Path, model_name: str) -> Path:
+    """Directory holding the exported files of a model"""
+    return Path(root) / re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)
+
+
+def export_onnx(model_name: str, output_dir: Path, quantize: bool = True) -> Path:
+    """
+    Export a sentence-transformers model to ONNX, optionally with an int8 copy.
+
+    Needs torch and sentence-transformers, and onnx for the quantization.
+    The transformer is exported with dynamic batch and sequence axes; the
+    tokenizer and the pooling settings (mean pooling, L2 normalization) are
+    saved next to it so OnnxEmbedding can reproduce model.encode() without PyTorch.
+
+    Args:
+        model_name: Name of the sentence-transformers model
+        output_dir: Directory for model.onnx, model_int8.onnx, the tokenizer and meta.json
+        quantize: Also write an int8 dynamically quantized model
+
+    Returns:
+        Path of the model OnnxEmbedding should load
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise ImportError("onnxruntime is required to export ONNX models: pip install onnxruntime")
+
+    # Export-only dependencies: inference needs neither PyTorch nor the onnx package
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Exporting {model_name} to ONNX in {output_dir}")
+    st_model = SentenceTransformer(model_name, device='cpu')
+    pooling = next(module for module in st_model if isinstance(module, Pooling))
+    if not pooling.pooling_mode_mean_tokens:
+        raise ValueError(f"{model_name} does not use mean pooling; only mean pooling is supported")
+
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    sample = tokenizer(["export sample text"], padding=True, return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['last_hidden_state']}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            str(output_dir / MODEL_FILE),
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            do_constant_folding=True
+        )
+
+    tokenizer.save_pretrained(str(output_dir))
+    (output_dir / META_FILE).write_text(json.dumps({
+        'model_name': model_name,
+        'dimension': st_model.get_sentence_embedding_dimension(),
+        'max_seq_length': st_model.max_seq_length,
+        'normalize': any(isinstance(module, Normalize) for module in st_model),
+    }))
+
+    if quantize:
+        # Weights to int8 ahead of time, activations quantized on the fly per batch
+        quantize_dynamic(
+            str(output_dir / MODEL_FILE),
+            str(output_dir / QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8
+        )
+        logger.info(f"Wrote int8 model to {output_dir / QUANTIZED_MODEL_FILE}")
+
+    return output_dir / (QUANTIZED_MODEL_FILE if quantize else MODEL_FILE)
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """
+    Local embedding model on ONNX Runtime (no PyTorch at inference time).
+
+    Produces the same vectors as LocalEmbedding for the same model (mean
+    pooling over the attention mask, then L2 normalization) from an ONNX
+    export of the transformer, exported on first use. With quantize, the
+    int8 dynamically quantized export is used: smaller and faster on CPU,
+    at a small cost in agreement with the full-precision vectors.
+    """
+
+    def __init__(
+        self,
+        model_name: str = None,
+        quantize: Optional[bool] = None,
+        model_dir: Optional[Path] = None,
+        num_threads: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        """
+        Initialize the ONNX embedding model
+
+        Args:
+            model_name: Name of the sentence-transformers model
+            quantize: Use the int8 model (default: settings.onnx_quantize)
+            model_dir: Root directory of exported models (default: settings.onnx_model_dir)
+            num_threads: Intra-op threads for ONNX Runtime (default: settings.onnx_num_threads,
+                None = all cores)
+            cache: Optional persistent embedding cache consulted by encode()
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is required for OnnxEmbedding: pip install onnxruntime")
+
+        settings = get_settings()
+        self.model_name = model_name or settings.local_embedding_model
+        self.quantize = settings.onnx_quantize if quantize is None else quantize
+        self.directory = model_directory(model_dir or settings.onnx_model_dir, self.model_name)
+        self.cache = cache
+
+        model_path = self.directory / (QUANTIZED_MODEL_FILE if self.quantize else MODEL_FILE)
+        if not model_path.exists() or not (self.directory / META_FILE).exists():
+            export_onnx(self.model_name, self.directory, quantize=self.quantize)
+
+        meta = json.loads((self.directory / META_FILE).read_text())
+        self.max_seq_length = meta['max_seq_length']
+        self.normalize = meta['normalize']
+        self._dimension = meta['dimension']
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.directory))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        num_threads = num_threads or settings.onnx_num_threads
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        logger.info(f"Loading ONNX embedding model: {model_path}")
+        self.session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+        self._input_names = [node.name for node in self.session.get_inputs()]
+        logger.info(f"Model loaded successfully. Dimension: {self.get_dimension()}")
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = True,
+        use_cache: bool = True
+    ) -> np.ndarray:
+        """
+        Encode multiple texts into embeddings
+
+        Args:
+            texts: List of text strings
+            batch_size: Batch size for encoding
+            show_progress: Show progress bar
+            use_cache: Consult and fill the persistent cache (if any)
+
+        Returns:
+            Array of embeddings
+        """
+        if not texts:
+            return np.array([])
+
+        if self.cache is not None and use_cache:
+            return self.cache.encode(
+                texts,
+                lambda missing: self._encode_uncached(missing, batch_size, show_progress)
+            )
+
+        return self._encode_uncached(texts, batch_size, show_progress)
+
+    def _encode_uncached(self, texts: List[str], batch_size: int, show_progress: bool) -> np.ndarray:
+        """Encode texts with the model, bypassing the cache"""
+        # Batches of similar length need less padding (as in SentenceTransformer.encode)
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        embeddings = np.empty((len(texts), self._dimension), dtype=np.float32)
+        for start in tqdm(range(0, len(texts), batch_size), desc="Batches", disable=not show_progress):
+            rows = order[start:start + batch_size]
+            embeddings[rows] = self._forward([texts[i] for i in rows])
+        return embeddings
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        """Tokenize, run the transformer and mean-pool one batch"""
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors='np'
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self._input_names}
+        hidden = self.session.run(['last_hidden_state'], feeds)[0]
+
+        mask = encoded['attention_mask'][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def encode_single(self, text: str) -> np.ndarray:
+        """
+        Encode a single text into embedding
+
+        Args:
+            text: Text string
+
+        Returns:
+            Embedding vector
+        """
+        return self._forward([text])[0]
+
+    def get_dimension(self) -> int:
+        """
+        Get the dimension of the embedding vectors
+
+        Returns:
+            Embedding dimension
+        """
+        return self._dimension
+
+
+def main():
+    """Export a model to ONNX from the command line"""
+    import argparse
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='Export a sentence-transformers model to ONNX')
+    parser.add_argument('--model', type=str, default=settings.local_embedding_model,
+                        help='sentence-transformers model name')
+    parser.add_argument('--output-dir', type=str, default=str(settings.onnx_model_dir),
+                        help='Root directory of exported models')
+    parser.add_argument('--no-quantize', action='store_true', help='Skip the int8 model')
+
+    args = parser.parse_args()
+
+    path = export_onnx(
+        args.model,
+        model_directory(Path(args.output_dir), args.model),
+        quantize=not args.no_quantize
+    )
+    print(f"Exported: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
 """OpenAI embedding model"""
 
-from typing import List
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 import numpy as np
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError
 from loguru import logger
+from tqdm import tqdm
 
 from .base import BaseEmbedding
+from .cache import EmbeddingCache
+from .rate_limit import TokenBucket, backoff_delay
 from src.config import get_settings
 
 
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are transient"""
+    if isinstance(error, APIConnectionError):
+        return True
+    status = getattr(error, 'status_code', None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After header of an error response, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(texts: List[str]) -> int:
+    """Rough token count of texts for the tokens-per-minute quota (about 4 characters per token)"""
+    return sum(len(text) // 4 + 1 for text in texts)
+
+
 class OpenAIEmbedding(BaseEmbedding):
-    """OpenAI embedding model (requires API key)"""
+    """
+    OpenAI embedding model (requires API key)
+    
+    encode() keeps up to max_concurrency batch requests in flight, throttled
+    by client-side token buckets for the requests-per-minute and
+    tokens-per-minute quotas, so throughput is bounded by the quota rather
+    than by round-trip latency. Rate-limit (429) and server (5xx) errors,
+    timeouts and dropped connections are retried with exponential backoff.
+    With a persistent cache, each batch is stored as soon as it arrives, so
+    rerunning a failed encode only requests the texts that are still missing.
+    """
     
     # Dimension mapping for OpenAI models
     MODEL_DIMENSIONS = {
@@ -19,31 +57,68 @@ class OpenAIEmbedding(BaseEmbedding):
         "text-embedding-ada-002": 1536,
     }
     
-    def __init__(self, model_name: str = None, api_key: str = None):
+    def __init__(
+        self,
+        model_name: str = None,
+        api_key: str = None,
+        cache: Optional[EmbeddingCache] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None
+    ):
         """
         Initialize OpenAI embedding model
         
         Args:
             model_name: Name of the OpenAI embedding model
             api_key: OpenAI API key
+            cache: Optional persistent embedding cache consulted by encode()
+            base_url: API base URL (default: settings.openai_embedding_base_url, None = OpenAI)
+            max_concurrency: Most requests in flight (default: settings.openai_max_concurrency)
+            requests_per_minute: Request quota (default: settings.openai_requests_per_minute)
+            tokens_per_minute: Token quota (default: settings.openai_tokens_per_minute)
+            max_retries: Retries of a failed request (default: settings.openai_max_retries)
+            backoff_seconds: Delay before the first retry (default: settings.openai_backoff_seconds)
         """
         settings = get_settings()
         self.model_name = model_name or settings.openai_embedding_model
+        self.cache = cache
+        self.max_concurrency = max_concurrency or settings.openai_max_concurrency
+        self.max_retries = settings.openai_max_retries if max_retries is None else max_retries
+        self.backoff_seconds = settings.openai_backoff_seconds if backoff_seconds is None else backoff_seconds
+        self.max_backoff_seconds = settings.openai_max_backoff_seconds
+        
+        self._request_bucket = TokenBucket.per_minute(requests_per_minute or settings.openai_requests_per_minute)
+        self._token_bucket = TokenBucket.per_minute(tokens_per_minute or settings.openai_tokens_per_minute)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._throttled_seconds = 0.0
         
         api_key = api_key or settings.openai_api_key
         if not api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY in .env file")
         
-        self.client = OpenAI(api_key=api_key)
+        # Retries are handled here (with the rate limiter), not by the client
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url or settings.openai_embedding_base_url,
+            max_retries=0,
+            timeout=settings.openai_request_timeout
+        )
         logger.info(f"Initialized OpenAI embedding model: {self.model_name}")
     
-    def encode(self, texts: List[str], batch_size: int = 100) -> np.ndarray:
+    def encode(self, texts: List[str], batch_size: int = 100, use_cache: bool = True) -> np.ndarray:
         """
         Encode multiple texts into embeddings
         
         Args:
             texts: List of text strings
             batch_size: Batch size for API calls
+            use_cache: Consult and fill the persistent cache (if any)
             
         Returns:
             Array of embeddings
@@ -51,28 +126,78 @@ class OpenAIEmbedding(BaseEmbedding):
         if not texts:
             return np.array([])
         
-        all_embeddings = []
+        if self.cache is not None and use_cache:
+            return self.cache.encode(texts, lambda missing: self._encode_uncached(missing, batch_size))
+        
+        return self._encode_uncached(texts, batch_size, use_cache=False)
+    
+    def _encode_uncached(self, texts: List[str], batch_size: int, use_cache: bool = True) -> np.ndarray:
+        """Encode texts through the API, bypassing the cache"""
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        embeddings = None
+        
+        if len(batches) > 1:
+            logger.info(
+                f"Encoding {len(texts)} texts in {len(batches)} requests "
+                f"({min(self.max_concurrency, len(batches))} in flight)"
+            )
         
-        # Process in batches to avoid rate limits
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {
+                executor.submit(self._create, batch): i * batch_size
+                for i, batch in enumerate(batches)
+            }
+            try:
+                progress = tqdm(as_completed(futures), total=len(futures), desc="Requests", disable=len(batches) < 10)
+                for future in progress:
+                    start = futures[future]
+                    batch_embeddings = future.result()
+                    if embeddings is None:
+                        embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+                    embeddings[start:start + len(batch_embeddings)] = batch_embeddings
+                    if self.cache is not None and use_cache:
+                        # Keep finished batches even if a later one fails
+                        self.cache.put(texts[start:start + len(batch_embeddings)], batch_embeddings)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        return embeddings
+    
+    def _create(self, batch: List[str]) -> np.ndarray:
+        """One embeddings request, rate limited and retried on transient errors"""
+        for attempt in range(self.max_retries + 1):
+            throttled = 0.0
+            if self._request_bucket is not None:
+                throttled += self._request_bucket.acquire()
+            if self._token_bucket is not None:
+                throttled += self._token_bucket.acquire(estimate_tokens(batch))
+            with self._lock:
+                self._requests += 1
+                self._throttled_seconds += throttled
             
             try:
                 response = self.client.embeddings.create(
                     input=batch,
                     model=self.model_name
                 )
-                
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-                
-                logger.debug(f"Encoded batch {i // batch_size + 1}: {len(batch)} texts")
-                
             except Exception as e:
-                logger.error(f"Error encoding batch: {e}")
-                raise
-        
-        return np.array(all_embeddings)
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    logger.error(f"Error encoding batch of {len(batch)} texts: {e}")
+                    raise
+                delay = backoff_delay(attempt, self.backoff_seconds, self.max_backoff_seconds, _retry_after(e))
+                logger.warning(
+                    f"Embedding request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                with self._lock:
+                    self._retries += 1
+                time.sleep(delay)
+                continue
+            
+            # The API may return items out of order; index says where each belongs
+            data = sorted(response.data, key=lambda item: item.index)
+            return np.array([item.embedding for item in data], dtype=np.float32)
     
     def encode_single(self, text: str) -> np.ndarray:
         """
@@ -84,17 +209,22 @@ class OpenAIEmbedding(BaseEmbedding):
         Returns:
             Embedding vector
         """
-        try:
-            response = self.client.embeddings.create(
-                input=[text],
-                model=self.model_name
-            )
-            embedding = response.data[0].embedding
-            return np.array(embedding)
+        return self._create([text])[0]
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get request metrics.
         
-        except Exception as e:
-            logger.error(f"Error encoding text: {e}")
-            raise
+        Returns:
+            Dictionary with requests sent, retries and seconds spent waiting for the rate limiter
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'throttled_seconds': self._throttled_seconds,
+                'max_concurrency': self.max_concurrency,
+            }
     
     def get_dimension(self) -> int:
         """
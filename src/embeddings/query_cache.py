@@ -0,0 +1,171 @@
+"""In-memory LRU cache of query embeddings"""
+
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .base import BaseEmbedding
+from .batching import BatchingEmbedding
+from src.config import get_settings
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query for cache lookup.
+
+    Unicode is NFC-normalized and runs of whitespace are collapsed; case is
+    kept because cased models embed 'Apple' and 'apple' differently.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Normalized text
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class QueryCacheEmbedding(BaseEmbedding):
+    """
+    Bounded LRU cache in front of encode_single.
+
+    Entries are keyed on (model name, normalized text) and optionally expire
+    after ttl_seconds. Cached vectors are returned as read-only arrays, so
+    every caller can share one copy without being able to corrupt it. A miss
+    encodes the normalized text with the wrapped model, so all spellings
+    that share a key also share an embedding.
+
+    encode() goes straight to the wrapped model: bulk document encoding has
+    its own persistent cache (EmbeddingCache).
+    """
+
+    def __init__(
+        self,
+        model: BaseEmbedding,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        model_name: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            model: Embedding model (or BatchingEmbedding) to cache queries for
+            max_entries: Most cached queries (default: settings.query_cache_size)
+            ttl_seconds: Entry lifetime (default: settings.query_cache_ttl_seconds; None = no expiry)
+            model_name: Model part of the cache key (default: model.model_name)
+        """
+        settings = get_settings()
+        self.model = model
+        self.model_name = model_name or getattr(model, 'model_name', model.__class__.__name__)
+        self.max_entries = max_entries or settings.query_cache_size
+        self.ttl_seconds = settings.query_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, stored_at = entry
+                if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def _store(self, key: Tuple[str, str], vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def encode_single(self, text: str) -> np.ndarray:
+        """
+        Encode a single text, reusing the cached vector of an earlier identical query.
+
+        Args:
+            text: Text string
+
+        Returns:
+            Read-only embedding vector
+        """
+        normalized = normalize_query(text)
+        key = (self.model_name, normalized)
+
+        vector = self._lookup(key)
+        if vector is None:
+            # Concurrent misses on one key may both encode; the result is the same
+            vector = np.array(self.model.encode_single(normalized), copy=True)
+            vector.flags.writeable = False
+            self._store(key, vector)
+        return vector
+
+    def encode(self, texts: List[str], *args, **kwargs) -> np.ndarray:
+        """Encode a list of texts directly with the wrapped model"""
+        return self.model.encode(texts, *args, **kwargs)
+
+    def get_dimension(self) -> int:
+        """
+        Get the dimension of the embedding vectors
+
+        Returns:
+            Embedding dimension
+        """
+        return self.model.get_dimension()
+
+    def clear(self) -> None:
+        """Drop all cached queries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, limits and hit/miss/expiry/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'model_name': self.model_name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics together with those of the wrapped encoder.
+
+        Returns:
+            Dictionary with 'cache' and, for a BatchingEmbedding underneath,
+            'batching' (for another model with metrics(), 'encoder')
+        """
+        metrics = {'cache': self.stats()}
+        if isinstance(self.model, BatchingEmbedding):
+            metrics['batching'] = self.model.metrics()
+        elif hasattr(self.model, 'metrics'):
+            metrics['encoder'] = self.model.metrics()
+        return metrics
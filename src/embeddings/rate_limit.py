@@ -0,0 +1,92 @@
+"""Client-side rate limiting and retry backoff for remote embedding APIs"""
+
+import time
+import random
+import threading
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at rate per second up to capacity; acquire()
+    blocks until enough tokens are available. A request larger than the
+    capacity is let through once the bucket is full and leaves it in debt,
+    so later requests wait until the average rate is back within the limit.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens held at once, i.e. the largest burst (default: one second's worth)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: Optional[float]) -> Optional["TokenBucket"]:
+        """Bucket for a per-minute quota (None = no limit)"""
+        return cls(limit / 60) if limit else None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            amount: Number of tokens
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        needed = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    maximum: float,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Delay before retry number attempt (0-based): exponential with jitter.
+
+    The exponential delay base * 2**attempt is capped at maximum and drawn
+    uniformly from its upper half, so concurrent clients that failed together
+    do not retry together. A server-sent Retry-After is honored if longer.
+
+    Args:
+        attempt: Number of retries already made
+        base: Delay of the first retry in seconds
+        maximum: Longest delay in seconds
+        retry_after: Delay requested by the server in seconds
+
+    Returns:
+        Seconds to wait
+    """
+    delay = min(maximum, base * 2 ** attempt)
+    delay = random.uniform(delay / 2, delay)
+    return max(delay, retry_after or 0.0)
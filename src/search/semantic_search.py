@@ -3,7 +3,7 @@
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
-from src.embeddings import get_embedding_model, BaseEmbedding
+from src.embeddings import get_embedding_model, get_query_encoder, BaseEmbedding
 from src.vectordb import QdrantManager, VectorDBOperations
 
 
@@ -26,6 +26,7 @@ class SemanticSearch:
         
         # Initialize embedding model
         self.embedding_model = embedding_model or get_embedding_model()
+        self.query_encoder = get_query_encoder(self.embedding_model)
         
         # Initialize vector DB
         self.qdrant_manager = qdrant_manager or QdrantManager()
@@ -60,8 +61,8 @@ class SemanticSearch:
         """
         logger.info(f"Searching for: '{query}' (limit={limit})")
         
-        # Generate query embedding
-        query_vector = self.embedding_model.encode_single(query)
+        # Generate query embedding (cached, batched with concurrent searches)
+        query_vector = self.query_encoder.encode_single(query)
         
         # Search in vector DB
         results = self.db_ops.search(
@@ -166,12 +167,15 @@ class SemanticSearch:
         """
         try:
             info = self.qdrant_manager.get_collection_info()
-            return {
+            stats = {
                 'total_videos': info['points_count'],
                 'collection_name': info['name'],
                 'status': info['status'],
                 'embedding_dimension': self.embedding_model.get_dimension()
             }
+            if hasattr(self.query_encoder, 'metrics'):
+                stats['query_encoder'] = self.query_encoder.metrics()
+            return stats
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {}
@@ -2,5 +2,6 @@
 
 from .client import QdrantManager
 from .operations import VectorDBOperations
+from .pipeline import PipelinedIndexer
 
-__all__ = ["QdrantManager", "VectorDBOperations"]
+__all__ = ["QdrantManager", "VectorDBOperations", "PipelinedIndexer"]
@@ -1,8 +1,11 @@
 """Vector database operations for indexing and searching"""
 
+import uuid
 from typing import List, Dict, Any, Optional
 import numpy as np
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    PointStruct, Filter, FieldCondition, MatchValue, SetPayload, SetPayloadOperation
+)
 from loguru import logger
 from tqdm import tqdm
 
@@ -10,6 +13,23 @@ from .client import QdrantManager
 from src.config import get_settings
 
 
+# Namespace for deriving stable Qdrant point IDs from YouTube video IDs
+VIDEO_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://www.youtube.com/watch")
+
+
+def point_id_for(video_id: str) -> str:
+    """
+    Derive the Qdrant point ID of a video (UUIDv5 of its video ID)
+    
+    Args:
+        video_id: YouTube video ID
+        
+    Returns:
+        Point ID as a UUID string
+    """
+    return str(uuid.uuid5(VIDEO_ID_NAMESPACE, video_id))
+
+
 class VectorDBOperations:
     """High-level operations for vector database"""
     
@@ -34,6 +54,9 @@ class VectorDBOperations:
         """
         Index documents with their embeddings
         
+        Points are keyed by point_id_for(video_id), so re-indexing a video
+        overwrites its own point and nothing else.
+        
         Args:
             documents: List of document dictionaries with 'id', 'text', and 'metadata'
             embeddings: Array of embeddings corresponding to documents
@@ -49,31 +72,13 @@ class VectorDBOperations:
         
         logger.info(f"Indexing {len(documents)} documents in batches of {batch_size}")
         
-        # Prepare points
-        points = []
-        for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-            point = PointStruct(
-                id=i,  # Use sequential ID for Qdrant
-                vector=embedding.tolist(),
-                payload={
-                    'video_id': doc['id'],
-                    'text': doc['text'],
-                    **doc['metadata']
-                }
-            )
-            points.append(point)
-        
-        # Upload in batches
+        # Build and upload points batch by batch
         total_indexed = 0
-        for i in tqdm(range(0, len(points), batch_size), desc="Uploading batches"):
-            batch = points[i:i + batch_size]
+        for i in tqdm(range(0, len(documents), batch_size), desc="Uploading batches"):
+            batch = self.build_points(documents[i:i + batch_size], embeddings[i:i + batch_size])
             
             try:
-                self.client.upsert(
-                    collection_name=self.collection_name,
-                    points=batch
-                )
-                total_indexed += len(batch)
+                total_indexed += self.upsert_points(batch)
                 
             except Exception as e:
                 logger.error(f"Error uploading batch {i // batch_size}: {e}")
@@ -82,6 +87,101 @@ class VectorDBOperations:
         logger.info(f"Successfully indexed {total_indexed} documents")
         return total_indexed
     
+    def build_points(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: np.ndarray
+    ) -> List[PointStruct]:
+        """
+        Build Qdrant points for documents and their embeddings
+        
+        Args:
+            documents: List of document dictionaries with 'id', 'text', and 'metadata'
+            embeddings: Array of embeddings corresponding to documents
+            
+        Returns:
+            List of points keyed by point_id_for(video_id)
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32).tolist()
+        return [
+            PointStruct(
+                id=point_id_for(doc['id']),
+                vector=vector,
+                payload=self._document_payload(doc)
+            )
+            for doc, vector in zip(documents, vectors)
+        ]
+    
+    def upsert_points(self, points: List[PointStruct]) -> int:
+        """
+        Upload one batch of points
+        
+        Args:
+            points: Points to upsert
+            
+        Returns:
+            Number of points uploaded
+        """
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=points
+        )
+        return len(points)
+    
+    def update_payloads(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Overwrite the payloads of already indexed points without re-uploading vectors
+        
+        Args:
+            documents: List of document dictionaries with 'id', 'text', and 'metadata'
+            batch_size: Number of points updated per request (default: from settings)
+            
+        Returns:
+            Number of payloads updated
+        """
+        batch_size = batch_size or self.settings.batch_size
+        
+        operations = [
+            SetPayloadOperation(
+                set_payload=SetPayload(
+                    payload=self._document_payload(doc),
+                    points=[point_id_for(doc['id'])]
+                )
+            )
+            for doc in documents
+        ]
+        
+        total_updated = 0
+        for i in range(0, len(operations), batch_size):
+            batch = operations[i:i + batch_size]
+            
+            try:
+                self.client.batch_update_points(
+                    collection_name=self.collection_name,
+                    update_operations=batch
+                )
+                total_updated += len(batch)
+                
+            except Exception as e:
+                logger.error(f"Error updating payload batch {i // batch_size}: {e}")
+                raise
+        
+        logger.info(f"Updated payloads of {total_updated} documents")
+        return total_updated
+    
+    @staticmethod
+    def _document_payload(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Qdrant payload for a document"""
+        return {
+            'video_id': doc['id'],
+            'text': doc['text'],
+            **doc['metadata']
+        }
+    
     def search(
         self,
         query_vector: np.ndarray,
@@ -294,35 +394,42 @@ class VectorDBOperations:
         Returns:
             Document data or None if not found
         """
+        return self.get_documents_by_ids([video_id]).get(video_id)
+    
+    def get_documents_by_ids(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve several documents by video ID in one point lookup
+        
+        Args:
+            video_ids: Video IDs
+            
+        Returns:
+            Mapping from video ID to document data (missing videos are omitted)
+        """
+        if not video_ids:
+            return {}
+        
         try:
-            # Search by video_id in payload
-            results = self.client.scroll(
+            points = self.client.retrieve(
                 collection_name=self.collection_name,
-                scroll_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key='video_id',
-                            match=MatchValue(value=video_id)
-                        )
-                    ]
-                ),
-                limit=1
+                ids=[point_id_for(video_id) for video_id in video_ids],
+                with_payload=True,
+                with_vectors=False
             )
             
-            if results[0]:
-                point = results[0][0]
-                return {
+            return {
+                point.payload.get('video_id'): {
                     'id': point.payload.get('video_id'),
                     'title': point.payload.get('title', ''),
                     'channel': point.payload.get('channel', ''),
                     'metadata': point.payload
                 }
-            
-            return None
+                for point in points
+            }
             
         except Exception as e:
-            logger.error(f"Error retrieving document: {e}")
-            return None
+            logger.error(f"Error retrieving documents: {e}")
+            return {}
     
     def count_documents(self) -> int:
         """
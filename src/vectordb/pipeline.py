@@ -0,0 +1,173 @@
+"""Pipelined embed-and-upload indexing for the vector database"""
+
+import queue
+import inspect
+import threading
+from contextlib import nullcontext
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+from tqdm import tqdm
+
+from .operations import VectorDBOperations
+from src.config import get_settings
+
+
+_SENTINEL = None
+
+
+class PipelinedIndexer:
+    """
+    Index documents by overlapping embedding and uploading.
+
+    The calling thread encodes one batch of documents at a time and puts the
+    finished points on a bounded queue; upload threads take batches off the
+    queue and upsert them into Qdrant. CPU-bound encoding and network-bound
+    uploads run at the same time, and at most queue_depth encoded batches
+    wait in memory. Documents may be a generator, so they never need to be
+    materialized all at once.
+
+    Models with a bulk-encoding process pool (LocalEmbedding.encode_multiprocess)
+    keep one pool of worker processes open for the whole run when there are at
+    least multiprocess_threshold documents (or their number is unknown). Each
+    encode call then takes encode_batch_size documents, a few upload batches,
+    spread over the workers in chunks of batch_size; the encoded documents are
+    queued for upload in slices of batch_size. Memory stays bounded by
+    queue_depth upload batches plus one encode call.
+
+    Example:
+        >>> indexer = PipelinedIndexer(VectorDBOperations(), get_embedding_model())
+        >>> indexer.index(documents)
+    """
+
+    def __init__(
+        self,
+        db_ops: VectorDBOperations,
+        embedding_model,
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        upload_workers: Optional[int] = None,
+        encode_batch_size: Optional[int] = None,
+        multiprocess_threshold: Optional[int] = None
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            db_ops: Vector DB operations for the target collection
+            embedding_model: Embedding model used to encode document texts
+            batch_size: Documents per encode/upload batch (default: from settings)
+            queue_depth: Maximum encoded batches waiting for upload (default: from settings)
+            upload_workers: Number of upload threads (default: from settings)
+            encode_batch_size: Documents per encode call when the process pool is used
+                (default: settings.index_encode_batches upload batches; otherwise batch_size)
+            multiprocess_threshold: Minimum documents to index for the process pool
+                (default: settings.embedding_multiprocess_threshold)
+        """
+        settings = get_settings()
+        self.db_ops = db_ops
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size or settings.batch_size
+        self.queue_depth = queue_depth or settings.index_queue_depth
+        self.upload_workers = upload_workers or settings.index_upload_workers
+
+        self._multiprocess = hasattr(embedding_model, 'encode_multiprocess')
+        self.encode_batch_size = encode_batch_size or self.batch_size * settings.index_encode_batches
+        self.multiprocess_threshold = multiprocess_threshold or settings.embedding_multiprocess_threshold
+
+        # Not every backend takes show_progress; per-batch progress bars would be noise anyway
+        encode_params = inspect.signature(embedding_model.encode).parameters
+        self._encode_kwargs = {'show_progress': False} if 'show_progress' in encode_params else {}
+
+    def _batches(self, documents: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+
+    def _encode(self, texts: List[str], pooled: bool):
+        """Encode texts, spread over the model's process pool if pooled"""
+        if pooled:
+            return self.embedding_model.encode_multiprocess(texts, show_progress=False, chunk_size=self.batch_size)
+        return self.embedding_model.encode(texts, **self._encode_kwargs)
+
+    def index(self, documents: Iterable[Dict[str, Any]], total: Optional[int] = None) -> int:
+        """
+        Encode and upload documents.
+
+        Args:
+            documents: Documents with 'id', 'text' and 'metadata' (list or generator)
+            total: Number of documents, for progress reporting (default: len(documents) if available)
+
+        Returns:
+            Number of documents indexed
+        """
+        if total is None and hasattr(documents, '__len__'):
+            total = len(documents)
+
+        batches: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        errors: List[BaseException] = []
+        uploaded = [0]
+        lock = threading.Lock()
+        progress = tqdm(total=total, desc="Indexing documents")
+
+        def upload_worker() -> None:
+            while True:
+                item = batches.get()
+                if item is _SENTINEL:
+                    return
+                batch_no, points = item
+                if errors:
+                    continue  # Drain the queue after a failure
+                try:
+                    count = self.db_ops.upsert_points(points)
+                except Exception as e:
+                    logger.error(f"Error uploading batch {batch_no}: {e}")
+                    errors.append(e)
+                    continue
+                with lock:
+                    uploaded[0] += count
+                    progress.update(count)
+
+        workers = [
+            threading.Thread(target=upload_worker, name=f"qdrant-upload-{i}", daemon=True)
+            for i in range(self.upload_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        pooled = self._multiprocess and (total is None or total >= self.multiprocess_threshold)
+        encode_batch_size = self.encode_batch_size if pooled else self.batch_size
+        logger.info(
+            f"Pipelined indexing: encode {encode_batch_size} / upload {self.batch_size} documents at a time"
+            f"{' on a process pool' if pooled else ''}, "
+            f"{self.upload_workers} upload workers, queue depth {self.queue_depth}"
+        )
+
+        try:
+            with self.embedding_model.process_pool() if pooled else nullcontext():
+                batch_no = 0
+                for chunk in self._batches(documents, encode_batch_size):
+                    if errors:
+                        break
+                    embeddings = self._encode([doc['text'] for doc in chunk], pooled)
+                    for start in range(0, len(chunk), self.batch_size):
+                        end = start + self.batch_size
+                        # Blocks while queue_depth batches are waiting, bounding memory
+                        batches.put((batch_no, self.db_ops.build_points(chunk[start:end], embeddings[start:end])))
+                        batch_no += 1
+        finally:
+            for _ in workers:
+                batches.put(_SENTINEL)
+            for worker in workers:
+                worker.join()
+            progress.close()
+
+        if errors:
+            raise errors[0]
+
+        logger.info(f"Successfully indexed {uploaded[0]} documents")
+        return uploaded[0]
@@ -0,0 +1,1079 @@
+"""Tests for the YouTube data processing pipeline"""
+
+import sys
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.enhanced_processor import EnhancedYouTubeDataProcessor, country_from_filename
+from src.data.preprocessor import DataPreprocessor
+from src.data.loader import (
+    DataLoader, ReservoirSampler, read_trending_csv, concat_typed, memory_report, PROCESSOR_COLUMNS
+)
+from src.data.language_detection import LanguageDetector, detect_language
+from src.data.streaming import TrendAggregator
+from src.data.vector_sync import VectorSyncTracker
+from src.data.sql_loader import SQLiteBulkLoader
+from src.data.snapshot import ParquetSnapshot
+from src.data.temporal import trend_features
+from src.data.trend_days import TrendDaysStore
+from src.data.aggregates import AGGREGATES, aggregate_metadata, describe_aggregates
+from src.data.text_search import search_text, to_match_query
+from src.data.sql_indexes import check_query_plans, drop_indexes, create_indexes, explain
+from src.data.documents import (
+    iter_vector_documents, iter_preprocessed_documents, vector_searchable_text, preprocessed_searchable_text
+)
+from src.data.text_cleaning import (
+    clean_text_column,
+    split_and_clean_tags_column,
+    normalize_text_column,
+    parse_tags_column,
+)
+
+
+RAW_COLUMNS = [
+    'video_id', 'trending_date', 'title', 'channel_title', 'category_id',
+    'publish_time', 'tags', 'views', 'likes', 'dislikes', 'comment_count',
+    'thumbnail_link', 'comments_disabled', 'ratings_disabled',
+    'video_error_or_removed', 'description'
+]
+
+
+def make_trending_frame(n_videos: int = 60, n_days: int = 30, seed: int = 0) -> pd.DataFrame:
+    """Synthetic raw trending rows in the Kaggle CSV layout"""
+    rng = np.random.default_rng(seed)
+    words = ["cat", "music", "Gaming", "news", "recette", "fútbol", "live", "trailer", "vlog", "<b>HD</b>"]
+    start = pd.Timestamp("2018-01-01")
+    rows = []
+    for v in range(n_videos):
+        video_id = f"vid{v:08d}"
+        title = " ".join(rng.choice(words, size=4))
+        description = np.nan if v % 7 == 0 else f"{title} http://example.com/{v} more text"
+        tags = "[none]" if v % 5 == 0 else "|".join(f'"{t}"' for t in rng.choice(words, size=3))
+        days = np.sort(rng.choice(n_days, size=rng.integers(1, 12), replace=False))
+        views = 1000 * (v + 1)
+        for day in days:
+            views += int(rng.integers(1, 5000))
+            rows.append({
+                'video_id': video_id,
+                'trending_date': (start + pd.Timedelta(days=int(day))).strftime('%y.%d.%m'),
+                'title': title,
+                'channel_title': f"Channel {v % 9}",
+                'category_id': int(rng.choice([1, 10, 20, 24, 99])),
+                'publish_time': '2017-12-30T10:00:00.000Z',
+                'tags': tags,
+                'views': views,
+                'likes': views // 10,
+                'dislikes': views // 100,
+                'comment_count': views // 50,
+                'thumbnail_link': f"https://i.ytimg.com/vi/{video_id}/default.jpg",
+                'comments_disabled': False,
+                'ratings_disabled': False,
+                'video_error_or_removed': False,
+                'description': description,
+            })
+    df = pd.DataFrame(rows, columns=RAW_COLUMNS)
+    # Trending files are ordered by date, not by video
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+SAMPLE_TEXTS = [
+    "Funny cat videos compilation 2018",
+    "Les meilleures recettes de cuisine française",
+    "Die besten Fußball Tore der Saison",
+    "",
+    "   ",
+    "Funny cat videos compilation 2018",
+    "Cómo aprender a tocar la guitarra en una semana",
+]
+
+
+class TestLanguageDetection:
+    """Test memoized and parallel language detection"""
+
+    def test_matches_row_by_row_detection(self):
+        """Detector output matches the per-row detect_language function"""
+        texts = pd.Series(SAMPLE_TEXTS)
+        detector = LanguageDetector(n_workers=1)
+
+        result = detector.detect(texts)
+
+        assert result.tolist() == [detect_language(t) for t in SAMPLE_TEXTS]
+        assert result.iloc[3] == "unknown"
+        assert result.iloc[4] == "unknown"
+
+    def test_repeated_texts_are_classified_once(self):
+        """Repeated texts are answered from the memo"""
+        detector = LanguageDetector(n_workers=1)
+
+        detector.detect(pd.Series(SAMPLE_TEXTS))
+        assert detector.memo_size == len(set(SAMPLE_TEXTS))
+
+        detector.detect(pd.Series(SAMPLE_TEXTS * 3))
+        assert detector.memo_size == len(set(SAMPLE_TEXTS))
+
+    def test_process_pool_matches_serial(self):
+        """Process pool mode returns the same codes in the same order"""
+        texts = pd.Series(SAMPLE_TEXTS * 4, index=range(100, 100 + len(SAMPLE_TEXTS) * 4))
+        # Make every text distinct so all of them go through the pool
+        texts = texts + pd.Series([f" {i}" for i in range(len(texts))], index=texts.index)
+
+        serial = LanguageDetector(n_workers=1).detect(texts)
+        parallel = LanguageDetector(n_workers=2, chunk_size=5, parallel_threshold=0).detect(texts)
+
+        assert parallel.index.equals(texts.index)
+        assert parallel.tolist() == serial.tolist()
+
+
+TRICKY_TEXTS = [
+    "Hello World!",
+    "  Visit https://example.com/x?y=1 or www.site.org now  ",
+    "<b>Bold</b> and <a href=http://x.io>link</a>\nnext line",
+    "Ünïcödé — “quotes” and emoji 🎉\ttab",
+    "\x1cseparator\u2003em space\r\n",
+    "http:/broken <unclosed tag",
+    "",
+    "[no description]",
+    "wwwXsite words",
+    np.nan,
+    None,
+    12345,
+]
+
+TRICKY_TAGS = [
+    '"cat"|"funny cats"|" Kitten "',
+    'music|"pop"|| ROCK ',
+    '"quoted one" "quoted two"',
+    'single tag',
+    '[none]',
+    '',
+    '|',
+    '"',
+    '"Ünïcödé"|www.x.com|tag!',
+    np.nan,
+]
+
+
+def _fuzz_strings(n: int, seed: int = 0) -> list:
+    """Random strings built from characters the cleaners treat specially"""
+    rng = random.Random(seed)
+    alphabet = list('abcXYZ019 |"<>/:.,!?-_\n\t') + ['http://', 'www.', 'é', '🎉', '\u2003', '[none]']
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(n)]
+
+
+class TestVectorizedTextCleaning:
+    """Vectorized cleaners produce the same output as the per-cell functions"""
+
+    @pytest.fixture
+    def processor(self):
+        return EnhancedYouTubeDataProcessor(language_workers=1)
+
+    @pytest.fixture
+    def preprocessor(self):
+        return DataPreprocessor()
+
+    def test_clean_text_equivalence(self, processor):
+        values = pd.Series(TRICKY_TEXTS + _fuzz_strings(500) + TRICKY_TEXTS)
+        expected = [processor.clean_text(v) for v in values]
+        assert clean_text_column(values).tolist() == expected
+
+    def test_split_and_clean_tags_equivalence(self, processor):
+        values = pd.Series(TRICKY_TAGS + _fuzz_strings(500, seed=1) + TRICKY_TAGS)
+        expected = [processor.split_and_clean_tags(v) for v in values]
+        assert split_and_clean_tags_column(values).tolist() == expected
+
+    def test_normalize_text_equivalence(self, preprocessor):
+        values = pd.Series(TRICKY_TEXTS + _fuzz_strings(500, seed=2))
+        expected = [preprocessor.clean_text(v) for v in values]
+        assert normalize_text_column(values).tolist() == expected
+
+    def test_parse_tags_equivalence(self, preprocessor):
+        values = pd.Series(TRICKY_TAGS + _fuzz_strings(500, seed=3) + TRICKY_TAGS)
+        expected = [preprocessor.parse_tags(v) for v in values]
+        assert parse_tags_column(values).tolist() == expected
+
+    def test_preserves_index(self):
+        values = pd.Series(["A b", "A b", None, np.nan], index=[10, 5, 7, 3], dtype=object)
+        result = clean_text_column(values)
+        assert result.index.tolist() == [10, 5, 7, 3]
+        assert result.tolist() == ["a b", "a b", "none", "nan"]
+
+
+class TestStreamingIngest:
+    """Chunked ingestion produces the same final table as the in-memory path"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = tmp_path / "CAvideos.csv"
+        make_trending_frame().to_csv(path, index=False)
+        return path
+
+    def test_streaming_matches_in_memory(self, processor, csv_path):
+        expected = processor.build_final_table(str(csv_path), 'CA')
+
+        streamed = processor.process_csv_streaming(str(csv_path), 'CA', chunksize=37)
+
+        expected = expected.sort_values('video_id').reset_index(drop=True)
+        streamed = streamed.sort_values('video_id').reset_index(drop=True)
+        pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+    @pytest.mark.parametrize("chunksize", [2, 37])
+    def test_same_day_duplicates_match_in_memory(self, processor, tmp_path, chunksize):
+        raw = make_trending_frame(n_videos=20, seed=4)
+        # Relist every third row on the same day with later stats, spread through the file
+        duplicates = raw.iloc[::3].copy()
+        duplicates['views'] += 1
+        raw = pd.concat([raw, duplicates]).sample(frac=1, random_state=0).reset_index(drop=True)
+        path = tmp_path / "CAvideos.csv"
+        raw.to_csv(path, index=False)
+
+        expected = processor.build_final_table(str(path), 'CA')
+        streamed = processor.build_final_table(str(path), 'CA', chunksize=chunksize)
+
+        expected = expected.sort_values('video_id').reset_index(drop=True)
+        streamed = streamed.sort_values('video_id').reset_index(drop=True)
+        pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+        assert (expected['longest_consecutive_streak_days'] <= expected['days_trending_unique']).all()
+
+    def test_aggregator_keeps_one_row_per_video(self, processor, csv_path):
+        aggregator = TrendAggregator(processor.LATEST_STATS_COLUMNS)
+        for chunk in pd.read_csv(csv_path, chunksize=50):
+            aggregator.update(processor.process_dataframe(chunk, 'CA'))
+
+        raw = pd.read_csv(csv_path)
+        latest = aggregator.latest_rows()
+        assert aggregator.rows_seen == len(raw)
+        assert latest['video_id'].is_unique
+        assert len(latest) == raw['video_id'].nunique()
+        assert aggregator.trend_features()['days_trending_unique'].sum() == len(
+            raw[['video_id', 'trending_date']].drop_duplicates()
+        )
+
+    def test_aggregator_merges_out_of_order_days(self, processor):
+        raw = make_trending_frame(n_videos=1, seed=2).iloc[[0] * 6].reset_index(drop=True)
+        raw['trending_date'] = ['18.05.01', '18.01.01', '18.02.01', '18.07.01', '18.04.01', '18.02.01']
+
+        aggregator = TrendAggregator(processor.LATEST_STATS_COLUMNS)
+        for start in range(0, len(raw), 2):
+            aggregator.update(processor.process_dataframe(raw.iloc[start:start + 2].copy(), 'CA'))
+
+        features = aggregator.trend_features().iloc[0]
+        assert features['days_trending_unique'] == 5
+        assert features['longest_consecutive_streak_days'] == 2
+        assert features['first_trend_date'] == pd.Timestamp('2018-01-01')
+        assert features['last_trend_date'] == pd.Timestamp('2018-01-07')
+        assert len(aggregator._runs) == 3
+
+
+class TestMultiFileIngest:
+    """Concurrent processing of several country files into one table"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+
+    def test_country_from_filename(self):
+        assert country_from_filename("data/raw/CAvideos.csv") == "CA"
+        assert country_from_filename(Path("usvideos.csv")) == "US"
+
+    def test_build_final_tables_merges_countries(self, processor, tmp_path):
+        ca = make_trending_frame(n_videos=40, seed=1)
+        us = make_trending_frame(n_videos=60, seed=2)  # Shares vid00000000..39 with CA
+        ca.to_csv(tmp_path / "CAvideos.csv", index=False)
+        us.to_csv(tmp_path / "USvideos.csv", index=False)
+
+        merged = processor.build_final_tables(
+            [tmp_path / "CAvideos.csv", tmp_path / "USvideos.csv"], max_workers=2
+        )
+
+        assert merged['video_id'].is_unique
+        assert set(merged['video_id']) == set(ca['video_id']) | set(us['video_id'])
+        assert set(merged['country']) <= {"CA", "US"}
+        only_us = merged[~merged['video_id'].isin(ca['video_id'])]
+        assert (only_us['country'] == "US").all()
+
+    def test_merge_keeps_most_recent_country(self, processor):
+        ca = pd.DataFrame({'video_id': ['a', 'b'], 'country': ['CA', 'CA'],
+                           'last_trend_date': pd.to_datetime(['2018-01-05', '2018-01-01']),
+                           'views': [10, 10]})
+        us = pd.DataFrame({'video_id': ['a', 'b'], 'country': ['US', 'US'],
+                           'last_trend_date': pd.to_datetime(['2018-01-02', '2018-01-03']),
+                           'views': [99, 99]})
+
+        merged = processor.merge_final_tables([ca, us]).set_index('video_id')
+
+        assert merged.loc['a', 'country'] == 'CA'
+        assert merged.loc['b', 'country'] == 'US'
+
+
+class TestIncrementalIngest:
+    """Upsert-based SQL updates and vector sync planning"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+
+    def _final_table(self, processor, raw):
+        processed = processor.process_dataframe(raw.copy(), 'CA')
+        return processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+
+    def test_upsert_merges_daily_drop(self, processor):
+        raw = make_trending_frame(n_videos=30, seed=4)
+        dates = pd.to_datetime(raw['trending_date'], format='%y.%d.%m')
+        history, drop = raw[dates < dates.max()], raw[dates == dates.max()].copy()
+        new_video = drop.iloc[[0]].assign(video_id='brandnew000', views=1)
+        drop = pd.concat([drop, new_video], ignore_index=True)
+
+        processor.create_sql_database(self._final_table(processor, history))
+        before = processor.fetch_videos(history['video_id'].unique().tolist()).set_index('video_id')
+        processor.create_sql_database(self._final_table(processor, drop), incremental=True)
+
+        with sqlite3.connect(processor.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        assert count == history['video_id'].nunique() + len(set(drop['video_id']) - set(history['video_id']))
+
+        after = processor.fetch_videos(drop['video_id'].unique().tolist()).set_index('video_id')
+        latest = drop.drop_duplicates('video_id', keep='last').set_index('video_id')
+        for video_id in after.index:
+            assert after.loc[video_id, 'views'] == latest.loc[video_id, 'views']
+            if video_id in before.index:
+                assert after.loc[video_id, 'first_trend_date'] == before.loc[video_id, 'first_trend_date']
+                assert after.loc[video_id, 'last_trend_date'] > before.loc[video_id, 'last_trend_date']
+
+    @pytest.mark.parametrize("record_trend_days", [True, False])
+    def test_upsert_adds_adjacent_trending_day(self, tmp_path, record_trend_days):
+        processor = EnhancedYouTubeDataProcessor(
+            db_path=str(tmp_path / "test.db"), language_workers=1, record_trend_days=record_trend_days
+        )
+        row = make_trending_frame(n_videos=1, seed=4).iloc[[0]]
+        history = pd.concat([row] * 3, ignore_index=True)
+        history['trending_date'] = ['18.01.01', '18.02.01', '18.03.01']
+        delta = row.assign(trending_date='18.04.01', views=row['views'] + 10)
+
+        for raw, incremental in [(history, False), (delta, True)]:
+            processed = processor.process_dataframe(raw.copy(), 'CA')
+            if processor.trend_days:
+                processor.trend_days.write(processed)
+            final = processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+            processor.create_sql_database(final, incremental=incremental)
+
+        video = processor.fetch_videos(row['video_id'].tolist()).iloc[0]
+        assert video['days_trending_unique'] == 4
+        assert video['longest_consecutive_streak_days'] == 4
+        assert pd.Timestamp(video['last_trend_date']) == pd.Timestamp('2018-01-04')
+
+    def test_sync_plan_embeds_only_new_or_changed(self, tmp_path):
+        tracker = VectorSyncTracker(str(tmp_path / "sync.db"))
+        docs = [{'id': f"v{i}", 'text': f"text {i}", 'metadata': {}} for i in range(5)]
+        tracker.mark_synced(docs)
+
+        updated = [dict(docs[0]), dict(docs[1], text="changed"), {'id': "v9", 'text': "new", 'metadata': {}}]
+        plan = tracker.plan(updated)
+
+        assert [d['id'] for d in plan['embed']] == ["v1", "v9"]
+        assert [d['id'] for d in plan['payload_only']] == ["v0"]
+
+        tracker.mark_synced(plan['embed'])
+        assert tracker.plan(updated)['embed'] == []
+
+        tracker.reset()
+        assert len(tracker.plan(updated)['embed']) == 3
+
+
+def _reference_vector_searchable_text(row):
+    """The original row-wise builder of prepare_for_vector_db"""
+    parts = []
+    parts.append(f"Title: {row['title']}")
+    parts.append(f"Channel: {row['channel_title']}")
+    parts.append(f"Category: {row['category_name']}")
+    if row['tags'] and row['tags'] != '':
+        parts.append(f"Tags: {row['tags']}")
+    if row['description'] and row['description'] != '[no description]':
+        parts.append(f"Description: {row['description'][:300]}")
+    return " | ".join(parts)
+
+
+def _reference_vector_documents(df):
+    """The original iterrows builder of create_vector_documents"""
+    documents = []
+    for _, row in df.iterrows():
+        tags_list = []
+        if row['tags'] and row['tags'] != '':
+            tags_list = [tag.strip() for tag in row['tags'].split() if tag.strip()]
+        documents.append({
+            'id': row['video_id'],
+            'text': row['searchable_text'],
+            'metadata': {
+                'video_id': row['video_id'],
+                'title': row['title'],
+                'channel': row['channel_title'],
+                'category': row['category_name'],
+                'category_id': int(row['category_id']),
+                'country': row['country'],
+                'language': row['language'],
+                'tags': tags_list,
+                'views': int(row['views']),
+                'likes': int(row['likes']),
+                'comment_count': int(row['comment_count']),
+                'publish_time': str(row['publish_time']),
+                'first_trend_date': str(row['first_trend_date']),
+                'last_trend_date': str(row['last_trend_date']),
+                'days_trending_unique': int(row['days_trending_unique']),
+                'longest_consecutive_streak_days': int(row['longest_consecutive_streak_days']),
+                'description': row['description'][:500] if row['description'] != '[no description]' else '',
+            }
+        })
+    return documents
+
+
+class TestDocumentBuilders:
+    """Columnar document builders match the original iterrows loops"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+
+    @pytest.fixture
+    def vector_df(self, processor):
+        processed = processor.process_dataframe(make_trending_frame(seed=5), 'CA')
+        final = processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+        final.loc[final.index[0], 'description'] = "x" * 800
+        return processor.prepare_for_vector_db(final)
+
+    def test_vector_documents_match_iterrows(self, processor, vector_df):
+        documents = processor.create_vector_documents(vector_df)
+
+        assert documents == _reference_vector_documents(vector_df)
+        assert all(type(doc['metadata']['views']) is int for doc in documents)
+
+    def test_streaming_batches_match_full_build(self, processor, vector_df):
+        streamed = processor.iter_vector_documents(vector_df, batch_size=7)
+
+        assert not isinstance(streamed, list)
+        assert list(streamed) == processor.create_vector_documents(vector_df)
+        assert list(iter_vector_documents(vector_df.iloc[:0])) == []
+
+    def test_preprocessed_documents(self):
+        df = pd.DataFrame({
+            'video_id': ['a', 'b'],
+            'searchable_text': ['Title: a', 'Title: b'],
+            'title': ['a', 'b'],
+            'category_id': [10.0, 24.0],
+            'tags_list': [['x', 'y'], []],
+            'views': [5, 6],
+            'trending_date': pd.to_datetime(['2018-01-02', '2018-01-03']),
+        })
+
+        documents = DataPreprocessor().to_documents(df)
+
+        assert documents[0] == {
+            'id': 'a',
+            'text': 'Title: a',
+            'metadata': {
+                'title': 'a', 'channel': '', 'category': 'Unknown', 'category_id': 10,
+                'tags': ['x', 'y'], 'views': 5, 'likes': 0, 'dislikes': 0, 'comment_count': 0,
+                'trending_date': '2018-01-02 00:00:00',
+            }
+        }
+        assert [doc['id'] for doc in iter_preprocessed_documents(df.drop(columns='video_id'), batch_size=1)] == ['0', '1']
+
+
+    def test_generate_embeddings_uses_process_pool_above_threshold(self, tmp_path):
+        class PoolModel:
+            def __init__(self):
+                self.calls = []
+
+            def encode(self, texts, batch_size=32, show_progress=True):
+                self.calls.append(('encode', batch_size))
+                return np.zeros((len(texts), 4), dtype=np.float32)
+
+            def encode_multiprocess(self, texts, batch_size=32, show_progress=True):
+                self.calls.append(('encode_multiprocess', batch_size))
+                return np.zeros((len(texts), 4), dtype=np.float32)
+
+        model = PoolModel()
+        processor = EnhancedYouTubeDataProcessor(
+            db_path=str(tmp_path / "test.db"), embedding_model=model, language_workers=1
+        )
+        documents = [{'text': f"video {i}"} for i in range(5)]
+
+        assert processor.generate_embeddings(documents, batch_size=8, multiprocess_threshold=6).shape == (5, 4)
+        assert processor.generate_embeddings(documents, batch_size=8, multiprocess_threshold=5).shape == (5, 4)
+        assert model.calls == [('encode', 8), ('encode_multiprocess', 8)]
+
+
+class TestSearchableText:
+    """Column-wise searchable_text builders match the row-wise apply() versions"""
+
+    def test_vector_searchable_text(self, tmp_path):
+        processor = EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+        processed = processor.process_dataframe(make_trending_frame(seed=8), 'US')
+        final = processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+        final.loc[final.index[:3], 'description'] = ["é" * 400, "", "[no description]"]
+        final.loc[final.index[:2], 'tags'] = ["", "a b"]
+
+        expected = final.apply(_reference_vector_searchable_text, axis=1)
+
+        pd.testing.assert_series_equal(vector_searchable_text(final), expected, check_dtype=False)
+        prepared = processor.prepare_for_vector_db(final)
+        assert 'searchable_text' not in final.columns
+        assert prepared['searchable_text'].tolist() == expected.tolist()
+
+    def test_preprocessed_searchable_text(self):
+        df = pd.DataFrame({
+            'title': ['a', None, 'c', None],
+            'channel_title': ['ch', 'ch2', None, None],
+            'category_name': ['Music', 'Gaming', 'Unknown', None],
+            'tags_list': [[f"t{i}" for i in range(12)], [], ['x'], []],
+            'description': ['d' * 250, None, 'short', None],
+        }, index=[5, 3, 9, 1], dtype=object)
+        preprocessor = DataPreprocessor()
+
+        expected = df.apply(preprocessor.create_searchable_text, axis=1)
+
+        pd.testing.assert_series_equal(preprocessed_searchable_text(df), expected, check_dtype=False)
+        assert preprocessed_searchable_text(df.drop(columns=['tags_list', 'description'])).tolist() == \
+            df.drop(columns=['tags_list', 'description']).apply(preprocessor.create_searchable_text, axis=1).tolist()
+        assert preprocessed_searchable_text(df).iloc[3] == ''
+
+
+class TestBulkLoad:
+    """Single-transaction SQLite bulk load"""
+
+    def test_create_sql_database_reports_and_indexes(self, tmp_path):
+        processor = EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+        processed = processor.process_dataframe(make_trending_frame(seed=6), 'CA')
+        final = processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+
+        report = processor.create_sql_database(final)
+
+        assert report['rows'] == len(final)
+        assert report['rows_per_second'] > 0
+        with sqlite3.connect(processor.db_path) as conn:
+            indexes = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'videos'")}
+            analyzed = conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'videos'").fetchone()[0]
+        assert {"idx_videos_channel_views", "idx_videos_last_trend_date"} <= indexes
+        assert analyzed > 0
+
+    def test_failed_load_rolls_back(self, tmp_path):
+        loader = SQLiteBulkLoader(str(tmp_path / "test.db"))
+        create_sql = "CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY, value TEXT)"
+        insert_sql = "INSERT INTO t (id, value) VALUES (?, ?)"
+        loader.load("t", create_sql, insert_sql, [(1, "a"), (2, "b")])
+
+        with pytest.raises(sqlite3.IntegrityError):
+            loader.load("t", create_sql, insert_sql, [(3, "c"), (1, "duplicate")], replace=False)
+
+        with sqlite3.connect(loader.db_path) as conn:
+            assert conn.execute("SELECT id, value FROM t ORDER BY id").fetchall() == [(1, "a"), (2, "b")]
+
+    def test_loads_keep_durable_journal(self, tmp_path):
+        loader = SQLiteBulkLoader(str(tmp_path / "test.db"))
+        create_sql = "CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY, value TEXT)"
+        insert_sql = "INSERT OR REPLACE INTO t (id, value) VALUES (?, ?)"
+        journal_mode = "PRAGMA journal_mode"
+
+        loader.load("t", create_sql, insert_sql, [(1, "a")])
+        with sqlite3.connect(loader.db_path) as conn:
+            assert conn.execute(journal_mode).fetchone()[0] == "wal"
+
+        loader.load("t", create_sql, insert_sql, [(2, "b")], replace=False)
+        with sqlite3.connect(loader.db_path) as conn:
+            assert conn.execute(journal_mode).fetchone()[0] == "wal"
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+
+
+class TestQueryIndexes:
+    """Indexes cover the SQL agent's common query patterns"""
+
+    def test_query_patterns_use_indexes(self, tmp_path):
+        processor = EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+        processed = processor.process_dataframe(make_trending_frame(n_videos=200, seed=7), 'CA')
+        processor.create_sql_database(
+            processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+        )
+
+        results = check_query_plans(processor.db_path)
+        assert all(result['indexed'] for result in results.values()), {
+            name: result['plan'] for name, result in results.items()
+        }
+
+        drop_indexes(processor.db_path)
+        assert not check_query_plans(processor.db_path)['top_videos_by_likes']['indexed']
+
+        create_indexes(processor.db_path)
+        assert check_query_plans(processor.db_path)['top_videos_by_likes']['indexed']
+
+
+class TestFullTextSearch:
+    """FTS5 keyword search over the videos table"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(db_path=str(tmp_path / "test.db"), language_workers=1)
+
+    def _final(self, rows):
+        defaults = {
+            'description': 'no description', 'tags': '', 'category_id': 20, 'category_name': 'Gaming',
+            'country': 'CA', 'language': 'English', 'publish_time': '2018-01-01 00:00:00',
+            'first_trend_date': '2018-01-02 00:00:00', 'last_trend_date': '2018-01-03 00:00:00',
+            'days_trending_unique': 1, 'longest_consecutive_streak_days': 1,
+            'views': 100, 'likes': 10, 'comment_count': 1,
+        }
+        return pd.DataFrame([{**defaults, **row} for row in rows])
+
+    def test_search_ranks_title_matches_first(self, processor):
+        processor.create_sql_database(self._final([
+            {'video_id': 'a', 'title': 'Fortnite Battle Royale highlights', 'channel_title': 'Ninja'},
+            {'video_id': 'b', 'title': 'Cooking pasta', 'channel_title': 'Chef',
+             'description': 'I played fortnite after dinner'},
+            {'video_id': 'c', 'title': 'Minecraft build', 'channel_title': 'Builder'},
+        ]))
+
+        results = processor.search_text("fortnite")
+        assert [r['video_id'] for r in results] == ['a', 'b']
+        assert results[0]['score'] > results[1]['score']
+        assert [r['video_id'] for r in processor.search_text("ninja")] == ['a']
+        assert processor.search_text('"unbalanced (quote') == []
+
+    def test_incremental_upsert_keeps_index_in_sync(self, processor):
+        processor.create_sql_database(self._final([
+            {'video_id': 'a', 'title': 'Old title', 'channel_title': 'Chan'},
+        ]))
+        processor.create_sql_database(self._final([
+            {'video_id': 'a', 'title': 'Renamed video', 'channel_title': 'Chan',
+             'last_trend_date': '2018-01-04 00:00:00'},
+            {'video_id': 'n', 'title': 'Brand new upload', 'channel_title': 'Other'},
+        ]), incremental=True)
+
+        assert processor.search_text("old") == []
+        assert [r['video_id'] for r in processor.search_text("renamed")] == ['a']
+        assert [r['video_id'] for r in search_text(processor.db_path, "brand new")] == ['n']
+        with sqlite3.connect(processor.db_path) as conn:
+            conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('integrity-check')")
+
+    def test_match_query_quotes_terms(self):
+        assert to_match_query('AC/DC "live"  OR') == '"AC/DC" """live""" "OR"'
+        assert to_match_query("   ") == ""
+
+
+class TestParquetSnapshot:
+    """Partitioned Parquet snapshots written during ingest"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(
+            db_path=str(tmp_path / "test.db"), language_workers=1, snapshot_dir=str(tmp_path / "processed")
+        )
+
+    def test_snapshot_round_trip(self, processor, tmp_path):
+        raw = make_trending_frame(seed=8)
+        raw.to_csv(tmp_path / "CAvideos.csv", index=False)
+
+        sql_df, _, _ = processor.process_csv_file(str(tmp_path / "CAvideos.csv"), 'CA', prepare_vector=False)
+
+        final = processor.snapshot.load_final(columns=processor.VIDEOS_TABLE_COLUMNS)
+        expected = sql_df[processor.VIDEOS_TABLE_COLUMNS].sort_values('video_id').reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            final.sort_values('video_id').reset_index(drop=True), expected, check_dtype=False
+        )
+
+        daily = processor.snapshot.load_daily(columns=['video_id', 'trending_date', 'views'])
+        assert len(daily) == len(raw)
+        assert list(daily.columns) == ['video_id', 'trending_date', 'views']
+
+        month = daily['trending_date'].dt.strftime('%Y-%m').iloc[0]
+        january = processor.snapshot.load_daily(columns=['trending_date'], country='CA', month=month)
+        assert (january['trending_date'].dt.strftime('%Y-%m') == month).all()
+        assert len(processor.snapshot.load_daily(country='US')) == 0
+
+        # Re-running replaces the country's partitions instead of duplicating them
+        processor.process_csv_file(str(tmp_path / "CAvideos.csv"), 'CA', chunksize=41, prepare_vector=False)
+        assert len(processor.snapshot.load_daily(columns=['video_id'])) == len(raw)
+        assert len(processor.snapshot.load_final(columns=['video_id'])) == len(expected)
+
+    def test_incremental_refreshes_final_snapshot(self, processor):
+        raw = make_trending_frame(n_videos=20, seed=9)
+        dates = pd.to_datetime(raw['trending_date'], format='%y.%d.%m')
+        history, drop = raw[dates < dates.max()], raw[dates == dates.max()]
+
+        for part, incremental in [(history, False), (drop, True)]:
+            processed = processor.process_dataframe(part.copy(), 'CA')
+            final = processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+            processor.export_final_table(final, prepare_vector=False, incremental=incremental)
+
+        snapshot = processor.snapshot.load_final(columns=['video_id', 'last_trend_date'])
+        assert len(snapshot) == raw['video_id'].nunique()
+        assert snapshot['last_trend_date'].max() == dates.max()
+
+
+def _reference_temporal_features(df):
+    """The original groupby implementation of calculate_temporal_features, over distinct trending days"""
+    df_sorted = df.drop_duplicates(['video_id', 'trending_date']).sort_values(by=['video_id', 'trending_date'])
+    df_sorted['date_diff'] = df_sorted.groupby('video_id')['trending_date'].diff().dt.days
+    df_sorted['new_streak'] = (df_sorted['date_diff'] > 1).cumsum()
+    streak_lengths = df_sorted.groupby(['video_id', 'new_streak']).size()
+    longest_streaks = streak_lengths.groupby('video_id').max().rename('longest_consecutive_streak_days')
+    agg_df = df.groupby('video_id').agg(
+        first_trend_date=('trending_date', 'min'),
+        last_trend_date=('trending_date', 'max'),
+        days_trending_unique=('trending_date', 'nunique')
+    )
+    final_agg_df = agg_df.join(longest_streaks)
+    final_agg_df['longest_consecutive_streak_days'] = (
+        final_agg_df['longest_consecutive_streak_days'].fillna(1).astype(int)
+    )
+    return final_agg_df
+
+
+def _random_trend_rows(rng, n_rows):
+    """Random (video_id, trending_date) rows with repeats, gaps and same-day duplicates"""
+    n_videos = int(rng.integers(1, max(2, n_rows // 2)))
+    return pd.DataFrame({
+        'video_id': [f"v{i}" for i in rng.integers(0, n_videos, size=n_rows)],
+        'trending_date': pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 20, size=n_rows), unit='D'),
+    })
+
+
+class TestTemporalFeatures:
+    """The single-pass kernel matches the groupby implementation"""
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_groupby_implementation(self, seed):
+        rng = np.random.default_rng(seed)
+        df = _random_trend_rows(rng, int(rng.integers(1, 300)))
+
+        pd.testing.assert_frame_equal(
+            trend_features(df['video_id'], df['trending_date']),
+            _reference_temporal_features(df),
+            check_dtype=False,
+            check_index_type=False
+        )
+
+    def test_streaks(self):
+        dates = pd.to_datetime(['2018-01-01', '2018-01-02', '2018-01-03', '2018-01-05', '2018-01-06', '2018-01-01'])
+        df = pd.DataFrame({'video_id': ['a'] * 5 + ['b'], 'trending_date': dates})
+
+        result = trend_features(df['video_id'], df['trending_date'])
+
+        assert result.loc['a', 'longest_consecutive_streak_days'] == 3
+        assert result.loc['a', 'days_trending_unique'] == 5
+        assert result.loc['b', 'longest_consecutive_streak_days'] == 1
+        assert result.loc['a', 'last_trend_date'] == pd.Timestamp('2018-01-06')
+
+    def test_same_day_duplicates_count_once(self):
+        dates = pd.to_datetime(['2018-01-01', '2018-01-02', '2018-01-02', '2018-01-03'])
+        df = pd.DataFrame({'video_id': ['a'] * 4, 'trending_date': dates})
+
+        result = trend_features(df['video_id'], df['trending_date'])
+
+        assert result.loc['a', 'days_trending_unique'] == 3
+        assert result.loc['a', 'longest_consecutive_streak_days'] == 3
+
+
+class TestTypedLoading:
+    """Schema-driven CSV loading"""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = tmp_path / "CAvideos.csv"
+        make_trending_frame(seed=10).to_csv(path, index=False)
+        return path
+
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_columns_are_typed(self, csv_path, engine):
+        df = read_trending_csv(csv_path, engine=engine)
+
+        assert isinstance(df['channel_title'].dtype, pd.CategoricalDtype)
+        assert df['category_id'].dtype == np.int16
+        assert df['comments_disabled'].dtype == bool
+        assert df['views'].dtype.itemsize <= 4
+        assert pd.api.types.is_datetime64_any_dtype(df['trending_date'])
+        assert df['publish_time'].dt.tz is not None
+        assert df['description'].isna().any()  # Missing text stays missing
+
+    def test_usecols_and_chunks(self, csv_path):
+        chunks = list(read_trending_csv(csv_path, usecols=PROCESSOR_COLUMNS, chunksize=100))
+        combined = concat_typed(chunks)
+
+        assert set(combined.columns) == set(PROCESSOR_COLUMNS)
+        assert isinstance(combined['channel_title'].dtype, pd.CategoricalDtype)
+        assert len(combined) == len(pd.read_csv(csv_path))
+
+    def test_memory_report(self, csv_path):
+        df = read_trending_csv(csv_path)
+        report = memory_report(df)
+
+        assert set(report.index) == set(df.columns)
+        assert report['bytes'].sum() == df.memory_usage(deep=True, index=False).sum()
+        assert report['share'].sum() == pytest.approx(1.0)
+
+
+class TestParallelLoading:
+    """Concurrent multi-file loading in DataLoader"""
+
+    @pytest.fixture
+    def raw_dir(self, tmp_path):
+        for i, country in enumerate(["CA", "US", "GB"]):
+            make_trending_frame(n_videos=30 + 10 * i, seed=20 + i).to_csv(tmp_path / f"{country}videos.csv", index=False)
+        (tmp_path / "XXvideos.csv").write_bytes(b"\x00\x01 not a csv")
+        return tmp_path
+
+    def test_arrow_matches_pandas_reader(self, raw_dir):
+        loader = DataLoader()
+        files = sorted(raw_dir.glob("??videos.csv"))
+
+        arrow = loader._load_files_arrow(files, max_workers=3)
+
+        frames = []
+        for f in files:
+            if f.name.startswith("XX"):
+                continue
+            df = read_trending_csv(f, engine='c')
+            frames.append(df.assign(source_file=pd.Categorical([f.name] * len(df))))
+        serial = concat_typed(frames)
+
+        pd.testing.assert_frame_equal(arrow, serial, check_dtype=False, check_categorical=False)
+        assert isinstance(arrow['channel_title'].dtype, pd.CategoricalDtype)
+        assert isinstance(arrow['source_file'].dtype, pd.CategoricalDtype)
+
+    def test_reports_timing_and_failures(self, raw_dir):
+        loader = DataLoader()
+
+        combined = loader.load_all_csv_files(raw_dir, max_workers=4)
+
+        report = {entry['file']: entry for entry in loader.load_report}
+        assert set(report) == {"CAvideos.csv", "USvideos.csv", "GBvideos.csv", "XXvideos.csv"}
+        assert report["XXvideos.csv"]['error'] is not None
+        assert all(report[name]['error'] is None and report[name]['seconds'] >= 0
+                   for name in ("CAvideos.csv", "USvideos.csv", "GBvideos.csv"))
+        assert len(combined) == sum(entry['rows'] for entry in loader.load_report)
+        assert set(combined['source_file']) == {"CAvideos.csv", "USvideos.csv", "GBvideos.csv"}
+
+
+class TestReservoirSampling:
+    """Streaming reservoir sampling in DataLoader.get_sample_data"""
+
+    @staticmethod
+    def _chunks(df, size):
+        return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+    def test_sample_is_independent_of_chunking(self):
+        df = pd.DataFrame({'row': np.arange(5000), 'stratum': np.arange(5000) % 3})
+
+        samples = []
+        for size in (7, 500, 5000):
+            sampler = ReservoirSampler(100, seed=1)
+            for chunk in self._chunks(df, size):
+                sampler.update(chunk)
+            samples.append(sampler.sample())
+
+        assert len(samples[0]) == 100
+        assert samples[0]['row'].is_unique
+        for other in samples[1:]:
+            pd.testing.assert_frame_equal(samples[0], other)
+
+    def test_rows_are_sampled_uniformly(self):
+        df = pd.DataFrame({'row': np.arange(50)})
+        hits = np.zeros(50)
+        for seed in range(2000):
+            sampler = ReservoirSampler(10, seed=seed)
+            for chunk in self._chunks(df, 8):
+                sampler.update(chunk)
+            hits[sampler.sample()['row'].to_numpy()] += 1
+
+        # Every row has inclusion probability 10/50
+        assert np.allclose(hits / 2000, 0.2, atol=0.05)
+
+    def test_stratified_sample_is_proportional(self):
+        df = pd.DataFrame({'row': np.arange(1000), 'country': ['US'] * 700 + ['CA'] * 290 + ['GB'] * 10})
+        sampler = ReservoirSampler(100, stratify_by='country', seed=3)
+        for chunk in self._chunks(df.sample(frac=1.0, random_state=0), 64):
+            sampler.update(chunk)
+
+        counts = sampler.sample()['country'].value_counts()
+        assert counts.to_dict() == {'US': 70, 'CA': 29, 'GB': 1}
+
+    def test_get_sample_data_streams_files(self, tmp_path):
+        for i, country in enumerate(["CA", "US"]):
+            make_trending_frame(n_videos=40, seed=30 + i).to_csv(tmp_path / f"{country}videos.csv", index=False)
+        loader = DataLoader()
+
+        sample = loader.get_sample_data(50, stratify_by='country', directory=tmp_path, chunksize=25)
+        again = loader.get_sample_data(50, stratify_by='country', directory=tmp_path, chunksize=100)
+
+        assert len(sample) == 50
+        assert set(sample['country']) == {"CA", "US"}
+        assert isinstance(sample['channel_title'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(sample, again, check_categorical=False)
+
+
+class TestTrendDays:
+    """Per-day fact table written during ingest and its time-series helpers"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(
+            db_path=str(tmp_path / "test.db"), language_workers=1, record_trend_days=True
+        )
+
+    @pytest.fixture
+    def raw(self, tmp_path):
+        raw = make_trending_frame(n_videos=40, seed=12)
+        raw.to_csv(tmp_path / "CAvideos.csv", index=False)
+        return raw
+
+    @staticmethod
+    def _days(raw):
+        return raw.assign(trending_date=pd.to_datetime(raw['trending_date'], format='%y.%d.%m'))
+
+    def test_ingest_writes_every_day_once(self, processor, raw, tmp_path):
+        csv_path = str(tmp_path / "CAvideos.csv")
+        processor.process_csv_file(csv_path, 'CA', prepare_vector=False, chunksize=50)
+        processor.process_csv_file(csv_path, 'CA', prepare_vector=False, incremental=True)
+        raw = self._days(raw)
+
+        with sqlite3.connect(processor.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM video_trend_days").fetchone()[0]
+        assert count == len(raw.drop_duplicates(['video_id', 'trending_date']))
+
+        video_id = raw['video_id'].value_counts().index[0]
+        series = processor.trend_days.video_series(video_id)
+        expected = raw[raw['video_id'] == video_id].sort_values('trending_date')
+        assert series['trending_date'].tolist() == expected['trending_date'].tolist()
+        assert series['views'].tolist() == expected['views'].tolist()
+        assert series['views_gained'].iloc[1:].tolist() == expected['views'].diff().iloc[1:].tolist()
+        assert set(series['country']) == {'CA'}
+
+    def test_window_queries(self, processor, raw):
+        store = processor.trend_days
+        store.write(processor.process_dataframe(raw.copy(), 'CA'))
+        raw = self._days(raw)
+        day = raw['trending_date'].iloc[0]
+        start, end = pd.Timestamp("2018-01-05"), pd.Timestamp("2018-01-12")
+
+        on_day = store.trending_on(day, country='CA')
+        assert set(on_day['video_id']) == set(raw.loc[raw['trending_date'] == day, 'video_id'])
+        assert on_day['views'].is_monotonic_decreasing
+
+        window = raw[raw['trending_date'].between(start, end)]
+        growth = store.views_growth(start, end, limit=None).set_index('video_id')
+        expected = window.groupby('video_id')['views'].agg(lambda v: v.max() - v.min())
+        assert growth['views_gained'].sort_index().tolist() == expected.sort_index().tolist()
+
+        totals = store.daily_totals(start, end, country='CA')
+        assert totals['views'].tolist() == window.groupby('trending_date')['views'].sum().tolist()
+
+    def test_queries_use_indexes(self, processor):
+        store = processor.trend_days
+        store.ensure_table()
+        queries = [
+            "SELECT * FROM video_trend_days WHERE video_id = 'x'",
+            "SELECT * FROM video_trend_days WHERE trending_date = '2018-01-01 00:00:00' ORDER BY views DESC",
+            "SELECT trending_date, SUM(views) FROM video_trend_days WHERE country = 'CA' "
+            "AND trending_date BETWEEN '2018-01-01' AND '2018-02-01' GROUP BY trending_date",
+        ]
+        with sqlite3.connect(processor.db_path) as conn:
+            for sql in queries:
+                steps = explain(conn, sql)
+                assert not any(step == "SCAN video_trend_days" for step in steps), steps
+
+
+class TestMaterializedAggregates:
+    """Aggregate tables built with the videos table and refreshed on upserts"""
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        return EnhancedYouTubeDataProcessor(
+            db_path=str(tmp_path / "test.db"), language_workers=1, record_trend_days=True
+        )
+
+    @staticmethod
+    def _final_table(processor, raw, country='CA'):
+        processed = processor.process_dataframe(raw.copy(), country)
+        processor.trend_days.write(processed)
+        return processor.create_final_dataframe(processed, processor.calculate_temporal_features(processed))
+
+    @staticmethod
+    def _assert_fresh(db_path):
+        """Every aggregate table equals its query over the current source table"""
+        with sqlite3.connect(db_path) as conn:
+            for name, spec in AGGREGATES.items():
+                keys = ', '.join(spec['keys'])
+                source = 'videos' if spec['source'] == 'videos' else 'video_trend_days'
+                measures = ', '.join(f"{expr} AS {col}" for col, expr in spec['measures'].items())
+                stored = pd.read_sql_query(f"SELECT * FROM videos_{name} ORDER BY {keys}", conn)
+                expected = pd.read_sql_query(
+                    f"SELECT {keys}, {measures} FROM {source} GROUP BY {keys} ORDER BY {keys}", conn
+                )
+                pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+
+    def test_full_build_matches_pandas(self, processor):
+        final = self._final_table(processor, make_trending_frame(n_videos=50, seed=14))
+
+        processor.create_sql_database(final)
+
+        self._assert_fresh(processor.db_path)
+        with sqlite3.connect(processor.db_path) as conn:
+            stats = pd.read_sql_query("SELECT * FROM videos_category_stats", conn).set_index('category_name')
+        expected = final.groupby('category_name')['views'].agg(['count', 'sum'])
+        assert stats['videos'].sort_index().tolist() == expected['count'].sort_index().tolist()
+        assert stats['total_views'].sort_index().tolist() == expected['sum'].sort_index().tolist()
+
+    def test_incremental_refresh(self, processor):
+        raw = make_trending_frame(n_videos=40, seed=15)
+        dates = pd.to_datetime(raw['trending_date'], format='%y.%d.%m')
+        history, drop = raw[dates < dates.max()], raw[dates == dates.max()].copy()
+        # One video moves to another channel and category, one video is new
+        drop.iloc[0, drop.columns.get_loc('channel_title')] = "Renamed channel"
+        drop.iloc[0, drop.columns.get_loc('category_id')] = 43
+        drop = pd.concat([drop, drop.iloc[[1]].assign(video_id='brandnew000')], ignore_index=True)
+
+        processor.create_sql_database(self._final_table(processor, history))
+        processor.create_sql_database(self._final_table(processor, drop), incremental=True)
+
+        self._assert_fresh(processor.db_path)
+
+    def test_incremental_refresh_with_null_keys(self, processor):
+        raw = make_trending_frame(n_videos=30, seed=17)
+        dates = pd.to_datetime(raw['trending_date'], format='%y.%d.%m')
+        history = self._final_table(processor, raw[dates < dates.max()])
+        drop = self._final_table(processor, raw[dates == dates.max()])
+        video_id = drop['video_id'].iloc[0]
+        for final in (history, drop):
+            final['channel_title'] = final['channel_title'].astype(object)
+            final.loc[final['video_id'] == video_id, ['channel_title', 'category_name']] = None
+        drop['views'] += 1000
+
+        processor.create_sql_database(history)
+        processor.create_sql_database(drop, incremental=True)
+
+        self._assert_fresh(processor.db_path)
+        with sqlite3.connect(processor.db_path) as conn:
+            null_channel = conn.execute(
+                "SELECT total_views FROM videos_channel_stats WHERE channel_title IS NULL"
+            ).fetchone()[0]
+        assert null_channel == drop.loc[drop['video_id'] == video_id, 'views'].iloc[0]
+
+    def test_metadata_for_sql_agent(self, processor):
+        processor.create_sql_database(self._final_table(processor, make_trending_frame(n_videos=20, seed=16)))
+
+        metadata = aggregate_metadata(processor.db_path)
+
+        assert [entry['table'] for entry in metadata] == [f"videos_{name}" for name in AGGREGATES]
+        assert all(entry['rows'] > 0 for entry in metadata)
+        context = describe_aggregates(metadata)
+        assert "videos_channel_stats" in context and "total_views" in context
+        assert describe_aggregates([]) == ""
@@ -1,8 +1,18 @@
 """Tests for embedding models"""
 
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import numpy as np
-from src.embeddings import LocalEmbedding
+from src.embeddings import (
+    BaseEmbedding, BatchingEmbedding, LocalEmbedding, EmbeddingCache, OnnxEmbedding, OpenAIEmbedding,
+    QueryCacheEmbedding
+)
+from src.embeddings.rate_limit import TokenBucket, backoff_delay
 
 
 class TestLocalEmbedding:
@@ -51,3 +61,444 @@ class TestLocalEmbedding:
         
         # Similar texts should have higher similarity
         assert sim_12 > sim_13
+    
+    def test_encode_multiprocess_matches_encode(self, embedding_model):
+        """Test that the process pool returns the in-process embeddings in input order"""
+        texts = [f"Trending video number {i} about {topic}" for i, topic in
+                 enumerate(["cats", "music", "gaming", "cooking", "news"] * 6)]
+        
+        pooled = embedding_model.encode_multiprocess(texts, show_progress=False, num_workers=2, chunk_size=7)
+        
+        assert pooled.dtype == np.float32
+        np.testing.assert_allclose(pooled, embedding_model.encode(texts, show_progress=False), atol=1e-5)
+    
+    def test_process_pool_is_reused_across_calls(self, embedding_model):
+        """Test that calls inside process_pool() share one set of workers"""
+        texts = [f"Trending video number {i}" for i in range(20)]
+        
+        with embedding_model.process_pool(num_workers=2):
+            pool = embedding_model._pool
+            first = embedding_model.encode_multiprocess(texts[:10], show_progress=False, chunk_size=5)
+            second = embedding_model.encode_multiprocess(texts[10:], show_progress=False, chunk_size=5)
+            assert embedding_model._pool is pool
+        
+        assert embedding_model._pool is None
+        np.testing.assert_allclose(
+            np.vstack([first, second]), embedding_model.encode(texts, show_progress=False), atol=1e-5
+        )
+
+
+class TestOnnxEmbedding:
+    """Test the ONNX Runtime model against the PyTorch model"""
+    
+    TEXTS = [
+        "This is a test video about cats",
+        "Gaming video tutorial",
+        "Cooking recipe for pasta with garlic, olive oil and a lot of parmesan cheese",
+        "Music concert performance | Channel: Live Nation | Tags: live, concert, tour",
+        "",
+    ]
+    
+    @pytest.fixture(scope="class")
+    def torch_embeddings(self):
+        """Reference embeddings from sentence-transformers"""
+        return LocalEmbedding(model_name="all-MiniLM-L6-v2").encode(self.TEXTS, show_progress=False)
+    
+    @pytest.mark.parametrize("quantize, min_cosine", [(False, 0.9999), (True, 0.97)])
+    def test_matches_pytorch(self, tmp_path_factory, torch_embeddings, quantize, min_cosine):
+        """Cosine agreement with the PyTorch output, full precision and int8"""
+        pytest.importorskip("onnxruntime")
+        model = OnnxEmbedding(
+            model_name="all-MiniLM-L6-v2",
+            quantize=quantize,
+            model_dir=tmp_path_factory.mktemp("onnx")
+        )
+        
+        embeddings = model.encode(self.TEXTS, batch_size=2, show_progress=False)
+        assert embeddings.shape == torch_embeddings.shape
+        assert model.get_dimension() == torch_embeddings.shape[1]
+        
+        cosine = (embeddings * torch_embeddings).sum(axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(torch_embeddings, axis=1)
+        )
+        assert cosine.min() >= min_cosine
+        np.testing.assert_allclose(model.encode_single(self.TEXTS[0]), embeddings[0], atol=1e-5)
+
+
+class TestEmbeddingCache:
+    """Test the persistent embedding cache"""
+    
+    @staticmethod
+    def fake_encode(texts):
+        """Deterministic stand-in for a model"""
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+    
+    def test_hits_skip_encoder(self, tmp_path):
+        """Cached texts are not passed to the encoder again"""
+        cache = EmbeddingCache(tmp_path, "test-model")
+        calls = []
+        
+        def encode(texts):
+            calls.append(list(texts))
+            return self.fake_encode(texts)
+        
+        first = cache.encode(["a cat", "a dog"], encode)
+        second = cache.encode(["a dog", "a bird", "a cat"], encode)
+        
+        assert calls == [["a cat", "a dog"], ["a bird"]]
+        np.testing.assert_array_equal(second, self.fake_encode(["a dog", "a bird", "a cat"]))
+        np.testing.assert_array_equal(first[0], second[2])
+        assert cache.stats()['hits'] == 2
+        assert cache.stats()['misses'] == 3
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Entries survive reopening the cache"""
+        EmbeddingCache(tmp_path, "test-model").put(["x", "y"], self.fake_encode(["x", "y"]))
+        
+        reopened = EmbeddingCache(tmp_path, "test-model")
+        
+        assert len(reopened) == 2
+        assert set(reopened.get(["y", "z"])) == {0}
+        assert len(EmbeddingCache(tmp_path, "other-model")) == 0
+    
+    def test_compact_evicts_oldest(self, tmp_path):
+        """Compaction keeps the most recently added entries"""
+        cache = EmbeddingCache(tmp_path, "test-model")
+        texts = [f"text {i}" for i in range(10)]
+        cache.put(texts, self.fake_encode(texts))
+        
+        evicted = cache.compact(max_entries=4)
+        reopened = EmbeddingCache(tmp_path, "test-model")
+        
+        assert evicted == 6
+        assert len(reopened) == 4
+        found = reopened.get(texts)
+        assert sorted(found) == [6, 7, 8, 9]
+        np.testing.assert_array_equal(found[9], self.fake_encode(["text 9"])[0])
+    
+    def test_recovers_from_interrupted_append(self, tmp_path):
+        """A key without a vector row is dropped on load"""
+        cache = EmbeddingCache(tmp_path, "test-model")
+        cache.put(["x", "y"], self.fake_encode(["x", "y"]))
+        with open(cache.directory / "keys.txt", "a") as f:
+            f.write("deadbeef\n")
+        
+        assert len(EmbeddingCache(tmp_path, "test-model")) == 2
+
+
+class _RecordingEmbedding(BaseEmbedding):
+    """Deterministic model that records the batches it is called with"""
+    
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+    
+    def encode(self, texts, show_progress=True):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model failure")
+        return np.array([[len(t), t.count("a")] for t in texts], dtype=np.float32)
+    
+    def encode_single(self, text):
+        return self.encode([text])[0]
+    
+    def get_dimension(self):
+        return 2
+
+
+class TestBatchingEmbedding:
+    """Test micro-batching of concurrent encode_single calls"""
+    
+    def test_coalesces_queued_requests(self):
+        """Requests queued within the wait window share forward passes"""
+        model = _RecordingEmbedding()
+        batcher = BatchingEmbedding(model, max_batch_size=4, max_wait_ms=200)
+        texts = [f"text {'a' * i}" for i in range(10)]
+        
+        futures = [batcher.submit(text) for text in texts]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        
+        assert [len(batch) for batch in model.batches] == [4, 4, 2]
+        for text, result in zip(texts, results):
+            np.testing.assert_array_equal(result, model.encode([text])[0])
+        metrics = batcher.metrics()
+        assert metrics['requests'] == 10
+        assert metrics['batches'] == 3
+        assert metrics['batch_sizes'] == {2: 1, 4: 2}
+        assert metrics['queue_depth'] == 0
+        assert metrics['max_queue_depth'] >= 4
+    
+    def test_concurrent_callers(self):
+        """Blocking encode_single calls from many threads get their own vectors"""
+        model = _RecordingEmbedding()
+        batcher = BatchingEmbedding(model, max_batch_size=64, max_wait_ms=20)
+        texts = [f"{'a' * i} query" for i in range(32)]
+        start = threading.Barrier(8)
+        
+        def call(chunk):
+            start.wait()
+            return [batcher.encode_single(text) for text in chunk]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            chunks = [texts[i::8] for i in range(8)]
+            results = dict(zip(range(8), executor.map(call, chunks)))
+        batcher.close()
+        
+        for i, chunk in enumerate(chunks):
+            for text, vector in zip(chunk, results[i]):
+                assert vector[1] == text.count("a")
+        assert len(model.batches) < len(texts)
+        assert batcher.metrics()['mean_batch_size'] > 1
+    
+    def test_duplicate_texts_encoded_once(self):
+        """Identical texts in one batch are encoded once"""
+        model = _RecordingEmbedding()
+        batcher = BatchingEmbedding(model, max_batch_size=8, max_wait_ms=200)
+        
+        futures = [batcher.submit(text) for text in ["cats", "dogs", "cats"]]
+        vectors = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        
+        assert model.batches == [["cats", "dogs"]]
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+    
+    def test_errors_reach_every_caller(self):
+        """A failed batch fails the futures of all its requests"""
+        batcher = BatchingEmbedding(_RecordingEmbedding(fail=True), max_batch_size=8, max_wait_ms=50)
+        
+        futures = [batcher.submit(text) for text in ["a", "b"]]
+        
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model failure"):
+                future.result(timeout=5)
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit("c")
+
+
+class TestQueryCacheEmbedding:
+    """Test the in-memory LRU cache of query embeddings"""
+    
+    def test_repeated_queries_hit_cache(self):
+        """Queries differing only in whitespace are encoded once"""
+        model = _RecordingEmbedding()
+        cache = QueryCacheEmbedding(model, max_entries=8, model_name="test-model")
+        
+        first = cache.encode_single("gaming  videos")
+        second = cache.encode_single(" gaming videos ")
+        cache.encode_single("Gaming videos")
+        
+        assert model.batches == [["gaming videos"], ["Gaming videos"]]
+        assert first is second
+        assert not first.flags.writeable
+        with pytest.raises(ValueError):
+            first[0] = 1.0
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+        assert stats['hit_rate'] == pytest.approx(1 / 3)
+    
+    def test_evicts_least_recently_used(self):
+        """The least recently used query is evicted first"""
+        model = _RecordingEmbedding()
+        cache = QueryCacheEmbedding(model, max_entries=2)
+        
+        cache.encode_single("a")
+        cache.encode_single("b")
+        cache.encode_single("a")
+        cache.encode_single("c")
+        cache.encode_single("a")
+        cache.encode_single("b")
+        
+        assert model.batches == [["a"], ["b"], ["c"], ["b"]]
+        assert cache.stats()['evictions'] == 2
+    
+    def test_entries_expire(self, monkeypatch):
+        """Entries older than ttl_seconds are encoded again"""
+        model = _RecordingEmbedding()
+        cache = QueryCacheEmbedding(model, max_entries=8, ttl_seconds=60)
+        now = [1000.0]
+        monkeypatch.setattr("src.embeddings.query_cache.time.monotonic", lambda: now[0])
+        
+        cache.encode_single("news")
+        now[0] += 30
+        cache.encode_single("news")
+        now[0] += 61
+        cache.encode_single("news")
+        
+        assert len(model.batches) == 2
+        assert cache.stats()['expired'] == 1
+    
+    def test_metrics_include_batching(self):
+        """Stacked on a BatchingEmbedding, metrics report both layers"""
+        batcher = BatchingEmbedding(_RecordingEmbedding(), max_batch_size=4, max_wait_ms=1)
+        cache = QueryCacheEmbedding(batcher, max_entries=8)
+        
+        for _ in range(3):
+            cache.encode_single("music")
+        batcher.close()
+        
+        metrics = cache.metrics()
+        assert metrics['cache']['hits'] == 2
+        assert metrics['batching']['requests'] == 1
+        assert cache.model_name == "_RecordingEmbedding"
+    
+    def test_other_model_metrics_are_not_batching(self):
+        """Metrics of a model that is not a BatchingEmbedding are reported as 'encoder'"""
+        class _MeteredEmbedding(_RecordingEmbedding):
+            def metrics(self):
+                return {'requests': len(self.batches)}
+        
+        cache = QueryCacheEmbedding(_MeteredEmbedding(), max_entries=8)
+        cache.encode_single("music")
+        
+        metrics = cache.metrics()
+        assert 'batching' not in metrics
+        assert metrics['encoder'] == {'requests': 1}
+
+
+def _stub_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 997), 1.0]
+
+
+class _StubEmbeddingHandler(BaseHTTPRequestHandler):
+    """Minimal /embeddings endpoint of the OpenAI API"""
+
+    def do_POST(self):
+        server = self.server
+        texts = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['input']
+        with server.lock:
+            server.requests.append(texts)
+            status = server.failures.pop(0) if server.failures else 200
+            if server.reject & set(texts):
+                status = 400
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+
+        time.sleep(server.delay)
+        if status == 200:
+            # Out of order on purpose: clients must place items by index
+            data = [
+                {'object': 'embedding', 'index': i, 'embedding': _stub_vector(text)}
+                for i, text in reversed(list(enumerate(texts)))
+            ]
+            body = {'object': 'list', 'data': data, 'model': 'stub', 'usage': {'prompt_tokens': 1, 'total_tokens': 1}}
+        else:
+            body = {'error': {'message': f'stub error {status}', 'type': 'stub', 'code': status}}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(payload)
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenAIEmbeddingRequests:
+    """Test concurrent, rate-limited and retried requests against a local stub API"""
+
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StubEmbeddingHandler)
+        server.lock = threading.Lock()
+        server.requests, server.failures, server.reject = [], [], set()
+        server.in_flight = server.peak_in_flight = 0
+        server.delay = 0.0
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def _model(self, server, **kwargs):
+        kwargs.setdefault('backoff_seconds', 0.01)
+        return OpenAIEmbedding(
+            model_name="stub",
+            api_key="test-key",
+            base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+            **kwargs
+        )
+
+    def test_concurrent_requests_keep_order(self, server):
+        server.delay = 0.05
+        model = self._model(server, max_concurrency=4)
+        texts = [f"video {i}" for i in range(20)]
+
+        embeddings = model.encode(texts, batch_size=2)
+
+        assert embeddings.dtype == np.float32
+        np.testing.assert_array_equal(embeddings, [_stub_vector(text) for text in texts])
+        assert len(server.requests) == 10
+        assert 2 <= server.peak_in_flight <= 4
+
+    def test_retries_transient_errors(self, server):
+        server.failures = [429, 503]
+        model = self._model(server, max_concurrency=1)
+
+        embeddings = model.encode(["a", "bb", "ccc"], batch_size=10)
+
+        np.testing.assert_array_equal(embeddings, [_stub_vector(t) for t in ["a", "bb", "ccc"]])
+        assert model.metrics()['retries'] == 2
+        assert len(server.requests) == 3
+
+    def test_gives_up_after_max_retries(self, server):
+        server.failures = [500, 500, 500]
+        model = self._model(server, max_retries=2)
+
+        with pytest.raises(Exception):
+            model.encode_single("text")
+        assert len(server.requests) == 3
+
+    def test_client_errors_are_not_retried(self, server):
+        server.reject = {"bad"}
+        model = self._model(server)
+
+        with pytest.raises(Exception):
+            model.encode(["bad"])
+        assert len(server.requests) == 1
+
+    def test_resumes_from_cached_batches(self, server, tmp_path):
+        texts = [f"video {i}" for i in range(10)]
+        server.reject = {"video 6"}
+        model = self._model(server, max_concurrency=1, cache=EmbeddingCache(tmp_path, "stub"))
+
+        with pytest.raises(Exception):
+            model.encode(texts, batch_size=2)
+
+        server.reject = set()
+        server.requests.clear()
+        embeddings = model.encode(texts, batch_size=2)
+
+        np.testing.assert_array_equal(embeddings, [_stub_vector(text) for text in texts])
+        resent = {text for batch in server.requests for text in batch}
+        assert "video 6" in resent
+        assert resent.isdisjoint(texts[:6])
+
+    def test_batched_queries_bypass_document_cache(self, server, tmp_path):
+        cache = EmbeddingCache(tmp_path, "stub")
+        batcher = BatchingEmbedding(self._model(server, cache=cache), max_batch_size=8, max_wait_ms=50)
+
+        vectors = [future.result(timeout=5) for future in [batcher.submit(text) for text in ["cats", "dogs"]]]
+        batcher.close()
+
+        np.testing.assert_array_equal(vectors, [_stub_vector("cats"), _stub_vector("dogs")])
+        assert len(cache) == 0
+        assert len(EmbeddingCache(tmp_path, "stub")) == 0
+
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+
+        started = time.monotonic()
+        for _ in range(25):
+            bucket.acquire()
+
+        assert time.monotonic() - started >= 0.18
+        assert backoff_delay(10, base=1.0, maximum=8.0) <= 8.0
+        assert backoff_delay(0, base=1.0, maximum=8.0, retry_after=3.0) == 3.0
@@ -1,8 +1,12 @@
 """Tests for vector database operations"""
 
+import time
+from contextlib import contextmanager
+
 import pytest
 import numpy as np
 from src.vectordb import QdrantManager
+from src.vectordb.operations import point_id_for
 
 
 class TestQdrantManager:
@@ -58,3 +62,149 @@ class TestQdrantManager:
         
         # Clean up
         qdrant_manager.delete_collection(test_collection)
+
+
+class TestPointIds:
+    """Test deterministic point IDs"""
+    
+    def test_point_id_is_stable_uuid(self):
+        """Same video ID always maps to the same UUID"""
+        import uuid
+        
+        point_id = point_id_for("2kyS6SvSYSE")
+        
+        assert point_id == point_id_for("2kyS6SvSYSE")
+        assert uuid.UUID(point_id).version == 5
+    
+    def test_point_ids_are_distinct(self):
+        """Different video IDs map to different points"""
+        ids = {point_id_for(f"video{i}") for i in range(1000)}
+        assert len(ids) == 1000
+
+
+class _FakeEmbedding:
+    """Encoder that records how many batches it produced"""
+
+    def __init__(self):
+        self.batches = 0
+
+    def encode(self, texts, batch_size=32, show_progress=False):
+        self.batches += 1
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+class _FakePoolEmbedding(_FakeEmbedding):
+    """Encoder with a bulk-encoding pool, recording the size of each call and pool opening"""
+
+    def __init__(self):
+        super().__init__()
+        self.pool_calls = []
+        self.pools_opened = 0
+        self.pool_open = False
+
+    @contextmanager
+    def process_pool(self):
+        self.pools_opened += 1
+        self.pool_open = True
+        try:
+            yield self
+        finally:
+            self.pool_open = False
+
+    def encode_multiprocess(self, texts, show_progress=True, chunk_size=None):
+        assert self.pool_open
+        self.pool_calls.append((len(texts), chunk_size))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+class _FakeOperations:
+    """Stands in for VectorDBOperations; optionally fails on one batch"""
+
+    def __init__(self, fail_on=None, delay=0.0):
+        self.uploaded = []
+        self.fail_on = fail_on
+        self.delay = delay
+
+    def build_points(self, documents, embeddings):
+        return [(doc['id'], vector.tolist()) for doc, vector in zip(documents, embeddings)]
+
+    def upsert_points(self, points):
+        time.sleep(self.delay)
+        if self.fail_on is not None and any(point_id == self.fail_on for point_id, _ in points):
+            raise RuntimeError("upload failed")
+        self.uploaded.extend(points)
+        return len(points)
+
+
+class TestPipelinedIndexer:
+    """Test overlapped encoding and uploading"""
+
+    def _documents(self, n):
+        return ({'id': f"v{i}", 'text': "x" * (i % 7), 'metadata': {}} for i in range(n))
+
+    def test_indexes_every_document_once(self):
+        from src.vectordb.pipeline import PipelinedIndexer
+        ops, model = _FakeOperations(), _FakeEmbedding()
+        indexer = PipelinedIndexer(ops, model, batch_size=10, queue_depth=2, upload_workers=3)
+
+        count = indexer.index(self._documents(95))
+
+        assert count == 95
+        assert model.batches == 10
+        assert sorted(point_id for point_id, _ in ops.uploaded) == sorted(f"v{i}" for i in range(95))
+        assert dict(ops.uploaded)["v3"] == [3.0, 1.0]
+
+    def test_upload_error_is_raised(self):
+        from src.vectordb.pipeline import PipelinedIndexer
+        ops = _FakeOperations(fail_on="v42")
+        indexer = PipelinedIndexer(ops, _FakeEmbedding(), batch_size=10, queue_depth=1, upload_workers=2)
+
+        with pytest.raises(RuntimeError, match="upload failed"):
+            indexer.index(self._documents(500))
+
+        assert len(ops.uploaded) < 500
+
+    def test_large_inputs_use_the_process_pool(self):
+        from src.vectordb.pipeline import PipelinedIndexer
+        ops, model = _FakeOperations(), _FakePoolEmbedding()
+        indexer = PipelinedIndexer(
+            ops, model, batch_size=10, queue_depth=2, encode_batch_size=40, multiprocess_threshold=30
+        )
+
+        count = indexer.index(self._documents(95))
+
+        assert count == 95
+        assert model.pools_opened == 1
+        assert model.pool_calls == [(40, 10), (40, 10), (15, 10)]
+        assert model.batches == 0
+        assert sorted(point_id for point_id, _ in ops.uploaded) == sorted(f"v{i}" for i in range(95))
+        assert dict(ops.uploaded)["v83"] == [6.0, 1.0]
+
+    def test_small_inputs_skip_the_process_pool(self):
+        from src.vectordb.pipeline import PipelinedIndexer
+        model = _FakePoolEmbedding()
+        indexer = PipelinedIndexer(_FakeOperations(), model, batch_size=10, multiprocess_threshold=30)
+
+        assert indexer.index(list(self._documents(25))) == 25
+        assert model.pools_opened == 0
+        assert model.batches == 3
+
+    def test_pooled_indexing_keeps_memory_bounded(self):
+        """Encoded documents waiting for upload stay within a few batches"""
+        from src.vectordb.pipeline import PipelinedIndexer
+        ops, model = _FakeOperations(delay=0.002), _FakePoolEmbedding()
+        indexer = PipelinedIndexer(ops, model, batch_size=10, queue_depth=2, upload_workers=1)
+        pending = []
+        encode = model.encode_multiprocess
+
+        def tracked(texts, **kwargs):
+            pending.append(sum(size for size, _ in model.pool_calls) - len(ops.uploaded))
+            return encode(texts, **kwargs)
+
+        model.encode_multiprocess = tracked
+        assert indexer.index(self._documents(2000)) == 2000
+
+        assert max(size for size, _ in model.pool_calls) == indexer.encode_batch_size
+        assert indexer.encode_batch_size < 2000
+        # Queued batches, the one being uploaded and the encode call still being queued
+        assert max(pending) <= (indexer.queue_depth + 1) * 10 + indexer.encode_batch_size
\ No newline at end of file